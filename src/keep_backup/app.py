@@ -1,27 +1,52 @@
 from __future__ import annotations
 
+import os
 from datetime import datetime
 from typing import Callable
 
 from keep_backup.cli import (
     MODE_BACKUP,
+    MODE_BENCH_LAUNCH,
+    MODE_CONVERT,
+    MODE_DAEMON,
+    MODE_DIFF,
+    MODE_SELECTOR_REPORT,
+    MODE_SERVE,
     MODE_SMOKE_FIXTURE,
     MODE_SMOKE_KEEP,
     MODE_SMOKE_LOGIN,
     MODE_SMOKE_PROBE,
     MODE_SMOKE_DOM,
     MODE_PARSE_DOM,
+    MODE_RENDER,
+    MODE_VERIFY,
     parse_args,
 )
 from keep_backup.io import build_paths, load_dotenv_if_present
+from keep_backup.jobserver import load_job_socket_path
+from keep_backup.launch_presets import LAUNCH_PRESET_ENV
+from keep_backup.login_check import LOGIN_CHECK_TTL_ENV
+from keep_backup.profiling import profiling
+from keep_backup.resources import resource_sampling
 from keep_backup.runner import (
+    HAR_RECORD_ENV,
+    HAR_REPLAY_ENV,
     run_backup,
+    run_convert_with_paths,
+    run_daemon,
+    run_diff_with_paths,
+    run_job_server,
+    run_launch_benchmark,
+    run_multi_profile_backup,
+    run_render_with_paths,
+    run_selector_report,
     run_playwright_fixture_smoke,
     run_playwright_keep_probe,
     run_playwright_keep_dom_smoke,
     run_playwright_keep_login_smoke,
     run_playwright_keep_smoke,
     run_parse_dom_with_paths,
+    run_verify_with_paths,
 )
 
 
@@ -29,24 +54,114 @@ def main(argv: list[str] | None = None) -> int:
     load_dotenv_if_present()
     args = parse_args(argv)
 
+    # Exported so profile worker processes and every page opener see the same HAR and launch settings.
+    if args.launch_preset:
+        os.environ[LAUNCH_PRESET_ENV] = args.launch_preset
+    if args.login_check_ttl is not None:
+        os.environ[LOGIN_CHECK_TTL_ENV] = f"{args.login_check_ttl:g}"
+    if args.har_record:
+        os.environ[HAR_RECORD_ENV] = str(args.har_record)
+    if args.har_replay:
+        os.environ[HAR_REPLAY_ENV] = str(args.har_replay)
+
     now = datetime.now()
     paths = build_paths(now)
 
+    def run_backup_mode() -> int:
+        if args.profiles_file:
+            return run_multi_profile_backup(
+                args.profiles_file,
+                concurrency=args.profile_concurrency,
+                resume=args.resume,
+                force_full=args.force_full,
+                max_skip_age_days=args.max_skip_age_days,
+                output_format=args.output_format,
+                harvest=args.harvest,
+                deadline_seconds=args.deadline,
+                hydrate_pool=args.hydrate_pool,
+                shard_pages=args.shard_pages,
+            )
+        return run_backup(
+            args.note,
+            args.notes_file,
+            resume=args.resume,
+            force_full=args.force_full,
+            max_skip_age_days=args.max_skip_age_days,
+            output_format=args.output_format,
+            notes_format=args.notes_format,
+            harvest=args.harvest,
+            deadline_seconds=args.deadline,
+            hydrate_pool=args.hydrate_pool,
+            shard_pages=args.shard_pages,
+        )
+
     mode_handlers: dict[str, Callable[[], int]] = {
-        MODE_BACKUP: lambda: run_backup(args.note, args.notes_file),
-        MODE_SMOKE_KEEP: lambda: run_playwright_keep_smoke(paths.log_file),
-        MODE_SMOKE_FIXTURE: lambda: run_playwright_fixture_smoke(paths.log_file, args.fixture),
-        MODE_SMOKE_LOGIN: lambda: run_playwright_keep_login_smoke(paths.log_file),
-        MODE_SMOKE_PROBE: lambda: run_playwright_keep_probe(paths.log_file),
-        MODE_SMOKE_DOM: lambda: run_playwright_keep_dom_smoke(paths.log_file),
+        MODE_BACKUP: run_backup_mode,
+        MODE_SMOKE_KEEP: lambda: run_playwright_keep_smoke(paths.log_file, mode=args.mode),
+        MODE_SMOKE_FIXTURE: lambda: run_playwright_fixture_smoke(paths.log_file, args.fixture, mode=args.mode),
+        MODE_SMOKE_LOGIN: lambda: run_playwright_keep_login_smoke(paths.log_file, mode=args.mode),
+        MODE_SMOKE_PROBE: lambda: run_playwright_keep_probe(paths.log_file, mode=args.mode),
+        MODE_SMOKE_DOM: lambda: run_playwright_keep_dom_smoke(paths.log_file, mode=args.mode),
         MODE_PARSE_DOM: lambda: run_parse_dom_with_paths(
             paths=paths,
             start=now,
             dom_input=args.dom_input,
             dom_output=args.dom_output,
+            use_cache=not args.no_parse_cache,
+        ),
+        MODE_DAEMON: lambda: run_daemon(args.schedule, max_runs=args.max_runs),
+        MODE_SERVE: lambda: run_job_server(load_job_socket_path(args.job_socket), run_job),
+        MODE_SELECTOR_REPORT: lambda: run_selector_report(paths, start=now),
+        MODE_CONVERT: lambda: run_convert_with_paths(
+            paths=paths,
+            start=now,
+            source=args.convert_input,
+            target=args.convert_output,
+        ),
+        MODE_VERIFY: lambda: run_verify_with_paths(
+            paths=paths,
+            start=now,
+            incremental=args.incremental,
+            workers=args.verify_workers,
+        ),
+        MODE_DIFF: lambda: run_diff_with_paths(
+            paths=paths,
+            start=now,
+            old=args.diff_old,
+            new=args.diff_new,
+            output_format=args.diff_format,
+            output=args.diff_output,
+        ),
+        MODE_RENDER: lambda: run_render_with_paths(
+            paths=paths,
+            start=now,
+            generation=args.render_input,
+            output=args.render_output,
+            page_size=args.render_page_size,
+        ),
+        MODE_BENCH_LAUNCH: lambda: run_launch_benchmark(
+            paths=paths,
+            start=now,
+            fixture_path=args.fixture,
+            repeats=args.bench_repeats,
         ),
     }
-    return mode_handlers[args.mode]()
+    with resource_sampling(args.resource_sample_ms), profiling(
+        args.profile,
+        artifacts_dir=paths.log_file.parent / "artifacts",
+        stem=paths.log_file.stem.replace("run_", ""),
+    ):
+        return mode_handlers[args.mode]()
+
+
+def run_job(argv: list[str]) -> int:
+    # Same as main(argv) in a fresh interpreter.
+    args = parse_args(argv)
+    if args.mode in (MODE_SERVE, MODE_DAEMON):
+        # Both run forever and would block every job queued behind them.
+        print(f"error=mode {args.mode} cannot run as a job")
+        return 2
+    return main(argv)
 
 
 if __name__ == "__main__":
@@ -3,6 +3,8 @@ from __future__ import annotations
 import argparse
 from pathlib import Path
 
+from keep_backup.launch_presets import LAUNCH_PRESETS
+
 
 # NOTE:
 # - Constant names express behavior clearly.
@@ -14,6 +16,14 @@ MODE_SMOKE_LOGIN = "smoke-playwright-login"
 MODE_SMOKE_PROBE = "smoke-playwright-probe"
 MODE_SMOKE_DOM = "smoke-playwright-dom"
 MODE_PARSE_DOM = "parse-dom"
+MODE_DAEMON = "daemon"
+MODE_SELECTOR_REPORT = "selector-report"
+MODE_CONVERT = "convert"
+MODE_VERIFY = "verify"
+MODE_DIFF = "diff"
+MODE_BENCH_LAUNCH = "bench-launch"
+MODE_RENDER = "render"
+MODE_SERVE = "serve"
 
 # Backward-compatible aliases for existing imports.
 MODE_SMOKE_PLAYWRIGHT = MODE_SMOKE_KEEP
@@ -36,6 +46,14 @@ def build_parser() -> argparse.ArgumentParser:
             MODE_SMOKE_PROBE,
             MODE_SMOKE_DOM,
             MODE_PARSE_DOM,
+            MODE_DAEMON,
+            MODE_SERVE,
+            MODE_SELECTOR_REPORT,
+            MODE_CONVERT,
+            MODE_VERIFY,
+            MODE_DIFF,
+            MODE_RENDER,
+            MODE_BENCH_LAUNCH,
         ],
         default=MODE_BACKUP,
         help=(
@@ -44,7 +62,15 @@ def build_parser() -> argparse.ArgumentParser:
             "smoke-playwright-login (logged-in profile validation) | "
             "smoke-playwright-probe (logged-in DOM probe for note elements) | "
             "smoke-playwright-dom (logged-in DOM probe + HTML snapshot artifact) | "
-            "parse-dom (parse saved DOM snapshot HTML into JSON)."
+            "parse-dom (parse saved DOM snapshot HTML into JSON) | "
+            "daemon (resident scheduled backups with a warm browser) | "
+            "serve (resident job server running mode requests from python -m keep_backup.client) | "
+            "selector-report (flag Keep selectors that stopped matching) | "
+            "convert (convert a generation between keep.json and keep.kbk) | "
+            "verify (check every stored generation against its recorded checksums) | "
+            "diff (report added/removed/modified notes between two generations) | "
+            "render (static paginated HTML viewer with search for one generation) | "
+            "bench-launch (compare browser launch presets against --fixture)."
         ),
     )
     parser.add_argument(
@@ -56,7 +82,59 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument(
         "--notes-file",
         type=Path,
-        help="Path to a text file with one note body per line.",
+        help="Path to a text file with one note body per line, an NDJSON file, or - for stdin.",
+    )
+    parser.add_argument(
+        "--notes-format",
+        choices=("auto", "text", "ndjson"),
+        default="auto",
+        help="Format of --notes-file. auto picks ndjson for .ndjson/.jsonl and text otherwise.",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help=(
+            "Seed a Keep backup from the checkpoint left by an interrupted run "
+            "(logs/checkpoints/backup_checkpoint.json) and only harvest what is missing."
+        ),
+    )
+    parser.add_argument(
+        "--profiles-file",
+        type=Path,
+        help=(
+            "Back up several Keep accounts in one run. Text file with one name=profile_dir per line; "
+            "outputs go to backups/<name>/YYYY-MM-DD/."
+        ),
+    )
+    parser.add_argument(
+        "--profile-concurrency",
+        type=int,
+        default=2,
+        help="Maximum number of profile backups running at once with --profiles-file (default: 2).",
+    )
+    parser.add_argument(
+        "--force-full",
+        action="store_true",
+        help="Always run the full Keep harvest, even when the change probe reports no changes.",
+    )
+    parser.add_argument(
+        "--max-skip-age-days",
+        type=int,
+        default=28,
+        help=(
+            "Maximum age in days of the last full generation before the change probe "
+            "stops skipping harvests (default: 28)."
+        ),
+    )
+    parser.add_argument(
+        "--schedule",
+        default="0 3 * * 0",
+        help="5-field cron expression for --mode daemon (default: Sundays at 03:00).",
+    )
+    parser.add_argument(
+        "--max-runs",
+        type=int,
+        help="Stop --mode daemon after this many backup runs (default: run forever).",
     )
     parser.add_argument(
         "--fixture",
@@ -80,6 +158,165 @@ def build_parser() -> argparse.ArgumentParser:
             "Defaults to backups/YYYY-MM-DD/keep_from_dom.json."
         ),
     )
+    parser.add_argument(
+        "--output-format",
+        choices=["json", "binary"],
+        default="json",
+        help="Backup generation format: json (keep.json) | binary (indexed keep.kbk).",
+    )
+    parser.add_argument(
+        "--harvest",
+        choices=["dom", "network", "sharded"],
+        default="dom",
+        help=(
+            "How backup reads notes from Keep: dom (scroll and scrape the page) | "
+            "network (decode Keep's sync responses, falling back to dom) | "
+            "sharded (scroll every label view and the unlabelled remainder on parallel pages)."
+        ),
+    )
+    parser.add_argument(
+        "--har-record",
+        type=Path,
+        help="Record the browser traffic of this run to a HAR file (cookies and auth headers are scrubbed).",
+    )
+    parser.add_argument(
+        "--har-replay",
+        type=Path,
+        help="Serve Keep entirely from a recorded HAR (no network or login) for repeatable benchmarks.",
+    )
+    parser.add_argument(
+        "--convert-input",
+        type=Path,
+        help="Source generation for --mode convert (keep.json or keep.kbk).",
+    )
+    parser.add_argument(
+        "--convert-output",
+        type=Path,
+        help="Target generation for --mode convert; the format follows the .json/.kbk suffix.",
+    )
+    parser.add_argument(
+        "--no-parse-cache",
+        action="store_true",
+        help="Disable the parse-dom result cache (logs/cache/parse_dom/) and always re-parse.",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="For --mode verify, only re-verify generations that changed since the last verify.",
+    )
+    parser.add_argument(
+        "--verify-workers",
+        type=int,
+        default=None,
+        help="Worker processes for --mode verify (default: CPU count).",
+    )
+    parser.add_argument(
+        "--resource-sample-ms",
+        type=int,
+        default=0,
+        help=(
+            "Sample RSS/CPU of this process and its Chromium children from /proc every N ms "
+            "and report per-phase peaks/averages (default: 0, disabled)."
+        ),
+    )
+    parser.add_argument(
+        "--job-socket",
+        type=Path,
+        help=(
+            "Unix socket of --mode serve and of python -m keep_backup.client "
+            "(default: KEEP_JOB_SOCKET or /tmp/keep-backup-jobs.sock)."
+        ),
+    )
+    parser.add_argument(
+        "--profile",
+        choices=["cpu", "mem"],
+        help=(
+            "Profile the selected mode in-process: cpu (cProfile .pstats) | mem (tracemalloc top allocation "
+            "sites). Written to logs/artifacts/profile_<kind>_<stamp>.* and named in the summary line."
+        ),
+    )
+    parser.add_argument(
+        "--diff-old",
+        type=Path,
+        help="Older generation for --mode diff (default: the second newest under backups/).",
+    )
+    parser.add_argument(
+        "--diff-new",
+        type=Path,
+        help="Newer generation for --mode diff (default: the newest under backups/).",
+    )
+    parser.add_argument(
+        "--diff-format",
+        choices=["text", "json"],
+        default="text",
+        help="--mode diff output: text (+/-/~ lines on stdout) | json (report file).",
+    )
+    parser.add_argument(
+        "--diff-output",
+        type=Path,
+        help="JSON report path for --diff-format json (default: logs/artifacts/diff_*.json).",
+    )
+    parser.add_argument(
+        "--render-input",
+        type=Path,
+        help="Generation for --mode render (default: the newest under backups/).",
+    )
+    parser.add_argument(
+        "--render-output",
+        type=Path,
+        help="Site directory for --mode render (default: backups/site, next to the generations).",
+    )
+    parser.add_argument(
+        "--render-page-size",
+        type=int,
+        default=200,
+        help="Average notes per page file for --mode render (default: 200).",
+    )
+    parser.add_argument(
+        "--deadline",
+        type=float,
+        help=(
+            "Overall time limit for a backup run in seconds. Settle, network capture and scroll waits are "
+            "shortened to fit, and time is reserved to save partial notes, the DOM snapshot and the summary."
+        ),
+    )
+    parser.add_argument(
+        "--hydrate-pool",
+        type=int,
+        default=4,
+        help=(
+            "Pages opened side by side to read the full body of notes whose grid card looks truncated "
+            "(default: 4, 0 disables hydration)."
+        ),
+    )
+    parser.add_argument(
+        "--shard-pages",
+        type=int,
+        default=4,
+        help="Pages scrolled side by side for --harvest sharded, one label view each (default: 4).",
+    )
+    parser.add_argument(
+        "--login-check-ttl",
+        type=float,
+        help=(
+            "Seconds a successful Keep login check is reused by probe, dom smoke and backup before they check "
+            "again (default: 1800, 0 disables). Overrides KEEP_LOGIN_CHECK_TTL_SECONDS."
+        ),
+    )
+    parser.add_argument(
+        "--launch-preset",
+        choices=sorted(LAUNCH_PRESETS),
+        help=(
+            "Browser launch preset: default | minimal (no GPU/extensions/background networking, small viewport) | "
+            "tall-viewport (1280x4000 for harvesting). Overrides KEEP_BROWSER_LAUNCH_PRESET."
+        ),
+    )
+    parser.add_argument(
+        "--bench-repeats",
+        type=int,
+        default=3,
+        help="Launches per preset for --mode bench-launch.",
+    )
     return parser
 
 
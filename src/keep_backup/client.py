@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+from keep_backup.jobserver import load_job_socket_path, submit_job
+
+
+# EX_TEMPFAIL: lets callers tell "no job server" apart from a failed job.
+CLIENT_EXIT_UNAVAILABLE = 75
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m keep_backup.client",
+        description="Run a keep_backup.app mode on the resident job server (--mode serve) and print its output.",
+    )
+    parser.add_argument("--socket", type=Path, help="Job server socket (default: KEEP_JOB_SOCKET or /tmp/keep-backup-jobs.sock).")
+    parser.add_argument(
+        "--tail-log",
+        type=int,
+        default=0,
+        help="Also print the last N lines of the run log named in the summary line.",
+    )
+    parser.add_argument("app_args", nargs=argparse.REMAINDER, help="Arguments for keep_backup.app, after --.")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    app_args = args.app_args[1:] if args.app_args[:1] == ["--"] else args.app_args
+    socket_path = load_job_socket_path(args.socket)
+    try:
+        result = submit_job(socket_path, app_args)
+    except OSError as exc:
+        print(f"error=job server not reachable at {socket_path}: {exc}", file=sys.stderr)
+        return CLIENT_EXIT_UNAVAILABLE
+    sys.stdout.write(result.output)
+    if args.tail_log > 0 and result.log_file is not None:
+        try:
+            lines = result.log_file.read_text(encoding="utf-8").splitlines()[-args.tail_log:]
+        except OSError as exc:
+            print(f"# latest_log_error={exc}")
+        else:
+            print(f"# latest_log={result.log_file}")
+            for line in lines:
+                print(f"# log: {line}")
+    return result.exit_code
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import time
+from typing import Callable, Sequence
+
+
+# Relative shares of the time left before the reserve; a phase gets its share of what is left when it starts.
+DEADLINE_PHASE_WEIGHTS = {"navigate": 3, "network_capture": 2, "scroll": 5, "hydrate": 2}
+DEADLINE_DEFAULT_PHASES = ("navigate", "scroll", "hydrate")
+# Held back from every phase budget for the snapshot, extraction, checkpoint and summary.
+DEADLINE_RESERVE_SECONDS = 15.0
+DEADLINE_RESERVE_FRACTION = 0.2
+# Playwright treats a zero timeout as "no timeout", so budgets never go below this.
+DEADLINE_MIN_TIMEOUT_MS = 1
+
+
+class PhaseBudget:
+    # Waits inside a phase are capped to what is left of it.
+
+    def __init__(self, deadline: "RunDeadline", phase: str, ends_at: float) -> None:
+        self._deadline = deadline
+        self.phase = phase
+        self.ends_at = ends_at
+
+    def remaining_ms(self) -> int:
+        return max(0, int((self.ends_at - self._deadline.clock()) * 1000))
+
+    @property
+    def exhausted(self) -> bool:
+        return self.remaining_ms() <= 0
+
+    def cap_ms(self, requested_ms: int) -> int:
+        return min(requested_ms, self.remaining_ms())
+
+    def timeout_ms(self) -> int:
+        return max(DEADLINE_MIN_TIMEOUT_MS, self.remaining_ms())
+
+    def mark_hit(self) -> None:
+        self._deadline.mark_hit(self.phase)
+
+
+class RunDeadline:
+    def __init__(
+        self,
+        expires_at: float,
+        *,
+        reserve_seconds: float,
+        phases: Sequence[str] = DEADLINE_DEFAULT_PHASES,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.expires_at = expires_at
+        self.reserve_seconds = reserve_seconds
+        self.phases = tuple(phases)
+        self.clock = clock
+        self.hit_phase: str | None = None
+
+    @classmethod
+    def after(cls, seconds: float, *, started_at: float, clock: Callable[[], float] = time.time) -> RunDeadline:
+        if seconds <= 0:
+            raise ValueError(f"--deadline must be positive: {seconds}")
+        reserve = min(DEADLINE_RESERVE_SECONDS, seconds * DEADLINE_RESERVE_FRACTION)
+        return cls(started_at + seconds, reserve_seconds=reserve, clock=clock)
+
+    @property
+    def hit(self) -> bool:
+        return self.hit_phase is not None
+
+    def mark_hit(self, phase: str) -> None:
+        if self.hit_phase is None:
+            self.hit_phase = phase
+
+    def usable_seconds(self) -> float:
+        return max(0.0, self.expires_at - self.reserve_seconds - self.clock())
+
+    def phase(self, name: str) -> PhaseBudget:
+        usable = self.usable_seconds()
+        upcoming = self.phases[self.phases.index(name):] if name in self.phases else (name,)
+        total_weight = sum(DEADLINE_PHASE_WEIGHTS.get(phase, 1) for phase in upcoming)
+        share = usable * DEADLINE_PHASE_WEIGHTS.get(name, 1) / total_weight
+        return PhaseBudget(self, name, self.clock() + share)
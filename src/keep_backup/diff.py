@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass, field
+from difflib import SequenceMatcher
+
+
+DIFF_MATCH_ID = "id"
+DIFF_MATCH_SIMILAR = "similar"
+# Minimum SequenceMatcher ratio for two ID-less notes to count as one modified note.
+DIFF_SIMILARITY_THRESHOLD = 0.6
+# Similarity candidates per bucket are capped so the fallback stays linear on 50k-note generations.
+DIFF_MAX_CANDIDATES = 8
+DIFF_SNIPPET_CHARS = 60
+
+
+@dataclass
+class GenerationDiff:
+    added: list[dict[str, str]] = field(default_factory=list)
+    removed: list[dict[str, str]] = field(default_factory=list)
+    modified: list[tuple[dict[str, str], dict[str, str], str]] = field(default_factory=list)
+    unchanged: int = 0
+
+    def to_payload(self) -> dict[str, object]:
+        return {
+            "added": self.added,
+            "removed": self.removed,
+            "modified": [{"old": old, "new": new, "match": match} for old, new, match in self.modified],
+            "unchanged_count": self.unchanged,
+        }
+
+
+def normalize_note(note: dict[str, str]) -> tuple[str, str]:
+    # Scraper and manual input leave different whitespace between runs.
+    title = " ".join(str(note.get("title") or "").split())
+    body_lines = [line.rstrip() for line in str(note.get("body") or "").strip().splitlines()]
+    return title, "\n".join(body_lines)
+
+
+def _content_hash(normalized: tuple[str, str]) -> bytes:
+    title, body = normalized
+    return hashlib.blake2b(f"{title}\x00{body}".encode("utf-8"), digest_size=16).digest()
+
+
+def diff_generations(old_notes: list[dict[str, str]], new_notes: list[dict[str, str]]) -> GenerationDiff:
+    # Match by stable ID first, then by normalized content, then by bucketed similarity.
+    result = GenerationDiff()
+    old_normalized = [normalize_note(note) for note in old_notes]
+    new_normalized = [normalize_note(note) for note in new_notes]
+
+    old_by_id: dict[str, int] = {}
+    for index, note in enumerate(old_notes):
+        if note.get("id"):
+            old_by_id.setdefault(str(note["id"]), index)
+    old_left = set(range(len(old_notes)))
+    new_left: list[int] = []
+    for index, note in enumerate(new_notes):
+        old_index = old_by_id.pop(str(note["id"]), None) if note.get("id") else None
+        if old_index is None:
+            new_left.append(index)
+            continue
+        old_left.discard(old_index)
+        if old_normalized[old_index] == new_normalized[index]:
+            result.unchanged += 1
+        else:
+            result.modified.append((old_notes[old_index], note, DIFF_MATCH_ID))
+
+    old_by_hash: dict[bytes, list[int]] = {}
+    for index in sorted(old_left):
+        old_by_hash.setdefault(_content_hash(old_normalized[index]), []).append(index)
+    unmatched_new: list[int] = []
+    for index in new_left:
+        candidates = old_by_hash.get(_content_hash(new_normalized[index]))
+        if candidates:
+            old_left.discard(candidates.pop(0))
+            result.unchanged += 1
+        else:
+            unmatched_new.append(index)
+
+    for bucket_key in (_title_bucket, _first_line_bucket):
+        old_buckets: dict[str, list[int]] = {}
+        for index in sorted(old_left):
+            key = bucket_key(old_normalized[index])
+            if key:
+                old_buckets.setdefault(key, []).append(index)
+        still_unmatched: list[int] = []
+        for index in unmatched_new:
+            old_index = _best_similar(new_normalized[index], old_buckets.get(bucket_key(new_normalized[index])), old_normalized)
+            if old_index is None:
+                still_unmatched.append(index)
+                continue
+            old_left.discard(old_index)
+            old_buckets[bucket_key(new_normalized[index])].remove(old_index)
+            result.modified.append((old_notes[old_index], new_notes[index], DIFF_MATCH_SIMILAR))
+        unmatched_new = still_unmatched
+
+    result.added = [new_notes[index] for index in unmatched_new]
+    result.removed = [old_notes[index] for index in sorted(old_left)]
+    return result
+
+
+def _title_bucket(normalized: tuple[str, str]) -> str:
+    return normalized[0].casefold()
+
+
+def _first_line_bucket(normalized: tuple[str, str]) -> str:
+    return normalized[1].split("\n", 1)[0].casefold()
+
+
+def _best_similar(
+    target: tuple[str, str],
+    candidates: list[int] | None,
+    old_normalized: list[tuple[str, str]],
+) -> int | None:
+    best_index: int | None = None
+    best_ratio = DIFF_SIMILARITY_THRESHOLD
+    for old_index in (candidates or [])[:DIFF_MAX_CANDIDATES]:
+        matcher = SequenceMatcher(None, old_normalized[old_index][1], target[1], autojunk=False)
+        if matcher.quick_ratio() < best_ratio:
+            continue
+        ratio = matcher.ratio()
+        if ratio >= best_ratio:
+            best_index, best_ratio = old_index, ratio
+    return best_index
+
+
+def format_diff_lines(diff: GenerationDiff) -> list[str]:
+    lines = [f"+ {_describe(note)}" for note in diff.added]
+    lines.extend(f"- {_describe(note)}" for note in diff.removed)
+    lines.extend(f"~ {_describe(new)} (matched by {match})" for _old, new, match in diff.modified)
+    return lines
+
+
+def _describe(note: dict[str, str]) -> str:
+    title, body = normalize_note(note)
+    label = title or body.split("\n", 1)[0]
+    if len(label) > DIFF_SNIPPET_CHARS:
+        label = label[: DIFF_SNIPPET_CHARS - 3] + "..."
+    note_id = note.get("id")
+    return f"[{note_id}] {label}" if note_id else label
@@ -1,10 +1,20 @@
 from __future__ import annotations
 
+import codecs
+import hashlib
 import json
+import mmap
 import os
+import re
+import struct
+import sys
+import zlib
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
+from typing import IO, Iterable, Iterator
+
+from keep_backup.writer import submit_write
 
 
 @dataclass
@@ -14,43 +24,753 @@ class RunPaths:
     log_file: Path
 
 
-def build_paths(now: datetime) -> RunPaths:
+PROFILE_NAME_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_-]*$")
+# Profile runs write to backups/<name>/ and logs/<name>/, next to the shared site/ (render) and
+# artifacts/, cache/, checkpoints/, metrics/ and har/ (logs) directories.
+RESERVED_PROFILE_NAMES = frozenset({"site", "artifacts", "cache", "checkpoints", "metrics", "har"})
+JSON_BACKUP_SUFFIX = ".json"
+BINARY_BACKUP_SUFFIX = ".kbk"
+GENERATION_FILE_NAMES = ("keep.json", "keep.kbk")
+NOTES_FORMAT_AUTO = "auto"
+NOTES_FORMAT_TEXT = "text"
+NOTES_FORMAT_NDJSON = "ndjson"
+NDJSON_SUFFIXES = (".ndjson", ".jsonl")
+STDIN_PATH = Path("-")
+# Written next to every generation at write time so --mode verify can detect bit rot and truncation.
+GENERATION_CHECKSUMS_SUFFIX = ".checksums.json"
+GENERATION_CHECKSUMS_VERSION = 1
+GENERATION_STREAM_CHUNK_CHARS = 1024 * 1024
+_JSON_DECODER = json.JSONDecoder()
+_JSON_WHITESPACE = " \t\n\r"
+
+# Binary generation layout (all integers little-endian):
+#   header   magic, version, flags, notes count, index offset, id table offset,
+#            sha256 of the record region, metadata length
+#   metadata UTF-8 JSON with every payload field except "notes"
+#   records  u32 length + compact UTF-8 JSON per note
+#   index    per note: u64 record offset, u32 record length, u32 crc32
+#   id table u32 capacity, then open-addressing slots of u64 id key + u32 (note index + 1)
+BINARY_BACKUP_MAGIC = b"KBK1"
+BINARY_BACKUP_VERSION = 1
+_BINARY_HEADER = struct.Struct("<4sHHIQQ32sI")
+_BINARY_RECORD_LENGTH = struct.Struct("<I")
+_BINARY_INDEX_ENTRY = struct.Struct("<QII")
+_BINARY_ID_CAPACITY = struct.Struct("<I")
+_BINARY_ID_SLOT = struct.Struct("<QI")
+
+
+def build_paths(now: datetime, profile: str | None = None) -> RunPaths:
     date_stamp = now.strftime("%Y-%m-%d")
     log_stamp = now.strftime("%Y-%m-%d_%H%M%S")
-    backup_dir = Path("backups") / date_stamp
+    backups_root = Path("backups")
+    logs_root = Path("logs")
+    if profile:
+        backups_root = backups_root / profile
+        logs_root = logs_root / profile
+    backup_dir = backups_root / date_stamp
     backup_file = backup_dir / "keep.json"
-    log_file = Path("logs") / f"run_{log_stamp}.log"
+    log_file = logs_root / f"run_{log_stamp}.log"
     return RunPaths(backup_dir=backup_dir, backup_file=backup_file, log_file=log_file)
 
 
+def load_profiles_file(profiles_file: Path) -> dict[str, Path]:
+    if not profiles_file.exists():
+        raise FileNotFoundError(f"profiles file not found: {profiles_file}")
+    profiles: dict[str, Path] = {}
+    with profiles_file.open("r", encoding="utf-8") as handle:
+        for line_number, raw_line in enumerate(handle, start=1):
+            line = raw_line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if "=" not in line:
+                raise ValueError(f"invalid profiles file line {line_number}: expected name=path")
+            name, value = line.split("=", 1)
+            name = name.strip()
+            value = value.strip().strip('"').strip("'")
+            if not PROFILE_NAME_PATTERN.match(name):
+                raise ValueError(f"invalid profile name on line {line_number}: {name!r}")
+            if name.lower() in RESERVED_PROFILE_NAMES:
+                raise ValueError(
+                    f"reserved profile name on line {line_number}: {name!r} "
+                    f"(collides with a backups/ or logs/ directory: {', '.join(sorted(RESERVED_PROFILE_NAMES))})"
+                )
+            if name in profiles:
+                raise ValueError(f"duplicate profile name on line {line_number}: {name!r}")
+            if not value:
+                raise ValueError(f"empty profile path on line {line_number}: {name!r}")
+            profiles[name] = Path(value).expanduser()
+    if not profiles:
+        raise ValueError(f"no profiles configured in {profiles_file}")
+    return profiles
+
+
 def append_log(log_file: Path, message: str) -> None:
-    timestamp = datetime.now().isoformat(timespec="seconds")
+    # Stamped now, written in order by the run's background writer when one is active.
+    line = f"[{datetime.now().isoformat(timespec='seconds')}] {message}\n"
+    submit_write("log", lambda: _write_log_line(log_file, line))
+
+
+def _write_log_line(log_file: Path, line: str) -> None:
     log_file.parent.mkdir(parents=True, exist_ok=True)
     with log_file.open("a", encoding="utf-8") as handle:
-        handle.write(f"[{timestamp}] {message}\n")
+        handle.write(line)
+
+
+def write_backup(
+    backup_file: Path,
+    now: datetime,
+    notes: Iterable[dict[str, str]],
+    *,
+    metadata: dict[str, object] | None = None,
+) -> int:
+    fields: dict[str, object] = {"scraped_at": now.isoformat()}
+    if metadata:
+        fields.update(metadata)
+    return _write_generation(backup_file, fields, notes)
+
+
+def _write_generation_payload(backup_file: Path, payload: dict[str, object]) -> int:
+    fields = {key: value for key, value in payload.items() if key != "notes"}
+    notes = payload.get("notes") if "notes" in payload else None
+    return _write_generation(backup_file, fields, notes if isinstance(notes, list) or notes is None else [])
 
 
-def write_backup(backup_file: Path, now: datetime, notes: list[dict[str, str]]) -> None:
+def _write_generation(
+    backup_file: Path,
+    fields: dict[str, object],
+    notes: Iterable[dict[str, str]] | None,
+) -> int:
     backup_file.parent.mkdir(parents=True, exist_ok=True)
+    if backup_file.suffix == BINARY_BACKUP_SUFFIX:
+        return write_binary_backup(backup_file, fields, notes or [], notes_present=notes is not None)
+    tmp_file = backup_file.with_name(f"{backup_file.name}.tmp")
+    with _GenerationChecksumsWriter(backup_file) as checksums:
+        try:
+            with tmp_file.open("wb") as raw_handle:
+                handle = _ChecksumWriter(raw_handle)
+                count = _stream_json_generation(handle, fields, notes, checksums)
+            os.replace(tmp_file, backup_file)
+        finally:
+            tmp_file.unlink(missing_ok=True)
+        checksums.commit(file_bytes=handle.size, file_sha256=handle.digest.hexdigest())
+    return count
+
+
+class _ChecksumWriter:
+    # Encodes text as UTF-8 and hashes it on its way to the underlying binary handle.
+
+    def __init__(self, handle: IO[bytes]) -> None:
+        self._handle = handle
+        self.digest = hashlib.sha256()
+        self.size = 0
+
+    def write(self, text: str) -> None:
+        data = text.encode("utf-8")
+        self._handle.write(data)
+        self.digest.update(data)
+        self.size += len(data)
+
+
+def _indented_json(value: object, indent: str) -> str:
+    return json.dumps(value, ensure_ascii=False, indent=2).replace("\n", "\n" + indent)
+
+
+def _stream_json_generation(
+    handle: _ChecksumWriter,
+    fields: dict[str, object],
+    notes: Iterable[dict[str, str]] | None,
+    checksums: _GenerationChecksumsWriter,
+) -> int:
+    # Same bytes as json.dump(payload, indent=2) without holding all notes.
+    entries = [f"  {json.dumps(key, ensure_ascii=False)}: {_indented_json(value, '  ')}" for key, value in fields.items()]
+    handle.write("{\n" + ",\n".join(entries))
+    count = 0
+    if notes is not None:
+        handle.write(",\n" if entries else "")
+        handle.write('  "notes": [')
+        for note in notes:
+            handle.write(("," if count else "") + "\n    " + _indented_json(note, "    "))
+            checksums.add(note_checksum(note))
+            count += 1
+        handle.write("\n  ]" if count else "]")
+    handle.write("\n}\n" if entries or notes is not None else "}\n")
+    return count
+
+
+def note_record(note: dict[str, str]) -> bytes:
+    # Compact encoding shared by binary records and note checksums.
+    return json.dumps(note, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def note_checksum(note: dict[str, str]) -> int:
+    return zlib.crc32(note_record(note))
+
+
+def generation_checksums_path(backup_file: Path) -> Path:
+    return backup_file.with_name(f"{backup_file.name}{GENERATION_CHECKSUMS_SUFFIX}")
+
+
+def write_generation_checksums(
+    backup_file: Path,
+    *,
+    file_bytes: int,
+    file_sha256: str,
+    note_checksums: Iterable[int],
+) -> None:
+    with _GenerationChecksumsWriter(backup_file) as checksums:
+        for crc in note_checksums:
+            checksums.add(crc)
+        checksums.commit(file_bytes=file_bytes, file_sha256=file_sha256)
+
+
+class _GenerationChecksumsWriter:
+    # CRCs go straight to a temp sidecar as notes are written, so memory stays flat with note count;
+    # the file-level fields are only known at the end and follow the list in the same JSON object.
+
+    def __init__(self, backup_file: Path) -> None:
+        self._backup_file = backup_file
+        self._checksums_file = generation_checksums_path(backup_file)
+        self._tmp_file = self._checksums_file.with_name(f"{self._checksums_file.name}.tmp")
+        self._handle: IO[str] | None = None
+        self.count = 0
+
+    def __enter__(self) -> _GenerationChecksumsWriter:
+        self._handle = self._tmp_file.open("w", encoding="utf-8")
+        header = json.dumps(
+            {"version": GENERATION_CHECKSUMS_VERSION, "file": self._backup_file.name},
+            separators=(",", ":"),
+        )
+        self._handle.write(header[:-1] + ',"note_crc32":[')
+        return self
+
+    def add(self, crc: int) -> None:
+        self._handle.write(f",{crc}" if self.count else str(crc))
+        self.count += 1
+
+    def commit(self, *, file_bytes: int, file_sha256: str) -> None:
+        trailer = json.dumps(
+            {"notes_count": self.count, "file_bytes": file_bytes, "file_sha256": file_sha256},
+            separators=(",", ":"),
+        )
+        self._handle.write("]," + trailer[1:] + "\n")
+        self._handle.close()
+        os.replace(self._tmp_file, self._checksums_file)
+
+    def __exit__(self, *_exc: object) -> None:
+        if self._handle is not None:
+            self._handle.close()
+        self._tmp_file.unlink(missing_ok=True)
+
+
+def load_generation_checksums(backup_file: Path) -> dict[str, object] | None:
+    checksums_file = generation_checksums_path(backup_file)
+    if not checksums_file.exists():
+        return None
+    try:
+        with checksums_file.open("r", encoding="utf-8") as handle:
+            payload = json.load(handle)
+    except (OSError, ValueError):
+        return None
+    return payload if isinstance(payload, dict) else None
+
+
+def file_sha256(path: Path, *, chunk_size: int = 1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def write_unchanged_generation(
+    backup_file: Path,
+    now: datetime,
+    *,
+    based_on: Path,
+    notes_count: int,
+    fingerprint: dict[str, object] | None,
+) -> None:
     payload = {
         "scraped_at": now.isoformat(),
-        "notes": notes,
+        "unchanged_since": os.path.relpath(based_on, backup_file.parent),
+        "notes_count": notes_count,
+        "fingerprint": fingerprint,
     }
-    with backup_file.open("w", encoding="utf-8") as handle:
-        json.dump(payload, handle, ensure_ascii=False, indent=2)
-        handle.write("\n")
+    _write_generation_payload(backup_file, payload)
+
+
+def find_latest_generation(backups_root: Path) -> Path | None:
+    generations = list_generations(backups_root)
+    return generations[-1] if generations else None
+
+
+def list_generations(backups_root: Path) -> list[Path]:
+    # One generation per YYYY-MM-DD directory, oldest first; JSON wins when both formats exist.
+    by_day: dict[str, Path] = {}
+    for file_name in GENERATION_FILE_NAMES:
+        for candidate in backups_root.glob(f"*/{file_name}"):
+            by_day.setdefault(candidate.parent.name, candidate)
+    return [by_day[day] for day in sorted(by_day)]
+
+
+def load_generation(
+    backup_file: Path,
+    *,
+    follow_unchanged: bool = False,
+) -> tuple[Path, dict[str, object]]:
+    if backup_file.suffix == BINARY_BACKUP_SUFFIX:
+        with open_binary_backup(backup_file) as reader:
+            payload = reader.to_payload()
+    else:
+        with backup_file.open("r", encoding="utf-8") as handle:
+            payload = json.load(handle)
+    if not isinstance(payload, dict):
+        raise ValueError(f"invalid backup generation: {backup_file}")
+    unchanged_since = payload.get("unchanged_since")
+    if follow_unchanged and unchanged_since:
+        based_on = Path(os.path.normpath(backup_file.parent / str(unchanged_since)))
+        return load_generation(based_on)
+    return backup_file, payload
+
+
+def iter_generation_notes(backup_file: Path, *, follow_unchanged: bool = True) -> Iterator[dict[str, str]]:
+    # Either format, without holding the whole payload.
+    fields: dict[str, object] = {}
+    if backup_file.suffix == BINARY_BACKUP_SUFFIX:
+        with open_binary_backup(backup_file) as reader:
+            fields.update(reader.fields)
+            notes_present = reader.notes_present
+            if notes_present:
+                yield from reader
+    else:
+        with backup_file.open("r", encoding="utf-8") as handle:
+            notes_present = yield from _iter_json_generation_notes(_JsonStream(handle, source=backup_file), fields)
+    unchanged_since = fields.get("unchanged_since")
+    if follow_unchanged and unchanged_since and not notes_present:
+        based_on = Path(os.path.normpath(backup_file.parent / str(unchanged_since)))
+        yield from iter_generation_notes(based_on, follow_unchanged=False)
+
+
+def _iter_json_generation_notes(stream: "_JsonStream", fields: dict[str, object]) -> Iterator[dict[str, str]]:
+    # Yields the notes items and collects every other top-level field; returns whether notes exist.
+    notes_present = False
+    stream.expect("{")
+    if stream.peek() == "}":
+        return notes_present
+    while True:
+        key = stream.value()
+        if not isinstance(key, str):
+            raise stream.error("expected a field name")
+        stream.expect(":")
+        if key == "notes" and stream.peek() == "[":
+            notes_present = True
+            stream.expect("[")
+            while stream.peek() != "]":
+                yield stream.value()
+                if stream.peek() != ",":
+                    break
+                stream.expect(",")
+            stream.expect("]")
+        else:
+            fields[key] = stream.value()
+        if stream.peek() != ",":
+            break
+        stream.expect(",")
+    stream.expect("}")
+    return notes_present
+
+
+class _JsonStream:
+    # Just enough of an incremental JSON reader to walk a generation's top level in bounded memory.
+
+    def __init__(self, handle: IO[str], *, source: Path) -> None:
+        self._handle = handle
+        self._source = source
+        self._buffer = ""
+        self._position = 0
+        self._eof = False
 
+    def _fill(self) -> bool:
+        chunk = self._handle.read(GENERATION_STREAM_CHUNK_CHARS)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._position:] + chunk
+        self._position = 0
+        return True
 
-def load_notes_from_file(notes_file: Path) -> list[dict[str, str]]:
+    def error(self, message: str) -> ValueError:
+        return ValueError(f"invalid backup generation: {self._source} ({message})")
+
+    def peek(self) -> str:
+        while True:
+            while self._position < len(self._buffer) and self._buffer[self._position] in _JSON_WHITESPACE:
+                self._position += 1
+            if self._position < len(self._buffer):
+                return self._buffer[self._position]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise self.error(f"expected {char!r}")
+        self._position += 1
+
+    def value(self) -> object:
+        self.peek()
+        while True:
+            try:
+                value, end = _JSON_DECODER.raw_decode(self._buffer, self._position)
+            except json.JSONDecodeError as exc:
+                if self._fill():
+                    continue
+                raise self.error(str(exc)) from exc
+            # A number or literal ending exactly at the buffer edge may continue in the next chunk.
+            if end == len(self._buffer) and not self._eof and self._fill():
+                continue
+            self._position = end
+            return value
+
+
+def note_identity(note: dict[str, str]) -> str:
+    # The stable Keep ID, or a content-derived one for notes scraped without IDs.
+    note_id = note.get("id")
+    if note_id:
+        return str(note_id)
+    content = f"{note.get('title', '')}\x00{note.get('body', '')}"
+    return "sha256:" + hashlib.sha256(content.encode("utf-8")).hexdigest()[:32]
+
+
+def _binary_id_key(note_id: str) -> int:
+    key = int.from_bytes(hashlib.blake2b(note_id.encode("utf-8"), digest_size=8).digest(), "little")
+    return key or 1
+
+
+def write_binary_backup(
+    backup_file: Path,
+    fields: dict[str, object],
+    notes: Iterable[dict[str, str]],
+    *,
+    notes_present: bool = True,
+) -> int:
+    backup_file.parent.mkdir(parents=True, exist_ok=True)
+    metadata = json.dumps(
+        {"fields": fields, "notes_present": notes_present},
+        ensure_ascii=False,
+    ).encode("utf-8")
+    tmp_file = backup_file.with_name(f"{backup_file.name}.tmp")
+    records_digest = hashlib.sha256()
+    index: list[tuple[int, int, int]] = []
+    id_keys: list[int] = []
+    with tmp_file.open("wb") as handle:
+        handle.write(b"\x00" * _BINARY_HEADER.size)
+        handle.write(metadata)
+        offset = _BINARY_HEADER.size + len(metadata)
+        for note in notes:
+            record = note_record(note)
+            prefix = _BINARY_RECORD_LENGTH.pack(len(record))
+            handle.write(prefix)
+            handle.write(record)
+            records_digest.update(prefix)
+            records_digest.update(record)
+            index.append((offset + len(prefix), len(record), zlib.crc32(record)))
+            id_keys.append(_binary_id_key(note_identity(note)))
+            offset += len(prefix) + len(record)
+
+        index_offset = offset
+        for entry in index:
+            handle.write(_BINARY_INDEX_ENTRY.pack(*entry))
+
+        id_table_offset = index_offset + len(index) * _BINARY_INDEX_ENTRY.size
+        capacity = 1
+        while capacity < max(2 * len(id_keys), 1):
+            capacity *= 2
+        slots = [(0, 0)] * capacity
+        for note_index, key in enumerate(id_keys):
+            slot = key & (capacity - 1)
+            while slots[slot][1]:
+                slot = (slot + 1) & (capacity - 1)
+            slots[slot] = (key, note_index + 1)
+        handle.write(_BINARY_ID_CAPACITY.pack(capacity))
+        for key, value in slots:
+            handle.write(_BINARY_ID_SLOT.pack(key, value))
+
+        handle.seek(0)
+        handle.write(
+            _BINARY_HEADER.pack(
+                BINARY_BACKUP_MAGIC,
+                BINARY_BACKUP_VERSION,
+                0,
+                len(index),
+                index_offset,
+                id_table_offset,
+                records_digest.digest(),
+                len(metadata),
+            )
+        )
+    os.replace(tmp_file, backup_file)
+    write_generation_checksums(
+        backup_file,
+        file_bytes=backup_file.stat().st_size,
+        file_sha256=file_sha256(backup_file),
+        note_checksums=(crc for _offset, _length, crc in index),
+    )
+    return len(index)
+
+
+class BinaryBackupReader:
+    # Memory-mapped, random access to keep.kbk records.
+
+    def __init__(self, backup_file: Path) -> None:
+        self.path = backup_file
+        self._handle = backup_file.open("rb")
+        try:
+            self._map = mmap.mmap(self._handle.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError as exc:
+            self._handle.close()
+            raise ValueError(f"invalid binary backup (empty file): {backup_file}") from exc
+        try:
+            self._read_header()
+        except Exception:
+            self.close()
+            raise
+
+    def _read_header(self) -> None:
+        if len(self._map) < _BINARY_HEADER.size:
+            raise ValueError(f"invalid binary backup (truncated header): {self.path}")
+        (
+            magic,
+            version,
+            _flags,
+            self._count,
+            self._index_offset,
+            self._id_table_offset,
+            self.records_sha256,
+            metadata_length,
+        ) = _BINARY_HEADER.unpack_from(self._map, 0)
+        if magic != BINARY_BACKUP_MAGIC or version != BINARY_BACKUP_VERSION:
+            raise ValueError(f"invalid binary backup (bad magic or version): {self.path}")
+        expected_min_size = self._id_table_offset + _BINARY_ID_CAPACITY.size
+        if self._index_offset + self._count * _BINARY_INDEX_ENTRY.size > len(self._map) or (
+            expected_min_size > len(self._map)
+        ):
+            raise ValueError(f"invalid binary backup (truncated index): {self.path}")
+        metadata_start = _BINARY_HEADER.size
+        self._records_offset = metadata_start + metadata_length
+        metadata = json.loads(self._map[metadata_start:self._records_offset].decode("utf-8"))
+        self.fields: dict[str, object] = metadata.get("fields", {})
+        self.notes_present = bool(metadata.get("notes_present", True))
+        (self._id_capacity,) = _BINARY_ID_CAPACITY.unpack_from(self._map, self._id_table_offset)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, note_index: int) -> dict[str, str]:
+        if note_index < 0:
+            note_index += self._count
+        if not 0 <= note_index < self._count:
+            raise IndexError(note_index)
+        offset, length, _crc = self._index_entry(note_index)
+        return json.loads(self._map[offset:offset + length].decode("utf-8"))
+
+    def __iter__(self) -> Iterator[dict[str, str]]:
+        for note_index in range(self._count):
+            yield self[note_index]
+
+    def _index_entry(self, note_index: int) -> tuple[int, int, int]:
+        return _BINARY_INDEX_ENTRY.unpack_from(
+            self._map,
+            self._index_offset + note_index * _BINARY_INDEX_ENTRY.size,
+        )
+
+    def get_by_id(self, note_id: str) -> dict[str, str] | None:
+        if not self._count:
+            return None
+        key = _binary_id_key(note_id)
+        mask = self._id_capacity - 1
+        slot = key & mask
+        slots_offset = self._id_table_offset + _BINARY_ID_CAPACITY.size
+        for _ in range(self._id_capacity):
+            slot_key, value = _BINARY_ID_SLOT.unpack_from(self._map, slots_offset + slot * _BINARY_ID_SLOT.size)
+            if not value:
+                return None
+            if slot_key == key:
+                note = self[value - 1]
+                if note_identity(note) == note_id:
+                    return note
+            slot = (slot + 1) & mask
+        return None
+
+    def record_bytes(self, note_index: int) -> tuple[bytes, int]:
+        offset, length, crc = self._index_entry(note_index)
+        return bytes(self._map[offset:offset + length]), crc
+
+    def compute_records_sha256(self) -> bytes:
+        return hashlib.sha256(self._map[self._records_offset:self._index_offset]).digest()
+
+    def to_payload(self) -> dict[str, object]:
+        payload = dict(self.fields)
+        if self.notes_present:
+            payload["notes"] = list(self)
+        return payload
+
+    def close(self) -> None:
+        mapped = getattr(self, "_map", None)
+        if mapped is not None:
+            mapped.close()
+        self._handle.close()
+
+    def __enter__(self) -> "BinaryBackupReader":
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.close()
+
+
+def open_binary_backup(backup_file: Path) -> BinaryBackupReader:
+    return BinaryBackupReader(backup_file)
+
+
+def convert_generation(source_file: Path, target_file: Path) -> int:
+    # Lossless; the target format follows the output suffix.
+    _, payload = load_generation(source_file)
+    _write_generation_payload(target_file, payload)
+    notes = payload.get("notes")
+    return len(notes) if isinstance(notes, list) else 0
+
+
+def write_checkpoint(checkpoint_file: Path, payload: dict[str, object]) -> int:
+    checkpoint_file.parent.mkdir(parents=True, exist_ok=True)
+    data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    tmp_file = checkpoint_file.with_name(f"{checkpoint_file.name}.tmp")
+    with tmp_file.open("wb") as handle:
+        handle.write(data)
+    os.replace(tmp_file, checkpoint_file)
+    return len(data)
+
+
+def load_checkpoint(checkpoint_file: Path) -> dict[str, object] | None:
+    if not checkpoint_file.exists():
+        return None
+    try:
+        with checkpoint_file.open("r", encoding="utf-8") as handle:
+            payload = json.load(handle)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(payload, dict):
+        return None
+    return payload
+
+
+def clear_checkpoint(checkpoint_file: Path) -> None:
+    checkpoint_file.unlink(missing_ok=True)
+
+
+def load_parse_cache(cache_dir: Path, key: str) -> list[dict[str, str]] | None:
+    cache_file = cache_dir / f"{key}.json"
+    try:
+        with cache_file.open("r", encoding="utf-8") as handle:
+            payload = json.load(handle)
+    except (OSError, ValueError):
+        return None
+    notes = payload.get("notes") if isinstance(payload, dict) else None
+    if not isinstance(notes, list):
+        return None
+    # Touch on hit so size-based eviction drops the least recently used entries first.
+    os.utime(cache_file)
+    return notes
+
+
+def store_parse_cache(
+    cache_dir: Path,
+    key: str,
+    notes: list[dict[str, str]],
+    *,
+    max_bytes: int,
+) -> list[Path]:
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    cache_file = cache_dir / f"{key}.json"
+    tmp_file = cache_file.with_name(f"{cache_file.name}.tmp")
+    with tmp_file.open("w", encoding="utf-8") as handle:
+        json.dump({"key": key, "notes": notes}, handle, ensure_ascii=False)
+    os.replace(tmp_file, cache_file)
+    return evict_cache_files(cache_dir, max_bytes=max_bytes, keep=cache_file)
+
+
+def evict_cache_files(cache_dir: Path, *, max_bytes: int, keep: Path | None = None) -> list[Path]:
+    entries = sorted(
+        ((path.stat().st_mtime, path.stat().st_size, path) for path in cache_dir.glob("*.json")),
+        key=lambda entry: entry[0],
+    )
+    total = sum(size for _, size, _ in entries)
+    evicted: list[Path] = []
+    for _, size, path in entries:
+        if total <= max_bytes:
+            break
+        if keep is not None and path == keep:
+            continue
+        path.unlink(missing_ok=True)
+        total -= size
+        evicted.append(path)
+    return evicted
+
+
+def resolve_notes_format(notes_file: Path, notes_format: str = NOTES_FORMAT_AUTO) -> str:
+    if notes_format != NOTES_FORMAT_AUTO:
+        return notes_format
+    if notes_file.suffix.lower() in NDJSON_SUFFIXES:
+        return NOTES_FORMAT_NDJSON
+    return NOTES_FORMAT_TEXT
+
+
+def iter_notes_from_file(
+    notes_file: Path,
+    notes_format: str = NOTES_FORMAT_AUTO,
+) -> Iterator[dict[str, str]]:
+    # A path of - reads stdin.
+    resolved_format = resolve_notes_format(notes_file, notes_format)
+    if notes_file == STDIN_PATH:
+        stdin_buffer = getattr(sys.stdin, "buffer", None)
+        handle: IO[str] = codecs.getreader("utf-8")(stdin_buffer) if stdin_buffer is not None else sys.stdin
+        yield from _iter_notes_from_handle(handle, resolved_format, source="stdin")
+        return
     if not notes_file.exists():
         raise FileNotFoundError(f"notes file not found: {notes_file}")
-    notes: list[dict[str, str]] = []
     with notes_file.open("r", encoding="utf-8") as handle:
-        for line in handle:
-            body = line.strip()
-            if body:
-                notes.append({"body": body})
-    return notes
+        yield from _iter_notes_from_handle(handle, resolved_format, source=str(notes_file))
+
+
+def _iter_notes_from_handle(handle: IO[str], notes_format: str, *, source: str) -> Iterator[dict[str, str]]:
+    for line_number, line in enumerate(handle, start=1):
+        if notes_format == NOTES_FORMAT_NDJSON:
+            note = _parse_ndjson_note(line, line_number=line_number, source=source)
+            if note is not None:
+                yield note
+            continue
+        body = line.strip()
+        if body:
+            yield {"body": body}
+
+
+def _parse_ndjson_note(line: str, *, line_number: int, source: str) -> dict[str, str] | None:
+    if not line.strip():
+        return None
+    try:
+        record = json.loads(line)
+    except ValueError as exc:
+        raise ValueError(f"invalid NDJSON in {source} line {line_number}: {exc}") from exc
+    if not isinstance(record, dict):
+        raise ValueError(f"invalid NDJSON in {source} line {line_number}: expected an object")
+    title = str(record.get("title") or "").strip()
+    body = str(record.get("body") or "").strip()
+    if not title and not body:
+        return None
+    note: dict[str, str] = {"body": body}
+    if title:
+        note["title"] = title
+    if record.get("id"):
+        note["id"] = str(record["id"])
+    return note
 
 
 def load_dotenv_if_present(dotenv_path: Path = Path(".env")) -> None:
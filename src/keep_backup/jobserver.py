@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import json
+import os
+import socket
+import time
+from contextlib import redirect_stderr, redirect_stdout
+from dataclasses import dataclass
+from io import StringIO
+from pathlib import Path
+from typing import Callable
+
+# Standard library only: the thin client imports this module and must start without Playwright.
+
+JOB_SOCKET_ENV = "KEEP_JOB_SOCKET"
+# Inside the container, not on the bind-mounted workspace: some hosts cannot create sockets there.
+JOB_SOCKET_DEFAULT = Path("/tmp/keep-backup-jobs.sock")
+JOB_SERVER_BACKLOG = 16
+JOB_REQUEST_MAX_BYTES = 1024 * 1024
+_SUMMARY_PREFIX = "summary "
+
+
+@dataclass
+class JobResult:
+    exit_code: int
+    output: str
+    seconds: float = 0.0
+
+    @property
+    def summary(self) -> str:
+        for line in reversed(self.output.splitlines()):
+            if line.startswith(_SUMMARY_PREFIX):
+                return line
+        return ""
+
+    @property
+    def log_file(self) -> Path | None:
+        for field in self.summary.split(" "):
+            if field.startswith("log_file="):
+                return Path(field[len("log_file="):])
+        return None
+
+    def to_payload(self) -> dict[str, object]:
+        return {
+            "exit_code": self.exit_code,
+            "output": self.output,
+            "summary": self.summary,
+            "seconds": round(self.seconds, 3),
+        }
+
+
+def load_job_socket_path(socket_path: Path | None = None) -> Path:
+    if socket_path is not None:
+        return socket_path
+    raw_value = os.environ.get(JOB_SOCKET_ENV, "").strip()
+    return Path(raw_value).expanduser() if raw_value else JOB_SOCKET_DEFAULT
+
+
+def run_captured(run_job: Callable[[list[str]], int], argv: list[str]) -> JobResult:
+    # Environment changes made by one job must not leak into the next.
+    buffer = StringIO()
+    saved_environ = dict(os.environ)
+    started = time.perf_counter()
+    try:
+        with redirect_stdout(buffer), redirect_stderr(buffer):
+            exit_code = run_job(argv)
+    except SystemExit as exc:
+        # argparse reports bad arguments by exiting; the server has to survive that.
+        exit_code = exc.code if isinstance(exc.code, int) else 1
+    except Exception as exc:  # noqa: BLE001
+        exit_code = 1
+        buffer.write(f"error={exc}\n")
+    finally:
+        os.environ.clear()
+        os.environ.update(saved_environ)
+    return JobResult(exit_code=exit_code, output=buffer.getvalue(), seconds=time.perf_counter() - started)
+
+
+def serve_jobs(
+    socket_path: Path,
+    run_job: Callable[[list[str]], int],
+    *,
+    log: Callable[[str], None],
+    max_jobs: int | None = None,
+) -> int:
+    # One request per connection, run one after another; returns the number of jobs run.
+    server = _bind_socket(socket_path)
+    jobs = 0
+    log(f"job-server listening socket={socket_path} pid={os.getpid()}")
+    try:
+        while max_jobs is None or jobs < max_jobs:
+            connection, _ = server.accept()
+            with connection:
+                try:
+                    argv = _read_request(connection)
+                except (OSError, ValueError) as exc:
+                    log(f"job-server bad_request error={exc}")
+                    continue
+                jobs += 1
+                log(f"job-server job={jobs} started argv={' '.join(argv)}")
+                result = run_captured(run_job, argv)
+                log(
+                    f"job-server job={jobs} exit_code={result.exit_code} seconds={result.seconds:.2f} "
+                    f"log_file={result.log_file or '(none)'}"
+                )
+                try:
+                    connection.sendall(json.dumps(result.to_payload(), ensure_ascii=False).encode("utf-8") + b"\n")
+                except OSError as exc:
+                    log(f"job-server job={jobs} reply_error={exc}")
+    finally:
+        server.close()
+        socket_path.unlink(missing_ok=True)
+    return jobs
+
+
+def submit_job(socket_path: Path, argv: list[str], *, timeout: float | None = None) -> JobResult:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        client.connect(str(socket_path))
+        client.sendall(json.dumps({"argv": argv}).encode("utf-8") + b"\n")
+        payload = json.loads(_read_line(client))
+    return JobResult(
+        exit_code=int(payload["exit_code"]),
+        output=str(payload.get("output", "")),
+        seconds=float(payload.get("seconds", 0.0)),
+    )
+
+
+def _bind_socket(socket_path: Path) -> socket.socket:
+    if socket_path.exists():
+        if _socket_is_live(socket_path):
+            raise RuntimeError(f"job server already running at {socket_path}")
+        # Left behind by a server that was killed; nothing is listening on it.
+        socket_path.unlink()
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        server.bind(str(socket_path))
+        os.chmod(socket_path, 0o600)
+        server.listen(JOB_SERVER_BACKLOG)
+    except OSError:
+        server.close()
+        raise
+    return server
+
+
+def _socket_is_live(socket_path: Path) -> bool:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(str(socket_path))
+        except OSError:
+            return False
+    return True
+
+
+def _read_request(connection: socket.socket) -> list[str]:
+    payload = json.loads(_read_line(connection, max_bytes=JOB_REQUEST_MAX_BYTES))
+    argv = payload.get("argv") if isinstance(payload, dict) else None
+    if not isinstance(argv, list) or not all(isinstance(arg, str) for arg in argv):
+        raise ValueError("request must be {\"argv\": [str, ...]}")
+    return argv
+
+
+def _read_line(connection: socket.socket, *, max_bytes: int | None = None) -> bytes:
+    chunks: list[bytes] = []
+    received = 0
+    while True:
+        chunk = connection.recv(65536)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        received += len(chunk)
+        if chunk.endswith(b"\n"):
+            break
+        if max_bytes is not None and received > max_bytes:
+            raise ValueError(f"request larger than {max_bytes} bytes")
+    if not chunks:
+        raise ValueError("connection closed before a request was sent")
+    return b"".join(chunks)
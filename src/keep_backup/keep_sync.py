@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import json
+from typing import Iterable
+
+
+# Keep's sync endpoint returns the full node tree (notes, list items, labels) as JSON.
+KEEP_SYNC_RESPONSE_MARKERS = ("/notes/v1/changes",)
+# Some Google endpoints prefix JSON with an anti-XSSI guard line.
+XSSI_PREFIX = ")]}'"
+KEEP_NODE_NOTE = "NOTE"
+KEEP_NODE_LIST = "LIST"
+KEEP_NODE_LIST_ITEM = "LIST_ITEM"
+KEEP_ROOT_PARENT_ID = "root"
+# Untrashed/undeleted nodes carry the epoch in their trashed/deleted timestamps.
+KEEP_EPOCH_TIMESTAMPS = ("", "1970-01-01T00:00:00.000Z", "1970-01-01T00:00:00Z")
+
+
+def is_sync_response_url(url: str) -> bool:
+    return any(marker in url for marker in KEEP_SYNC_RESPONSE_MARKERS)
+
+
+def decode_sync_payload(text: str) -> dict[str, object] | None:
+    text = text.lstrip()
+    if text.startswith(XSSI_PREFIX):
+        text = text[len(XSSI_PREFIX):]
+    try:
+        payload = json.loads(text)
+    except ValueError:
+        return None
+    if not isinstance(payload, dict) or not isinstance(payload.get("nodes", []), list):
+        return None
+    return payload
+
+
+class NetworkNoteCapture:
+    # The response handler only queues; bodies are read later via drain() so no Playwright
+    # call happens inside an event callback.
+
+    def __init__(self) -> None:
+        self._pending: list[object] = []
+        self._nodes: dict[str, dict[str, object]] = {}
+        self.responses_decoded = 0
+        self.responses_failed = 0
+        self.complete = False
+
+    def handle_response(self, response: object) -> None:
+        if is_sync_response_url(str(getattr(response, "url", ""))):
+            self._pending.append(response)
+
+    def drain(self) -> None:
+        pending, self._pending = self._pending, []
+        for response in pending:
+            try:
+                payload = decode_sync_payload(response.text())
+            except Exception:  # noqa: BLE001
+                payload = None
+            if payload is None:
+                self.responses_failed += 1
+                continue
+            self.add_payload(payload)
+
+    def add_payload(self, payload: dict[str, object]) -> None:
+        self.responses_decoded += 1
+        for node in payload.get("nodes", []):
+            if isinstance(node, dict) and node.get("id"):
+                self._nodes[str(node["id"])] = node
+        # A sync page without "truncated" is the last one of the initial download.
+        if not payload.get("truncated"):
+            self.complete = True
+
+    def notes(self) -> list[dict[str, str]]:
+        return notes_from_sync_nodes(self._nodes.values())
+
+
+def notes_from_sync_nodes(nodes: Iterable[dict[str, object]]) -> list[dict[str, str]]:
+    nodes = [node for node in nodes if not _is_removed(node)]
+    items_by_parent: dict[str, list[dict[str, object]]] = {}
+    for node in nodes:
+        if node.get("type") == KEEP_NODE_LIST_ITEM:
+            items_by_parent.setdefault(str(node.get("parentId", "")), []).append(node)
+
+    notes: list[dict[str, str]] = []
+    for node in nodes:
+        node_type = node.get("type")
+        if node_type not in (KEEP_NODE_NOTE, KEEP_NODE_LIST) or node.get("parentId") != KEEP_ROOT_PARENT_ID:
+            continue
+        title = str(node.get("title") or "").strip()
+        if node_type == KEEP_NODE_LIST:
+            body = _list_body(items_by_parent.get(str(node["id"]), []))
+        else:
+            body = "\n".join(
+                str(child.get("text") or "").strip() for child in items_by_parent.get(str(node["id"]), [])
+            ).strip() or str(node.get("text") or "").strip()
+        if not title and not body:
+            continue
+        note: dict[str, str] = {"body": body}
+        if title:
+            note["title"] = title
+        note["id"] = str(node["id"])
+        timestamps = node.get("timestamps") if isinstance(node.get("timestamps"), dict) else {}
+        for field_name in ("created", "updated"):
+            if timestamps.get(field_name):
+                note[field_name] = str(timestamps[field_name])
+        notes.append(note)
+    notes.sort(key=lambda note: note.get("updated", ""), reverse=True)
+    return notes
+
+
+def _list_body(items: list[dict[str, object]]) -> str:
+    # Keep orders list items by descending sortValue.
+    ordered = sorted(items, key=_sort_value, reverse=True)
+    lines = []
+    for item in ordered:
+        text = str(item.get("text") or "").strip()
+        if text:
+            lines.append(f"[{'x' if item.get('checked') else ' '}] {text}")
+    return "\n".join(lines)
+
+
+def _sort_value(item: dict[str, object]) -> int:
+    try:
+        return int(str(item.get("sortValue") or 0))
+    except ValueError:
+        return 0
+
+
+def _is_removed(node: dict[str, object]) -> bool:
+    timestamps = node.get("timestamps")
+    if not isinstance(timestamps, dict):
+        return False
+    return any(
+        str(timestamps.get(field_name) or "") not in KEEP_EPOCH_TIMESTAMPS for field_name in ("trashed", "deleted")
+    )
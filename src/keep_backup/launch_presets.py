@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+
+
+LAUNCH_PRESET_ENV = "KEEP_BROWSER_LAUNCH_PRESET"
+LAUNCH_PRESET_DEFAULT = "default"
+
+
+@dataclass(frozen=True)
+class LaunchPreset:
+    args: tuple[str, ...] = ()
+    viewport: tuple[int, int] | None = None
+
+    def launch_options(self) -> dict[str, object]:
+        return {"args": list(self.args)} if self.args else {}
+
+    def context_options(self) -> dict[str, object]:
+        if self.viewport is None:
+            return {}
+        width, height = self.viewport
+        return {"viewport": {"width": width, "height": height}}
+
+
+# headless=True already runs chromium-headless-shell; "minimal" trims what that shell still starts.
+LAUNCH_PRESETS = {
+    LAUNCH_PRESET_DEFAULT: LaunchPreset(),
+    "minimal": LaunchPreset(
+        args=(
+            "--disable-gpu",
+            "--disable-extensions",
+            "--disable-background-networking",
+            "--disable-component-update",
+            "--disable-default-apps",
+            "--disable-sync",
+            "--no-first-run",
+            "--mute-audio",
+        ),
+        viewport=(800, 600),
+    ),
+    # A tall viewport renders more note cards per scroll step while harvesting.
+    "tall-viewport": LaunchPreset(viewport=(1280, 4000)),
+}
+
+
+def load_launch_preset(name: str | None = None) -> tuple[str, LaunchPreset]:
+    preset_name = (name or os.environ.get(LAUNCH_PRESET_ENV, "").strip() or LAUNCH_PRESET_DEFAULT)
+    preset = LAUNCH_PRESETS.get(preset_name)
+    if preset is None:
+        raise ValueError(
+            f"unknown launch preset: {preset_name} (expected one of {', '.join(sorted(LAUNCH_PRESETS))})"
+        )
+    return preset_name, preset
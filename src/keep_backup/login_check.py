@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+from keep_backup.io import clear_checkpoint, load_checkpoint, write_checkpoint
+
+
+LOGIN_CHECK_TTL_ENV = "KEEP_LOGIN_CHECK_TTL_SECONDS"
+LOGIN_CHECK_DEFAULT_TTL_SECONDS = 30 * 60
+LOGIN_CHECK_VERSION = 1
+LOGIN_CHECK_FILE_PREFIX = "login_check_"
+
+
+@dataclass(frozen=True)
+class LoginCheck:
+    profile_dir: str
+    checked_at: float
+    final_url: str
+    # Earliest expiry of the auth cookies seen at check time; None for session-only cookies.
+    cookie_expires: float | None = None
+
+
+def load_login_check_ttl() -> float:
+    raw_value = os.environ.get(LOGIN_CHECK_TTL_ENV, "").strip()
+    if not raw_value:
+        return LOGIN_CHECK_DEFAULT_TTL_SECONDS
+    try:
+        ttl = float(raw_value)
+    except ValueError as exc:
+        raise ValueError(f"{LOGIN_CHECK_TTL_ENV} must be a number of seconds: {raw_value}") from exc
+    return max(0.0, ttl)
+
+
+def build_login_check_path(cache_dir: Path, profile_dir: Path) -> Path:
+    # One file per profile, like the storage_state files, so profile workers never share an entry.
+    profile_key = hashlib.sha256(str(profile_dir).encode("utf-8")).hexdigest()[:12]
+    return cache_dir / f"{LOGIN_CHECK_FILE_PREFIX}{profile_key}.json"
+
+
+class LoginCheckCache:
+    # Trusted until its TTL or an auth cookie runs out, whichever comes first.
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        profile_dir: Path,
+        ttl_seconds: float,
+        reuse: bool = True,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = path
+        self.profile_dir = profile_dir
+        self.ttl_seconds = ttl_seconds
+        # False for the login smoke itself: it always checks and only refreshes the entry.
+        self.reuse = reuse
+        self.clock = clock
+
+    def lookup(self) -> tuple[LoginCheck | None, str]:
+        if not self.reuse:
+            return None, "refresh"
+        payload = load_checkpoint(self.path)
+        if not payload:
+            return None, "missing"
+        if payload.get("version") != LOGIN_CHECK_VERSION or payload.get("profile_dir") != str(self.profile_dir):
+            return None, "other_profile"
+        try:
+            check = LoginCheck(
+                profile_dir=str(payload["profile_dir"]),
+                checked_at=float(payload["checked_at"]),
+                final_url=str(payload["final_url"]),
+                cookie_expires=None if payload.get("cookie_expires") is None else float(payload["cookie_expires"]),
+            )
+        except (KeyError, TypeError, ValueError):
+            return None, "invalid"
+        now = self.clock()
+        if now - check.checked_at > self.ttl_seconds:
+            return None, "expired_ttl"
+        if check.cookie_expires is not None and check.cookie_expires <= now:
+            return None, "cookie_expired"
+        return check, "fresh"
+
+    def record(self, *, final_url: str, cookie_expires: float | None) -> LoginCheck:
+        check = LoginCheck(
+            profile_dir=str(self.profile_dir),
+            checked_at=self.clock(),
+            final_url=final_url,
+            cookie_expires=cookie_expires,
+        )
+        write_checkpoint(
+            self.path,
+            {
+                "version": LOGIN_CHECK_VERSION,
+                "profile_dir": check.profile_dir,
+                "checked_at": check.checked_at,
+                "final_url": check.final_url,
+                "cookie_expires": check.cookie_expires,
+            },
+        )
+        return check
+
+    def invalidate(self) -> None:
+        clear_checkpoint(self.path)
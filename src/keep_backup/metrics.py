@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import os
+import re
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, ContextManager, Iterator, TypeVar
+
+
+METRICS_PREFIX = "keep_backup"
+METRICS_FILE_SUFFIX = ".prom"
+METRICS_DEFAULT_PROFILE = "default"
+_LAST_SUCCESS_PATTERN = re.compile(rf"^{METRICS_PREFIX}_last_success_timestamp_seconds\{{[^}}]*\}} (\S+)$", re.M)
+
+T = TypeVar("T")
+
+
+@dataclass
+class RunMetrics:
+    phase_seconds: dict[str, float] = field(default_factory=dict)
+    values: dict[str, float] = field(default_factory=dict)
+    # String facts about the run (e.g. the launch preset) exported as ``*_info`` gauges.
+    labels: dict[str, str] = field(default_factory=dict)
+    # Filled by keep_backup.resources when sampling is enabled: phase name -> PhaseUsage.
+    resources: dict[str, Any] = field(default_factory=dict)
+
+
+_current = RunMetrics()
+_phase_stack: list[str] = []
+
+
+def current_run_metrics() -> RunMetrics:
+    return _current
+
+
+def pop_run_metrics() -> RunMetrics:
+    global _current
+    finished, _current = _current, RunMetrics()
+    return finished
+
+
+def current_phase() -> str | None:
+    # Read from the sampler thread while the run thread pushes and pops; tolerate the race.
+    try:
+        return _phase_stack[-1]
+    except IndexError:
+        return None
+
+
+def set_run_metric(name: str, value: float) -> None:
+    _current.values[name] = value
+
+
+def set_run_label(name: str, value: str) -> None:
+    _current.labels[name] = value
+
+
+def record_phase(name: str, seconds: float) -> None:
+    _current.phase_seconds[name] = _current.phase_seconds.get(name, 0.0) + seconds
+
+
+@contextmanager
+def run_phase(name: str) -> Iterator[None]:
+    started = time.perf_counter()
+    _phase_stack.append(name)
+    try:
+        yield
+    finally:
+        _phase_stack.pop()
+        record_phase(name, time.perf_counter() - started)
+
+
+@contextmanager
+def timed_enter(name: str, manager: ContextManager[T]) -> Iterator[T]:
+    # Only the time spent entering is charged to the phase, not the body of the block.
+    started = time.perf_counter()
+    _phase_stack.append(name)
+    entered = False
+    try:
+        with manager as value:
+            entered = True
+            _phase_stack.pop()
+            record_phase(name, time.perf_counter() - started)
+            yield value
+    finally:
+        if not entered:
+            _phase_stack.pop()
+            record_phase(name, time.perf_counter() - started)
+
+
+def build_metrics_path(metrics_dir: Path, *, mode: str, profile: str) -> Path:
+    return metrics_dir / f"{METRICS_PREFIX}_{mode}_{profile}{METRICS_FILE_SUFFIX}"
+
+
+def read_last_success_timestamp(metrics_file: Path) -> float | None:
+    try:
+        text = metrics_file.read_text(encoding="utf-8")
+    except OSError:
+        return None
+    match = _LAST_SUCCESS_PATTERN.search(text)
+    if not match:
+        return None
+    try:
+        return float(match.group(1))
+    except ValueError:
+        return None
+
+
+def render_openmetrics(
+    *,
+    mode: str,
+    profile: str,
+    success: bool,
+    duration_seconds: float,
+    notes_count: int,
+    output_bytes: int,
+    last_success_timestamp: float | None,
+    metrics: RunMetrics,
+) -> str:
+    labels = f'mode="{_escape_label(mode)}",profile="{_escape_label(profile)}"'
+    lines: list[str] = []
+
+    def gauge(name: str, help_text: str, samples: list[tuple[str, float]]) -> None:
+        metric = f"{METRICS_PREFIX}_{name}"
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} gauge")
+        for extra_labels, value in samples:
+            lines.append(f"{metric}{{{labels}{extra_labels}}} {_format_value(value)}")
+
+    gauge("run_success", "1 if the last run succeeded, 0 otherwise.", [("", 1 if success else 0)])
+    gauge("run_duration_seconds", "Wall-clock duration of the last run.", [("", duration_seconds)])
+    gauge("notes_count", "Notes written or parsed by the last run.", [("", notes_count)])
+    if metrics.phase_seconds:
+        gauge(
+            "phase_duration_seconds",
+            "Time spent in each phase of the last run.",
+            [(f',phase="{_escape_label(phase)}"', seconds) for phase, seconds in sorted(metrics.phase_seconds.items())],
+        )
+    gauge("scroll_iterations", "Infinite-scroll iterations in the last run.", [("", metrics.values.get("scroll_iterations", 0))])
+    gauge("snapshot_bytes", "Size of the DOM snapshot written by the last run.", [("", metrics.values.get("snapshot_bytes", 0))])
+    gauge("output_bytes", "Size of the output written by the last run.", [("", output_bytes)])
+    for name, value in sorted(metrics.values.items()):
+        if name not in ("scroll_iterations", "snapshot_bytes"):
+            gauge(name, f"{name} reported by the last run.", [("", value)])
+    for name, value in sorted(metrics.labels.items()):
+        gauge(f"{name}_info", f"{name} used by the last run.", [(f',{name}="{_escape_label(value)}"', 1)])
+    if last_success_timestamp is not None:
+        gauge(
+            "last_success_timestamp_seconds",
+            "Unix time of the last successful run.",
+            [("", last_success_timestamp)],
+        )
+    lines.append("# EOF")
+    return "\n".join(lines) + "\n"
+
+
+def write_metrics_textfile(metrics_file: Path, text: str) -> None:
+    # Rename into place so a textfile collector never scrapes a half-written file.
+    metrics_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = metrics_file.with_name(f".{metrics_file.name}.tmp")
+    with tmp_file.open("w", encoding="utf-8") as handle:
+        handle.write(text)
+    os.replace(tmp_file, metrics_file)
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if float(value).is_integer():
+        return str(int(value))
+    return f"{value:.6f}"
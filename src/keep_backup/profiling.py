@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+
+PROFILE_CPU = "cpu"
+PROFILE_MEM = "mem"
+PROFILE_KINDS = (PROFILE_CPU, PROFILE_MEM)
+PROFILE_TOP_N = 25
+_MIB = 1024 * 1024
+
+
+class ActiveProfile:
+    # Dumped at every finalize and again at exit.
+
+    def __init__(self, kind: str, *, artifacts_dir: Path, stem: str, top_n: int = PROFILE_TOP_N) -> None:
+        if kind not in PROFILE_KINDS:
+            raise ValueError(f"unknown profile kind: {kind} (expected one of {', '.join(PROFILE_KINDS)})")
+        self.kind = kind
+        self.top_n = top_n
+        suffix = ".pstats" if kind == PROFILE_CPU else ".txt"
+        self.artifact = artifacts_dir / f"profile_{kind}_{stem}{suffix}"
+        self.peak_bytes = 0
+        self.pid = os.getpid()
+        self._profiler = None
+
+    def start(self) -> None:
+        if self.kind == PROFILE_CPU:
+            import cProfile
+
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        else:
+            import tracemalloc
+
+            tracemalloc.start()
+
+    def dump(self) -> Path:
+        self.artifact.parent.mkdir(parents=True, exist_ok=True)
+        if self.kind == PROFILE_CPU:
+            # dump_stats() disables the profiler to snapshot it; re-enable to keep accumulating.
+            self._profiler.dump_stats(str(self.artifact))
+            self._profiler.enable()
+        else:
+            self.artifact.write_text(self._allocation_report(), encoding="utf-8")
+        return self.artifact
+
+    def stop(self) -> None:
+        if self.kind == PROFILE_CPU:
+            self._profiler.disable()
+        else:
+            import tracemalloc
+
+            tracemalloc.stop()
+
+    def summary_fields(self) -> dict[str, object]:
+        fields: dict[str, object] = {"profile": self.kind, "profile_artifact": self.artifact}
+        if self.kind == PROFILE_MEM:
+            fields["profile_peak_mb"] = f"{self.peak_bytes / _MIB:.1f}"
+        return fields
+
+    def _allocation_report(self) -> str:
+        import tracemalloc
+
+        current, self.peak_bytes = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            (
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+            )
+        )
+        stats = snapshot.statistics("lineno")
+        lines = [
+            f"# top {self.top_n} allocation sites by live size at {time.strftime('%Y-%m-%dT%H:%M:%S')}",
+            f"current_mb={current / _MIB:.1f} peak_mb={self.peak_bytes / _MIB:.1f} sites={len(stats)}",
+        ]
+        for rank, stat in enumerate(stats[: self.top_n], start=1):
+            frame = stat.traceback[0]
+            lines.append(f"{rank:>3} {stat.size / 1024:10.1f} KiB {stat.count:8d} blocks  {frame.filename}:{frame.lineno}")
+        return "\n".join(lines) + "\n"
+
+
+_active: ActiveProfile | None = None
+
+
+def active_profile() -> ActiveProfile | None:
+    return _active
+
+
+def dump_active_profile() -> dict[str, object]:
+    # Forked profile workers inherit the module state but must not overwrite the parent's artifact.
+    if _active is None or _active.pid != os.getpid():
+        return {}
+    _active.dump()
+    return _active.summary_fields()
+
+
+@contextmanager
+def profiling(kind: str | None, *, artifacts_dir: Path, stem: str) -> Iterator[ActiveProfile | None]:
+    # Without a kind nothing is imported or started.
+    global _active
+    if not kind:
+        yield None
+        return
+    profile = ActiveProfile(kind, artifacts_dir=artifacts_dir, stem=stem)
+    previous, _active = _active, profile
+    profile.start()
+    try:
+        yield profile
+    finally:
+        try:
+            profile.dump()
+        finally:
+            profile.stop()
+            _active = previous
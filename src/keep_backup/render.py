@@ -0,0 +1,374 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable
+
+from keep_backup.io import note_identity
+
+
+RENDER_SITE_DIR_NAME = "site"
+RENDER_PAGES_DIR_NAME = "pages"
+RENDER_INDEX_FILE_NAME = "index.html"
+RENDER_MANIFEST_FILE_NAME = "manifest.js"
+RENDER_SEARCH_FILE_PREFIX = "search_"
+RENDER_DEFAULT_PAGE_SIZE = 200
+RENDER_SNIPPET_CHARS = 80
+# ASCII words shorter than this are left out of the search index; they match nearly every note.
+RENDER_MIN_ASCII_TOKEN = 2
+_WORD_PATTERN = re.compile(r"\w+")
+
+
+@dataclass
+class RenderResult:
+    notes_count: int = 0
+    pages: int = 0
+    pages_written: int = 0
+    pages_reused: int = 0
+    pages_removed: int = 0
+    search_tokens: int = 0
+    index_file: Path | None = None
+
+    def summary_fields(self) -> dict[str, object]:
+        return {
+            "pages": self.pages,
+            "pages_written": self.pages_written,
+            "pages_reused": self.pages_reused,
+            "pages_removed": self.pages_removed,
+            "search_tokens": self.search_tokens,
+        }
+
+
+def search_tokens(text: str) -> set[str]:
+    # ASCII words whole, everything else as character bigrams; the viewer's tokens() must match.
+    tokens: set[str] = set()
+    for run in _WORD_PATTERN.findall(text.lower()):
+        if run.isascii():
+            if len(run) >= RENDER_MIN_ASCII_TOKEN:
+                tokens.add(run)
+        elif len(run) == 1:
+            tokens.add(run)
+        else:
+            tokens.update(run[index:index + 2] for index in range(len(run) - 1))
+    return tokens
+
+
+def is_page_boundary(note: dict[str, str], page_count: int, page_size: int) -> bool:
+    # Boundaries hang off note identity, so one inserted note changes a single page file.
+    if page_count >= page_size * 2:
+        return True
+    minimum = page_size // 2
+    if page_count < max(1, minimum):
+        return False
+    digest = hashlib.blake2b(note_identity(note).encode("utf-8"), digest_size=4).digest()
+    # Past the minimum a boundary is hit on average every (page_size - minimum) notes.
+    return int.from_bytes(digest, "big") % (page_size - minimum) == 0
+
+
+def render_site(
+    notes: Iterable[dict[str, str]],
+    site_dir: Path,
+    *,
+    generation: str,
+    page_size: int = RENDER_DEFAULT_PAGE_SIZE,
+) -> RenderResult:
+    if page_size < 1:
+        raise ValueError(f"--render-page-size must be positive: {page_size}")
+    pages_dir = site_dir / RENDER_PAGES_DIR_NAME
+    pages_dir.mkdir(parents=True, exist_ok=True)
+    result = RenderResult()
+    pages: list[dict[str, object]] = []
+    postings: dict[str, list[int]] = {}
+    snippets: list[str] = []
+    current: list[dict[str, str]] = []
+
+    def flush() -> None:
+        page_id, content = _page_script(current)
+        page_file = pages_dir / f"{page_id}.js"
+        if page_file.exists():
+            result.pages_reused += 1
+        else:
+            _write_text_atomic(page_file, content)
+            result.pages_written += 1
+        pages.append({"file": f"{RENDER_PAGES_DIR_NAME}/{page_file.name}", "id": page_id, "count": len(current)})
+        current.clear()
+
+    for ordinal, note in enumerate(notes):
+        title = str(note.get("title") or "")
+        body = str(note.get("body") or "")
+        for token in search_tokens(f"{title}\n{body}"):
+            postings.setdefault(token, []).append(ordinal)
+        snippets.append(" ".join((title or body).split())[:RENDER_SNIPPET_CHARS])
+        current.append(note)
+        result.notes_count += 1
+        if is_page_boundary(note, len(current), page_size):
+            flush()
+    if current:
+        flush()
+
+    search_payload = json.dumps(
+        {"tokens": {token: _encode_postings(ordinals) for token, ordinals in sorted(postings.items())}, "snippets": snippets},
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    search_id = hashlib.sha256(search_payload.encode("utf-8")).hexdigest()[:16]
+    search_file = site_dir / f"{RENDER_SEARCH_FILE_PREFIX}{search_id}.js"
+    if not search_file.exists():
+        _write_text_atomic(search_file, f"keepSite.search({search_payload});\n")
+
+    manifest = {
+        "generation": generation,
+        "notes_count": result.notes_count,
+        "page_size": page_size,
+        "pages": pages,
+        "search": search_file.name,
+    }
+    _write_if_changed(
+        site_dir / RENDER_MANIFEST_FILE_NAME,
+        f"keepSite.manifest({json.dumps(manifest, ensure_ascii=False, separators=(',', ':'))});\n",
+    )
+    result.index_file = site_dir / RENDER_INDEX_FILE_NAME
+    _write_if_changed(result.index_file, INDEX_HTML)
+
+    referenced = {str(page["file"]) for page in pages}
+    for stale in pages_dir.glob("*.js"):
+        if f"{RENDER_PAGES_DIR_NAME}/{stale.name}" not in referenced:
+            stale.unlink()
+            result.pages_removed += 1
+    for stale in site_dir.glob(f"{RENDER_SEARCH_FILE_PREFIX}*.js"):
+        if stale != search_file:
+            stale.unlink()
+    result.pages = len(pages)
+    result.search_tokens = len(postings)
+    return result
+
+
+def _page_script(notes: list[dict[str, str]]) -> tuple[str, str]:
+    payload = json.dumps(notes, ensure_ascii=False, separators=(",", ":"))
+    page_id = hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+    # Script files rather than JSON: browsers block fetch() from file:// but still load <script src>.
+    return page_id, f'keepSite.page("{page_id}",{payload});\n'
+
+
+def _encode_postings(ordinals: list[int]) -> str:
+    # Comma-separated base-36 gaps between ascending ordinals.
+    previous = 0
+    parts: list[str] = []
+    for ordinal in ordinals:
+        parts.append(_base36(ordinal - previous))
+        previous = ordinal
+    return ",".join(parts)
+
+
+def _base36(value: int) -> str:
+    digits = "0123456789abcdefghijklmnopqrstuvwxyz"
+    if value == 0:
+        return "0"
+    out = ""
+    while value:
+        value, remainder = divmod(value, 36)
+        out = digits[remainder] + out
+    return out
+
+
+def _write_if_changed(path: Path, content: str) -> bool:
+    try:
+        if path.read_text(encoding="utf-8") == content:
+            return False
+    except OSError:
+        pass
+    _write_text_atomic(path, content)
+    return True
+
+
+def _write_text_atomic(path: Path, content: str) -> None:
+    tmp_file = path.with_name(f"{path.name}.tmp")
+    tmp_file.write_text(content, encoding="utf-8")
+    os.replace(tmp_file, path)
+
+
+INDEX_HTML = """<!doctype html>
+<html lang="ja">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>Keep backup</title>
+<style>
+  body { font-family: system-ui, sans-serif; margin: 0; background: #f5f5f5; color: #202124; }
+  header { position: sticky; top: 0; background: #fff; border-bottom: 1px solid #ddd; padding: 8px 16px; }
+  header h1 { font-size: 16px; margin: 0 0 6px; }
+  #search { width: 100%; box-sizing: border-box; padding: 6px 8px; font-size: 15px; }
+  #pager { margin-top: 6px; font-size: 14px; }
+  main { max-width: 880px; margin: 0 auto; padding: 12px 16px; }
+  .note { background: #fff; border: 1px solid #ddd; border-radius: 8px; padding: 10px 12px; margin-bottom: 10px; }
+  .note.hit { border-color: #f9ab00; box-shadow: 0 0 0 2px #fdd663; }
+  .note h2 { font-size: 15px; margin: 0 0 6px; }
+  .note pre { white-space: pre-wrap; word-break: break-word; font: inherit; margin: 0; }
+  .result { display: block; width: 100%; text-align: left; padding: 6px 8px; margin-bottom: 4px; background: #fff;
+            border: 1px solid #ddd; border-radius: 6px; cursor: pointer; font: inherit; }
+  .muted { color: #5f6368; font-size: 13px; }
+</style>
+</head>
+<body>
+<header>
+  <h1>Keep backup <span id="generation" class="muted"></span></h1>
+  <input id="search" type="search" placeholder="検索" autocomplete="off">
+  <div id="pager">
+    <button id="prev" type="button">&lt;</button>
+    <span id="position" class="muted"></span>
+    <button id="next" type="button">&gt;</button>
+  </div>
+</header>
+<main id="notes"></main>
+<script>
+(function () {
+  "use strict";
+  const MAX_RESULTS = 200;
+  const state = { manifest: null, offsets: [], pages: {}, waiting: {}, search: null, searchWaiting: [], current: 0 };
+  const $ = (id) => document.getElementById(id);
+
+  function loadScript(src) {
+    const script = document.createElement("script");
+    script.src = src;
+    document.head.appendChild(script);
+  }
+
+  window.keepSite = {
+    manifest(manifest) {
+      state.manifest = manifest;
+      let offset = 0;
+      state.offsets = manifest.pages.map((page) => { const start = offset; offset += page.count; return start; });
+      $("generation").textContent = manifest.generation + " / " + manifest.notes_count + " notes";
+      const requested = parseInt((location.hash.match(/^#page=(\\d+)$/) || [])[1] || "1", 10) - 1;
+      showPage(Math.min(Math.max(requested, 0), Math.max(manifest.pages.length - 1, 0)));
+    },
+    page(id, notes) {
+      state.pages[id] = notes;
+      (state.waiting[id] || []).forEach((callback) => callback(notes));
+      delete state.waiting[id];
+    },
+    search(index) {
+      state.search = { snippets: index.snippets, tokens: index.tokens, keys: Object.keys(index.tokens), decoded: {} };
+      state.searchWaiting.splice(0).forEach((callback) => callback());
+    },
+  };
+
+  function withPage(pageIndex, callback) {
+    const page = state.manifest.pages[pageIndex];
+    if (state.pages[page.id]) { callback(state.pages[page.id]); return; }
+    if (!state.waiting[page.id]) { state.waiting[page.id] = []; loadScript(page.file); }
+    state.waiting[page.id].push(callback);
+  }
+
+  function showPage(pageIndex, highlight) {
+    const total = state.manifest.pages.length;
+    state.current = pageIndex;
+    $("position").textContent = total ? (pageIndex + 1) + " / " + total : "0 / 0";
+    $("prev").disabled = pageIndex <= 0;
+    $("next").disabled = pageIndex >= total - 1;
+    if (!total) { $("notes").replaceChildren(); return; }
+    history.replaceState(null, "", "#page=" + (pageIndex + 1));
+    withPage(pageIndex, (notes) => {
+      if (state.current !== pageIndex) return;
+      const cards = notes.map((note, index) => {
+        const card = document.createElement("article");
+        card.className = "note";
+        card.id = "note-" + (state.offsets[pageIndex] + index);
+        if (note.title) { const title = document.createElement("h2"); title.textContent = note.title; card.append(title); }
+        const body = document.createElement("pre");
+        body.textContent = note.body || "";
+        card.append(body);
+        return card;
+      });
+      $("notes").replaceChildren(...cards);
+      const target = highlight === undefined ? null : $("note-" + highlight);
+      if (target) { target.classList.add("hit"); target.scrollIntoView({ block: "center" }); } else { window.scrollTo(0, 0); }
+    });
+  }
+
+  // Keep in step with search_tokens() in keep_backup/render.py.
+  function tokens(text) {
+    const out = new Set();
+    for (const match of text.toLowerCase().match(/[\\p{L}\\p{N}_]+/gu) || []) {
+      const run = Array.from(match);
+      if (/^[\\x00-\\x7f]+$/.test(match)) { if (run.length >= 2) out.add(match); }
+      else if (run.length === 1) out.add(match);
+      else for (let i = 0; i + 1 < run.length; i++) out.add(run[i] + run[i + 1]);
+    }
+    return Array.from(out);
+  }
+
+  function postings(key) {
+    const decoded = state.search.decoded;
+    if (!decoded[key]) {
+      let ordinal = 0;
+      decoded[key] = state.search.tokens[key].split(",").map((gap) => (ordinal += parseInt(gap, 36)));
+    }
+    return decoded[key];
+  }
+
+  function lookup(queryToken) {
+    // ASCII words match as prefixes; a single non-ASCII character matches any bigram containing it.
+    const ascii = /^[\\x00-\\x7f]+$/.test(queryToken);
+    const single = !ascii && Array.from(queryToken).length === 1;
+    const matches = new Set();
+    for (const key of state.search.keys) {
+      if (ascii ? key.startsWith(queryToken) : single ? key.includes(queryToken) : key === queryToken) {
+        postings(key).forEach((ordinal) => matches.add(ordinal));
+      }
+    }
+    return matches;
+  }
+
+  function pageOf(ordinal) {
+    let low = 0;
+    let high = state.offsets.length - 1;
+    while (low < high) {
+      const mid = (low + high + 1) >> 1;
+      if (state.offsets[mid] <= ordinal) low = mid; else high = mid - 1;
+    }
+    return low;
+  }
+
+  function runSearch() {
+    const queryTokens = tokens($("search").value);
+    if (!queryTokens.length) { showPage(state.current); return; }
+    let hits = null;
+    for (const queryToken of queryTokens) {
+      const matches = lookup(queryToken);
+      hits = hits === null ? matches : new Set([...hits].filter((ordinal) => matches.has(ordinal)));
+    }
+    const ordinals = Array.from(hits).sort((a, b) => a - b);
+    const header = document.createElement("p");
+    header.className = "muted";
+    header.textContent = ordinals.length + " 件" + (ordinals.length > MAX_RESULTS ? "（先頭 " + MAX_RESULTS + " 件を表示）" : "");
+    const items = ordinals.slice(0, MAX_RESULTS).map((ordinal) => {
+      const item = document.createElement("button");
+      item.type = "button";
+      item.className = "result";
+      item.textContent = state.search.snippets[ordinal] || "(無題)";
+      item.addEventListener("click", () => { $("search").value = ""; showPage(pageOf(ordinal), ordinal); });
+      return item;
+    });
+    $("notes").replaceChildren(header, ...items);
+  }
+
+  $("search").addEventListener("input", () => {
+    if (!state.manifest) return;
+    if (state.search) { runSearch(); return; }
+    // The search index is only fetched on first use so opening the site stays instant.
+    if (!state.searchWaiting.length) loadScript(state.manifest.search);
+    state.searchWaiting.splice(0, state.searchWaiting.length, runSearch);
+  });
+  $("prev").addEventListener("click", () => showPage(state.current - 1));
+  $("next").addEventListener("click", () => showPage(state.current + 1));
+})();
+</script>
+<script src="manifest.js"></script>
+</body>
+</html>
+"""
@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
+
+from keep_backup.metrics import current_phase, current_run_metrics
+
+
+PROC_ROOT = Path("/proc")
+# Chromium and headless_shell show up under these command names. The Playwright driver runs as
+# plain ``node``, so it is recognised by its place in the tree instead: the parent of a browser.
+BROWSER_PROCESS_MARKERS = ("chrom", "headless_shell")
+RESOURCE_OTHER_PHASE = "other"
+_MIB = 1024 * 1024
+
+
+@dataclass
+class ProcessTreeSample:
+    python_rss: int
+    python_cpu: float
+    browser_rss: int
+    browser_cpu: float
+
+
+@dataclass
+class PhaseUsage:
+    # CPU is charged to the phase of the later of two samples.
+    samples: int = 0
+    wall_seconds: float = 0.0
+    python_rss_peak: int = 0
+    python_rss_total: int = 0
+    python_cpu_seconds: float = 0.0
+    browser_rss_peak: int = 0
+    browser_rss_total: int = 0
+    browser_cpu_seconds: float = 0.0
+
+    def add(self, sample: ProcessTreeSample, previous: ProcessTreeSample | None, wall_seconds: float) -> None:
+        self.samples += 1
+        self.python_rss_peak = max(self.python_rss_peak, sample.python_rss)
+        self.python_rss_total += sample.python_rss
+        self.browser_rss_peak = max(self.browser_rss_peak, sample.browser_rss)
+        self.browser_rss_total += sample.browser_rss
+        if previous is not None:
+            self.wall_seconds += wall_seconds
+            # Exited children take their CPU time with them; never report negative usage.
+            self.python_cpu_seconds += max(0.0, sample.python_cpu - previous.python_cpu)
+            self.browser_cpu_seconds += max(0.0, sample.browser_cpu - previous.browser_cpu)
+
+    def log_fields(self) -> str:
+        cpu_percent = 0.0
+        if self.wall_seconds > 0:
+            cpu_percent = 100 * (self.python_cpu_seconds + self.browser_cpu_seconds) / self.wall_seconds
+        return (
+            f"samples={self.samples} "
+            f"python_rss_peak_mb={self.python_rss_peak / _MIB:.1f} "
+            f"python_rss_avg_mb={self.python_rss_total / max(self.samples, 1) / _MIB:.1f} "
+            f"python_cpu_seconds={self.python_cpu_seconds:.2f} "
+            f"browser_rss_peak_mb={self.browser_rss_peak / _MIB:.1f} "
+            f"browser_rss_avg_mb={self.browser_rss_total / max(self.samples, 1) / _MIB:.1f} "
+            f"browser_cpu_seconds={self.browser_cpu_seconds:.2f} "
+            f"cpu_avg_percent={cpu_percent:.0f}"
+        )
+
+
+def proc_available(proc_root: Path = PROC_ROOT) -> bool:
+    return (proc_root / "self" / "stat").exists()
+
+
+def _read_proc_stat(stat_file: Path) -> tuple[str, int, int, int] | None:
+    # (comm, ppid, utime+stime ticks, rss pages) from /proc/<pid>/stat.
+    try:
+        raw = stat_file.read_text(encoding="utf-8", errors="replace")
+    except OSError:
+        return None
+    # comm is parenthesised and may itself contain spaces or parentheses.
+    open_paren, close_paren = raw.find("("), raw.rfind(")")
+    if open_paren < 0 or close_paren < 0:
+        return None
+    fields = raw[close_paren + 2:].split()
+    try:
+        return raw[open_paren + 1:close_paren], int(fields[1]), int(fields[11]) + int(fields[12]), int(fields[21])
+    except (IndexError, ValueError):
+        return None
+
+
+def sample_process_tree(root_pid: int, proc_root: Path = PROC_ROOT) -> ProcessTreeSample:
+    processes: dict[int, tuple[str, int, int, int]] = {}
+    for entry in proc_root.iterdir():
+        if entry.name.isdigit():
+            stat = _read_proc_stat(entry / "stat")
+            if stat is not None:
+                processes[int(entry.name)] = stat
+    children: dict[int, list[int]] = {}
+    for pid, (_comm, ppid, _cpu, _rss) in processes.items():
+        children.setdefault(ppid, []).append(pid)
+
+    ticks_per_second = os.sysconf("SC_CLK_TCK")
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    def is_browser(pid: int) -> bool:
+        return any(marker in processes[pid][0].lower() for marker in BROWSER_PROCESS_MARKERS)
+
+    sample = ProcessTreeSample(python_rss=0, python_cpu=0.0, browser_rss=0, browser_cpu=0.0)
+    pending = [root_pid]
+    while pending:
+        pid = pending.pop()
+        pending.extend(children.get(pid, []))
+        if pid not in processes:
+            continue
+        _comm, _ppid, cpu_ticks, rss_pages = processes[pid]
+        launches_browser = pid != root_pid and any(is_browser(child) for child in children.get(pid, []))
+        if is_browser(pid) or launches_browser:
+            sample.browser_rss += rss_pages * page_size
+            sample.browser_cpu += cpu_ticks / ticks_per_second
+        else:
+            sample.python_rss += rss_pages * page_size
+            sample.python_cpu += cpu_ticks / ticks_per_second
+    return sample
+
+
+class ResourceSampler:
+    def __init__(self, interval_seconds: float, *, root_pid: int | None = None, proc_root: Path = PROC_ROOT) -> None:
+        self._interval = interval_seconds
+        self._root_pid = root_pid or os.getpid()
+        self._proc_root = proc_root
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="keep-resource-sampler", daemon=True)
+        self._previous: ProcessTreeSample | None = None
+        self._previous_at = 0.0
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def sample_once(self) -> None:
+        now = time.perf_counter()
+        sample = sample_process_tree(self._root_pid, self._proc_root)
+        usage = current_run_metrics().resources.setdefault(current_phase() or RESOURCE_OTHER_PHASE, PhaseUsage())
+        usage.add(sample, self._previous, now - self._previous_at)
+        self._previous, self._previous_at = sample, now
+
+    def _run(self) -> None:
+        while True:
+            try:
+                self.sample_once()
+            except OSError:
+                pass
+            if self._stop.wait(self._interval):
+                return
+
+
+@contextmanager
+def resource_sampling(interval_ms: int) -> Iterator[ResourceSampler | None]:
+    if interval_ms <= 0 or not proc_available():
+        yield None
+        return
+    sampler = ResourceSampler(interval_ms / 1000)
+    sampler.start()
+    try:
+        yield sampler
+    finally:
+        sampler.stop()
+
+
+def resource_summary_fields(resources: dict[str, PhaseUsage]) -> dict[str, object]:
+    if not resources:
+        return {}
+    usages = list(resources.values())
+    samples = max(sum(usage.samples for usage in usages), 1)
+    return {
+        "python_rss_peak_mb": f"{max(usage.python_rss_peak for usage in usages) / _MIB:.1f}",
+        "python_rss_avg_mb": f"{sum(usage.python_rss_total for usage in usages) / samples / _MIB:.1f}",
+        "browser_rss_peak_mb": f"{max(usage.browser_rss_peak for usage in usages) / _MIB:.1f}",
+        "browser_rss_avg_mb": f"{sum(usage.browser_rss_total for usage in usages) / samples / _MIB:.1f}",
+        "python_cpu_seconds": f"{sum(usage.python_cpu_seconds for usage in usages):.2f}",
+        "browser_cpu_seconds": f"{sum(usage.browser_cpu_seconds for usage in usages):.2f}",
+    }
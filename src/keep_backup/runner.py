@@ -1,18 +1,91 @@
 from __future__ import annotations
 
+import hashlib
+import itertools
+import json
 import os
-from contextlib import contextmanager
-from datetime import datetime
+import re
+import time
+import weakref
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import ExitStack, contextmanager, redirect_stdout
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from io import StringIO
 from pathlib import Path
-from typing import Iterator
+from typing import Callable, Iterator, NoReturn
 
 from keep_backup.io import (
+    BINARY_BACKUP_SUFFIX,
+    NOTES_FORMAT_AUTO,
     RunPaths,
     append_log,
     build_paths,
+    clear_checkpoint,
+    convert_generation,
+    find_latest_generation,
+    list_generations,
     format_bool,
-    load_notes_from_file,
+    iter_generation_notes,
+    iter_notes_from_file,
+    load_checkpoint,
+    load_generation,
+    load_parse_cache,
+    load_profiles_file,
+    store_parse_cache,
     write_backup,
+    write_checkpoint,
+    write_unchanged_generation,
+)
+from keep_backup.deadline import DEADLINE_MIN_TIMEOUT_MS, PhaseBudget, RunDeadline
+from keep_backup.diff import diff_generations, format_diff_lines
+from keep_backup.jobserver import serve_jobs
+from keep_backup.keep_sync import NetworkNoteCapture
+from keep_backup.launch_presets import LAUNCH_PRESETS, load_launch_preset
+from keep_backup.login_check import LoginCheckCache, build_login_check_path, load_login_check_ttl
+from keep_backup.metrics import (
+    METRICS_DEFAULT_PROFILE,
+    RunMetrics,
+    build_metrics_path,
+    current_run_metrics,
+    pop_run_metrics,
+    read_last_success_timestamp,
+    record_phase,
+    render_openmetrics,
+    run_phase,
+    set_run_label,
+    set_run_metric,
+    timed_enter,
+    write_metrics_textfile,
+)
+from keep_backup.profiling import dump_active_profile
+from keep_backup.render import RENDER_DEFAULT_PAGE_SIZE, RENDER_SITE_DIR_NAME, render_site
+from keep_backup.resources import resource_summary_fields
+from keep_backup.schedule import next_run_after, parse_cron
+from keep_backup.snapshot_history import HISTORY_DIR_NAME, SnapshotHistory
+from keep_backup.writer import BackgroundWriter, background_writes, submit_write
+from keep_backup.verify import (
+    VERIFY_STATUS_FAILED,
+    VERIFY_STATUS_OK,
+    find_generations,
+    generation_signature,
+    verify_generation,
+)
+from keep_backup.selector_registry import (
+    SELECTOR_GROUP_BODY,
+    SELECTOR_GROUP_CARD,
+    SELECTOR_GROUP_PROBE,
+    SELECTOR_GROUP_TITLE,
+    SELECTOR_REGISTRY,
+    SELECTOR_STATUS_STOPPED,
+    build_plan,
+    default_plan,
+    detect_locale,
+    load_selector_stats,
+    record_selector_hits,
+    selector_report,
+    write_selector_stats,
 )
 
 
@@ -21,17 +94,90 @@ DOM_SNAPSHOT_MAX_CHARS = 200_000
 INFINITE_SCROLL_MAX_ITERATIONS = 12
 INFINITE_SCROLL_WAIT_MS = 1_000
 INFINITE_SCROLL_STABLE_PASSES = 2
+INFINITE_SCROLL_STEP_PX = 2_000
+RESUME_FAST_FORWARD_WAIT_MS = 250
+# After a cached login check: card count polls that must agree before the grid counts as rendered.
+CARDS_STABLE_POLL_MS = 250
+CARDS_STABLE_POLLS = 2
+BACKUP_CHECKPOINT_FILE_NAME = "backup_checkpoint.json"
+BACKUP_CHECKPOINT_EVERY_ITERATIONS = 3
+BACKUP_CHECKPOINT_MAX_AGE_SECONDS = 24 * 60 * 60
+CHANGE_PROBE_CARD_LIMIT = 20
+CHANGE_PROBE_MAX_SKIP_AGE_DAYS = 28
+MULTI_PROFILE_DEFAULT_CONCURRENCY = 2
+SESSION_STATE_MAX_AGE_SECONDS = 24 * 60 * 60
+SESSION_STATE_AUTH_COOKIES = ("SID", "__Secure-1PSID", "__Secure-3PSID")
+# Pages the session-state check already navigated to Keep, with the response it got; the first
+# _verify_playwright_page on such a page reuses that load instead of navigating again.
+_SESSION_STATE_LANDINGS: weakref.WeakKeyDictionary[object, object] = weakref.WeakKeyDictionary()
+DAEMON_DEFAULT_SCHEDULE = "0 3 * * 0"
+DAEMON_RETRY_BASE_SECONDS = 300
+DAEMON_RETRY_MAX_SECONDS = 6 * 60 * 60
 DOM_PARSED_OUTPUT_FILE_NAME = "keep_from_dom.json"
-KEEP_PROBE_NOTES_SELECTOR = ", ".join(
-    [
-        '[aria-label="Notes"] [role="listitem"]',
-        '[aria-label="Notes"] [role="list"]',
-        '[aria-label="メモ"] [role="listitem"]',
-        '[aria-label="メモ"] [role="list"]',
-        '[aria-label="Select note"]',
-        '[aria-label="メモを選択"]',
-    ]
-)
+OUTPUT_FORMAT_JSON = "json"
+OUTPUT_FORMAT_BINARY = "binary"
+# Bump when the Python-side normalization in _extract_note_payloads changes.
+NOTE_PAYLOADS_EXTRACTOR_VERSION = 1
+PARSE_DOM_CACHE_MAX_BYTES = 64 * 1024 * 1024
+KEEP_PROBE_NOTES_SELECTOR = ", ".join(default_plan()[SELECTOR_GROUP_PROBE])
+SELECTOR_STATS_FILE_NAME = "selector_stats.json"
+VERIFY_STATE_FILE_NAME = "verify_state.json"
+METRICS_DIR_NAME = "metrics"
+# The backup run logs itself as "run"; every other run label already names its mode.
+METRICS_MODE_LABELS = {"run": "backup"}
+HARVEST_DOM = "dom"
+HARVEST_NETWORK = "network"
+HARVEST_SHARDED = "sharded"
+# How long to wait for Keep's initial sync download before falling back to scrolling the DOM.
+NETWORK_CAPTURE_TIMEOUT_MS = 15000
+NETWORK_CAPTURE_POLL_MS = 250
+HAR_RECORD_ENV = "KEEP_HAR_RECORD_PATH"
+HAR_REPLAY_ENV = "KEEP_HAR_REPLAY_PATH"
+HAR_SCRUBBED_HEADERS = ("cookie", "set-cookie", "authorization", "x-goog-authuser")
+DIFF_FORMAT_TEXT = "text"
+DIFF_FORMAT_JSON = "json"
+HYDRATION_POOL_SIZE = 4
+HYDRATION_TIMEOUT_MS = 10_000
+# Opening a note by URL shows it in Keep's editor dialog over the grid.
+HYDRATION_EDITOR_SELECTOR = '[role="dialog"]'
+SHARD_POOL_SIZE = 4
+SHARD_SCROLL_MAX_ITERATIONS = INFINITE_SCROLL_MAX_ITERATIONS
+# A freshly opened label view shows no cards for a while; an empty view only counts as stable after this.
+SHARD_SETTLE_MS = PLAYWRIGHT_PAGE_SETTLE_MS
+SHARD_LABEL_LINK_SELECTOR = 'a[href*="#label/"]'
+# Keep has no "no label" filter, so the remainder shard is the home grid; its labelled notes dedupe away.
+SHARD_UNLABELLED_NAME = "unlabelled"
+SHARD_UNLABELLED_URL = "https://keep.google.com/#home"
+KEEP_NOTE_ID_PATTERN = re.compile(r"#(?:NOTE|LIST)/([^/?#]+)")
+LAUNCH_BENCH_DEFAULT_REPEATS = 3
+LAUNCH_BENCH_NOTES_SELECTOR = '[data-testid="keep-note"]'
+
+
+@dataclass
+class HarvestShard:
+    # A label view, or the unlabelled remainder, harvested on its own page.
+    name: str
+    url: str
+    page: object | None = None
+    started: float = 0.0
+    seconds: float = 0.0
+    iterations: int = 0
+    highest_count: int = 0
+    stable_passes: int = 0
+    stopped_by: str = ""
+    notes: list[dict[str, str]] = field(default_factory=list)
+    hydration_targets: list[tuple[int, str]] = field(default_factory=list)
+
+
+@dataclass
+class ChangeProbe:
+    previous_file: Path | None
+    previous_fingerprint: dict[str, object] | None
+    previous_scraped_at: datetime | None
+    force_full: bool
+    max_skip_age: timedelta
+    fingerprint: dict[str, object] | None = None
+    unchanged: bool = False
 
 
 def load_keep_profile_dir() -> Path | None:
@@ -43,17 +189,31 @@ def load_keep_profile_dir() -> Path | None:
     return Path(raw_value).expanduser()
 
 
-def build_notes(note_bodies: list[str], notes_file: Path | None) -> list[dict[str, str]]:
-    notes: list[dict[str, str]] = []
+def iter_manual_notes(
+    note_bodies: list[str],
+    notes_file: Path | None,
+    *,
+    notes_format: str = NOTES_FORMAT_AUTO,
+) -> Iterator[dict[str, str]]:
+    # Raises before the first write when nothing was given; the notes file is never read whole.
+    notes = _iter_manual_notes(note_bodies, notes_file, notes_format)
+    first_note = next(notes, None)
+    if first_note is None:
+        raise ValueError("no notes provided. Use --note or --notes-file.")
+    return itertools.chain([first_note], notes)
+
+
+def _iter_manual_notes(
+    note_bodies: list[str],
+    notes_file: Path | None,
+    notes_format: str,
+) -> Iterator[dict[str, str]]:
     for body in note_bodies:
         body = body.strip()
         if body:
-            notes.append({"body": body})
+            yield {"body": body}
     if notes_file:
-        notes.extend(load_notes_from_file(notes_file))
-    if not notes:
-        raise ValueError("no notes provided. Use --note or --notes-file.")
-    return notes
+        yield from iter_notes_from_file(notes_file, notes_format)
 
 
 def _print_summary(
@@ -64,6 +224,7 @@ def _print_summary(
     output: Path | str,
     log_file: Path,
     error_message: str | None,
+    summary_fields: dict[str, object] | None = None,
 ) -> None:
     summary = (
         "summary "
@@ -73,6 +234,8 @@ def _print_summary(
         f"output={output} "
         f"log_file={log_file}"
     )
+    for key, value in (summary_fields or {}).items():
+        summary += f" {key}={value}"
     print(summary)
     if error_message:
         print(f"error={error_message}")
@@ -87,15 +250,54 @@ def _finalize_run(
     notes_count: int,
     output: Path | str,
     error_message: str | None,
+    summary_fields: dict[str, object] | None = None,
+    mode: str | None = None,
 ) -> None:
     end = datetime.now()
     duration = (end - start).total_seconds()
+    metrics = pop_run_metrics()
+    if metrics.phase_seconds:
+        append_log(
+            log_file,
+            "phases " + " ".join(f"{phase}={seconds:.3f}" for phase, seconds in metrics.phase_seconds.items()),
+        )
+    if metrics.resources:
+        for phase, usage in sorted(metrics.resources.items()):
+            append_log(log_file, f"resources phase={phase} {usage.log_fields()}")
+        summary_fields = {**(summary_fields or {}), **resource_summary_fields(metrics.resources)}
+    if "launch_preset" in metrics.labels:
+        summary_fields = {
+            **(summary_fields or {}),
+            "launch_preset": metrics.labels["launch_preset"],
+            "launch_to_first_page_ms": f"{metrics.values.get('launch_to_first_page_seconds', 0) * 1000:.0f}",
+        }
+    try:
+        profile_fields = dump_active_profile()
+    except Exception as exc:  # noqa: BLE001
+        append_log(log_file, f"profile dump_error={exc}")
+    else:
+        if profile_fields:
+            append_log(log_file, f"profile kind={profile_fields['profile']} artifact={profile_fields['profile_artifact']}")
+            summary_fields = {**(summary_fields or {}), **profile_fields}
     append_log(log_file, f"{run_label} finished (success={success}) end_time={end.isoformat()}")
     append_log(log_file, f"duration_seconds={duration:.2f}")
     append_log(log_file, f"notes_count={notes_count}")
     append_log(log_file, f"output={output}")
+    for key, value in (summary_fields or {}).items():
+        append_log(log_file, f"{key}={value}")
     if error_message:
         append_log(log_file, f"error={error_message}")
+    _write_run_metrics(
+        metrics,
+        log_file=log_file,
+        run_label=run_label,
+        mode=mode,
+        end=end,
+        success=success,
+        duration=duration,
+        notes_count=notes_count,
+        output=output,
+    )
     _print_summary(
         success=success,
         notes_count=notes_count,
@@ -103,13 +305,92 @@ def _finalize_run(
         output=output,
         log_file=log_file,
         error_message=error_message,
+        summary_fields=summary_fields,
     )
 
 
-def run_backup(note_bodies: list[str], notes_file: Path | None) -> int:
+def load_metrics_dir(log_file: Path) -> Path:
+    raw_value = os.getenv("KEEP_METRICS_TEXTFILE_DIR", "").strip()
+    if raw_value:
+        return Path(raw_value).expanduser()
+    return log_file.parent / METRICS_DIR_NAME
+
+
+def _metrics_profile_label(log_file: Path) -> str:
+    # build_paths() nests per-profile logs as logs/<profile>/run_*.log.
+    parent_name = log_file.parent.name
+    return parent_name if parent_name and parent_name != "logs" else METRICS_DEFAULT_PROFILE
+
+
+def _write_run_metrics(
+    metrics: RunMetrics,
+    *,
+    log_file: Path,
+    run_label: str,
+    mode: str | None,
+    end: datetime,
+    success: bool,
+    duration: float,
+    notes_count: int,
+    output: Path | str,
+) -> None:
+    try:
+        # The CLI mode when known: several smoke modes share one run label but need their own file.
+        mode = mode or METRICS_MODE_LABELS.get(run_label, run_label.replace(" ", "-"))
+        profile = _metrics_profile_label(log_file)
+        metrics_file = build_metrics_path(load_metrics_dir(log_file), mode=mode, profile=profile)
+        last_success = end.timestamp() if success else read_last_success_timestamp(metrics_file)
+        output_path = Path(output)
+        output_bytes = output_path.stat().st_size if output_path.is_file() else 0
+        write_metrics_textfile(
+            metrics_file,
+            render_openmetrics(
+                mode=mode,
+                profile=profile,
+                success=success,
+                duration_seconds=duration,
+                notes_count=notes_count,
+                output_bytes=output_bytes,
+                last_success_timestamp=last_success,
+                metrics=metrics,
+            ),
+        )
+        append_log(log_file, f"metrics_file={metrics_file}")
+    except Exception as exc:  # noqa: BLE001
+        append_log(log_file, f"metrics_error={exc}")
+
+
+def run_backup(
+    note_bodies: list[str],
+    notes_file: Path | None,
+    *,
+    resume: bool = False,
+    force_full: bool = False,
+    max_skip_age_days: int = CHANGE_PROBE_MAX_SKIP_AGE_DAYS,
+    output_format: str = OUTPUT_FORMAT_JSON,
+    notes_format: str = NOTES_FORMAT_AUTO,
+    harvest: str = HARVEST_DOM,
+    deadline_seconds: float | None = None,
+    hydrate_pool: int = HYDRATION_POOL_SIZE,
+    shard_pages: int = SHARD_POOL_SIZE,
+) -> int:
     start = datetime.now()
     paths = build_paths(start)
-    return run_backup_with_paths(note_bodies, notes_file, paths, start)
+    return run_backup_with_paths(
+        note_bodies,
+        notes_file,
+        paths,
+        start,
+        resume=resume,
+        force_full=force_full,
+        max_skip_age_days=max_skip_age_days,
+        output_format=output_format,
+        notes_format=notes_format,
+        harvest=harvest,
+        deadline_seconds=deadline_seconds,
+        hydrate_pool=hydrate_pool,
+        shard_pages=shard_pages,
+    )
 
 
 def run_backup_with_paths(
@@ -117,33 +398,553 @@ def run_backup_with_paths(
     notes_file: Path | None,
     paths: RunPaths,
     start: datetime,
+    *,
+    resume: bool = False,
+    page: object | None = None,
+    force_full: bool = False,
+    max_skip_age_days: int = CHANGE_PROBE_MAX_SKIP_AGE_DAYS,
+    output_format: str = OUTPUT_FORMAT_JSON,
+    notes_format: str = NOTES_FORMAT_AUTO,
+    harvest: str = HARVEST_DOM,
+    deadline_seconds: float | None = None,
+    hydrate_pool: int = HYDRATION_POOL_SIZE,
+    shard_pages: int = SHARD_POOL_SIZE,
 ) -> int:
     append_log(paths.log_file, f"run started start_time={start.isoformat()}")
+    if output_format == OUTPUT_FORMAT_BINARY:
+        paths = RunPaths(
+            backup_dir=paths.backup_dir,
+            backup_file=paths.backup_file.with_suffix(BINARY_BACKUP_SUFFIX),
+            log_file=paths.log_file,
+        )
 
     success = False
     notes: list[dict[str, str]] = []
+    notes_count = 0
     error_message = None
+    change_probe: ChangeProbe | None = None
+    summary_fields: dict[str, object] = {}
+    deadline: RunDeadline | None = None
+    writer = BackgroundWriter()
 
     try:
-        if note_bodies or notes_file:
-            append_log(paths.log_file, "backup source=manual")
-            append_log(paths.log_file, "backup dom_snapshot_skipped=true reason=manual_input")
-            notes = build_notes(note_bodies, notes_file)
-        else:
-            notes = _collect_keep_notes_for_backup(paths.log_file)
-        write_backup(paths.backup_file, start, notes)
+        with background_writes(writer):
+            if deadline_seconds is not None:
+                # Measured from the run's start so interpreter and profile start-up count against it too.
+                deadline = RunDeadline.after(deadline_seconds, started_at=start.timestamp())
+                append_log(
+                    paths.log_file,
+                    f"run deadline_seconds={deadline_seconds:g} reserve_seconds={deadline.reserve_seconds:.1f}",
+                )
+            if note_bodies or notes_file:
+                append_log(paths.log_file, "backup source=manual")
+                append_log(paths.log_file, "backup dom_snapshot_skipped=true reason=manual_input")
+                ingest_started = time.perf_counter()
+                with run_phase("write"):
+                    notes_count = write_backup(
+                        paths.backup_file,
+                        start,
+                        iter_manual_notes(note_bodies, notes_file, notes_format=notes_format),
+                    )
+                ingest_seconds = time.perf_counter() - ingest_started
+                summary_fields["ingest_notes_per_second"] = f"{notes_count / max(ingest_seconds, 1e-9):.0f}"
+                append_log(paths.log_file, f"backup ingest streamed notes_count={notes_count}")
+            else:
+                change_probe = _build_change_probe(
+                    paths,
+                    start=start,
+                    force_full=force_full,
+                    max_skip_age_days=max_skip_age_days,
+                )
+                notes = _collect_keep_notes_for_backup(
+                    paths.log_file,
+                    resume=resume,
+                    page=page,
+                    change_probe=change_probe,
+                    harvest=harvest,
+                    deadline=deadline,
+                    hydrate_pool=hydrate_pool,
+                    shard_pages=shard_pages,
+                )
+                if change_probe.unchanged:
+                    notes = _record_unchanged_generation(paths, start=start, change_probe=change_probe)
+                    submit_write("checkpoint", lambda: clear_checkpoint(_build_checkpoint_path(paths.log_file)))
+                else:
+                    metadata = None
+                    if change_probe.fingerprint is not None:
+                        metadata = {"fingerprint": change_probe.fingerprint}
+                    # The checkpoint is only dropped once the generation it backs is on disk.
+                    submit_write(
+                        f"backup {paths.backup_file}",
+                        lambda: _write_backup_and_clear_checkpoint(paths, start, notes, metadata=metadata),
+                    )
+                notes_count = len(notes)
+                run_values = current_run_metrics().values
+                if "hydration_candidates" in run_values:
+                    summary_fields["hydrated"] = (
+                        f"{run_values['hydrated_notes']:.0f}/{run_values['hydration_candidates']:.0f}"
+                    )
+                    summary_fields["hydrated_notes_per_second"] = f"{run_values['hydrated_notes_per_second']:.1f}"
+                if "harvest_shards" in run_values:
+                    summary_fields["shards"] = f"{run_values['harvest_shards']:.0f}"
+                    summary_fields["shard_duplicates"] = f"{run_values['harvest_shard_duplicates']:.0f}"
+        if writer.errors:
+            raise RuntimeError(f"background writes failed: {writer.error_summary()}")
         success = True
     except Exception as exc:  # noqa: BLE001
         error_message = str(exc)
     finally:
+        append_log(
+            paths.log_file,
+            f"writer jobs={writer.jobs} blocked_seconds={writer.blocked_seconds:.3f} errors={len(writer.errors)}",
+        )
+        if writer.errors:
+            summary_fields["write_errors"] = len(writer.errors)
+        if deadline is not None:
+            summary_fields["deadline_hit"] = format_bool(deadline.hit)
+            if deadline.hit_phase is not None:
+                summary_fields["deadline_phase"] = deadline.hit_phase
         _finalize_run(
             log_file=paths.log_file,
             run_label="run",
             start=start,
             success=success,
-            notes_count=len(notes),
+            notes_count=notes_count,
             output=paths.backup_file,
             error_message=error_message,
+            summary_fields=summary_fields,
+        )
+
+    return 0 if success else 1
+
+
+def _write_backup_and_clear_checkpoint(
+    paths: RunPaths,
+    start: datetime,
+    notes: list[dict[str, str]],
+    *,
+    metadata: dict[str, object] | None,
+) -> None:
+    write_started = time.perf_counter()
+    write_backup(paths.backup_file, start, notes, metadata=metadata)
+    # Runs on the writer thread, so the phase is recorded directly instead of via run_phase().
+    record_phase("write", time.perf_counter() - write_started)
+    clear_checkpoint(_build_checkpoint_path(paths.log_file))
+
+
+def _profile_executor(max_workers: int) -> Executor:
+    return ProcessPoolExecutor(max_workers=max_workers)
+
+
+def _run_profile_backup(
+    profile_name: str,
+    profile_dir: Path,
+    start: datetime,
+    backup_options: dict[str, object],
+) -> tuple[int, str]:
+    # Runs in a worker process, so pointing the profile env at this account is isolated.
+    os.environ["KEEP_BROWSER_PROFILE_DIR"] = str(profile_dir)
+    paths = build_paths(start, profile=profile_name)
+    stdout = StringIO()
+    with redirect_stdout(stdout):
+        exit_code = run_backup_with_paths([], None, paths, start, **backup_options)
+    return exit_code, stdout.getvalue()
+
+
+def run_multi_profile_backup(
+    profiles_file: Path,
+    *,
+    concurrency: int = MULTI_PROFILE_DEFAULT_CONCURRENCY,
+    resume: bool = False,
+    force_full: bool = False,
+    max_skip_age_days: int = CHANGE_PROBE_MAX_SKIP_AGE_DAYS,
+    output_format: str = OUTPUT_FORMAT_JSON,
+    harvest: str = HARVEST_DOM,
+    deadline_seconds: float | None = None,
+    hydrate_pool: int = HYDRATION_POOL_SIZE,
+    shard_pages: int = SHARD_POOL_SIZE,
+) -> int:
+    start = datetime.now()
+    paths = build_paths(start)
+    append_log(paths.log_file, f"multi-profile backup started start_time={start.isoformat()}")
+
+    success = False
+    notes_count = 0
+    error_message = None
+    results: dict[str, tuple[int, str]] = {}
+    profiles: dict[str, Path] = {}
+
+    try:
+        profiles = load_profiles_file(profiles_file)
+        max_workers = max(1, min(concurrency, len(profiles)))
+        append_log(
+            paths.log_file,
+            f"multi-profile backup profiles={','.join(profiles)} concurrency={max_workers}",
+        )
+        backup_options: dict[str, object] = {
+            "resume": resume,
+            "force_full": force_full,
+            "max_skip_age_days": max_skip_age_days,
+            "output_format": output_format,
+            "harvest": harvest,
+            # Every profile shares this run's start, so the deadline bounds the whole batch.
+            "deadline_seconds": deadline_seconds,
+            "hydrate_pool": hydrate_pool,
+            "shard_pages": shard_pages,
+        }
+        with _profile_executor(max_workers) as executor:
+            futures = {
+                name: executor.submit(_run_profile_backup, name, profile_dir, start, backup_options)
+                for name, profile_dir in profiles.items()
+            }
+            for name, future in futures.items():
+                try:
+                    results[name] = future.result()
+                except Exception as exc:  # noqa: BLE001
+                    results[name] = (1, f"error={exc}\n")
+
+        failed = []
+        for name, (exit_code, output) in results.items():
+            profile_notes = _print_profile_output(name, output)
+            notes_count += profile_notes
+            append_log(
+                paths.log_file,
+                f"multi-profile backup profile={name} exit_code={exit_code} notes_count={profile_notes}",
+            )
+            if exit_code != 0:
+                failed.append(name)
+        if failed:
+            raise RuntimeError(f"profile backups failed: {','.join(failed)}")
+        success = True
+    except Exception as exc:  # noqa: BLE001
+        error_message = str(exc)
+    finally:
+        _finalize_run(
+            log_file=paths.log_file,
+            run_label="multi-profile backup",
+            start=start,
+            success=success,
+            notes_count=notes_count,
+            output=Path("backups"),
+            error_message=error_message,
+            summary_fields={
+                "profiles": len(profiles),
+                "profiles_failed": sum(1 for exit_code, _ in results.values() if exit_code != 0),
+            },
+        )
+
+    return 0 if success else 1
+
+
+def _print_profile_output(profile_name: str, output: str) -> int:
+    notes_count = 0
+    for line in output.splitlines():
+        if line.startswith("summary "):
+            match = re.search(r"\bnotes_count=(\d+)", line)
+            if match:
+                notes_count = int(match.group(1))
+            print(f"summary profile={profile_name} {line[len('summary '):]}")
+        elif line.startswith("error="):
+            print(f"error=[{profile_name}] {line[len('error='):]}")
+    return notes_count
+
+
+def run_convert_with_paths(
+    *,
+    paths: RunPaths,
+    start: datetime,
+    source: Path | None,
+    target: Path | None,
+) -> int:
+    append_log(paths.log_file, f"convert started start_time={start.isoformat()}")
+
+    success = False
+    notes_count = 0
+    error_message = None
+    output: Path | str = target or "(none)"
+
+    try:
+        if source is None or target is None:
+            raise ValueError("--convert-input and --convert-output are required for --mode convert")
+        if not source.exists():
+            raise FileNotFoundError(f"generation not found: {source}")
+        append_log(paths.log_file, f"convert input={source} output={target}")
+        notes_count = convert_generation(source, target)
+        append_log(
+            paths.log_file,
+            f"convert input_bytes={source.stat().st_size} output_bytes={target.stat().st_size}",
+        )
+        success = True
+    except Exception as exc:  # noqa: BLE001
+        error_message = str(exc)
+    finally:
+        _finalize_run(
+            log_file=paths.log_file,
+            run_label="convert",
+            start=start,
+            success=success,
+            notes_count=notes_count,
+            output=output,
+            error_message=error_message,
+        )
+
+    return 0 if success else 1
+
+
+def _verify_executor(max_workers: int | None) -> Executor:
+    return ProcessPoolExecutor(max_workers=max_workers)
+
+
+def _build_verify_state_path(log_file: Path) -> Path:
+    return log_file.parent / VERIFY_STATE_FILE_NAME
+
+
+def run_verify_with_paths(
+    *,
+    paths: RunPaths,
+    start: datetime,
+    incremental: bool = False,
+    workers: int | None = None,
+) -> int:
+    append_log(paths.log_file, f"verify started start_time={start.isoformat()} incremental={incremental}")
+
+    success = False
+    notes_count = 0
+    error_message = None
+    backups_root = paths.backup_dir.parent
+    report_stem = paths.log_file.stem.replace("run_", "")
+    report_path = paths.log_file.parent / "artifacts" / f"verify_report_{report_stem}.json"
+    state_path = _build_verify_state_path(paths.log_file)
+    summary_fields: dict[str, object] = {}
+
+    try:
+        generations = find_generations(backups_root)
+        if not generations:
+            raise FileNotFoundError(f"no generations found under {backups_root}")
+        previous_state = load_checkpoint(state_path) if incremental else None
+        previous_files = (previous_state or {}).get("files", {})
+        signatures = {str(path): generation_signature(path) for path in generations}
+        pending: list[Path] = []
+        skipped: list[dict[str, object]] = []
+        for path in generations:
+            previous = previous_files.get(str(path)) if isinstance(previous_files, dict) else None
+            if (
+                isinstance(previous, dict)
+                and previous.get("status") == VERIFY_STATUS_OK
+                and previous.get("signature") == signatures[str(path)]
+            ):
+                skipped.append({**previous.get("result", {}), "skipped": True})
+            else:
+                pending.append(path)
+        append_log(
+            paths.log_file,
+            f"verify generations={len(generations)} pending={len(pending)} skipped={len(skipped)}",
+        )
+
+        verify_started = time.perf_counter()
+        results: list[dict[str, object]] = []
+        if pending:
+            with _verify_executor(workers) as executor:
+                results = list(executor.map(verify_generation, pending, chunksize=4))
+        verify_seconds = time.perf_counter() - verify_started
+
+        failed = [result for result in results if result["status"] == VERIFY_STATUS_FAILED]
+        for result in failed:
+            print(f"verify status=failed path={result['path']} errors={'; '.join(result['errors'])}")
+            append_log(paths.log_file, f"verify failed path={result['path']} errors={result['errors']}")
+        notes_count = sum(int(result.get("notes_count", 0)) for result in [*results, *skipped])
+
+        report_path.parent.mkdir(parents=True, exist_ok=True)
+        report_path.write_text(
+            json.dumps(
+                {
+                    "generated_at": start.isoformat(),
+                    "backups_root": str(backups_root),
+                    "incremental": incremental,
+                    "files_checked": len(results),
+                    "files_skipped": len(skipped),
+                    "files_failed": len(failed),
+                    "results": [*results, *skipped],
+                },
+                ensure_ascii=False,
+                indent=2,
+            )
+            + "\n",
+            encoding="utf-8",
+        )
+        files_state = {
+            str(path): previous_files[str(path)]
+            for path in generations
+            if isinstance(previous_files, dict) and str(path) in previous_files
+        }
+        for result in results:
+            files_state[str(result["path"])] = {
+                "status": result["status"],
+                "signature": signatures[str(result["path"])],
+                "result": result,
+            }
+        write_checkpoint(state_path, {"verified_at": start.isoformat(), "files": files_state})
+
+        summary_fields = {
+            "files_checked": len(results),
+            "files_skipped": len(skipped),
+            "files_failed": len(failed),
+            "files_per_second": f"{len(results) / max(verify_seconds, 1e-9):.1f}",
+            "report": report_path,
+        }
+        if failed:
+            raise RuntimeError(f"generations failed verification: {len(failed)}")
+        success = True
+    except Exception as exc:  # noqa: BLE001
+        error_message = str(exc)
+    finally:
+        _finalize_run(
+            log_file=paths.log_file,
+            run_label="verify",
+            start=start,
+            success=success,
+            notes_count=notes_count,
+            output=backups_root,
+            error_message=error_message,
+            summary_fields=summary_fields,
+        )
+
+    return 0 if success else 1
+
+
+def _load_generation_notes(backup_file: Path) -> list[dict[str, str]]:
+    if not backup_file.exists():
+        raise FileNotFoundError(f"generation not found: {backup_file}")
+    _, payload = load_generation(backup_file, follow_unchanged=True)
+    notes = payload.get("notes")
+    if not isinstance(notes, list):
+        raise ValueError(f"generation has no notes: {backup_file}")
+    return notes
+
+
+def run_diff_with_paths(
+    *,
+    paths: RunPaths,
+    start: datetime,
+    old: Path | None = None,
+    new: Path | None = None,
+    output_format: str = DIFF_FORMAT_TEXT,
+    output: Path | None = None,
+) -> int:
+    append_log(paths.log_file, f"diff started start_time={start.isoformat()}")
+
+    success = False
+    notes_count = 0
+    error_message = None
+    report_stem = paths.log_file.stem.replace("run_", "")
+    report_path = output or paths.log_file.parent / "artifacts" / f"diff_{report_stem}.json"
+    result_output: Path | str = "(stdout)"
+    summary_fields: dict[str, object] = {}
+
+    try:
+        if old is None or new is None:
+            generations = list_generations(paths.backup_dir.parent)
+            if len(generations) < 2:
+                raise FileNotFoundError("need two generations to diff. Use --diff-old and --diff-new.")
+            old = old or generations[-2]
+            new = new or generations[-1]
+        append_log(paths.log_file, f"diff old={old} new={new}")
+        old_notes = _load_generation_notes(old)
+        new_notes = _load_generation_notes(new)
+        notes_count = len(new_notes)
+
+        diff_started = time.perf_counter()
+        diff = diff_generations(old_notes, new_notes)
+        diff_ms = _elapsed_ms(diff_started)
+
+        if output_format == DIFF_FORMAT_JSON:
+            report_path.parent.mkdir(parents=True, exist_ok=True)
+            report_path.write_text(
+                json.dumps({"old": str(old), "new": str(new), **diff.to_payload()}, ensure_ascii=False, indent=2)
+                + "\n",
+                encoding="utf-8",
+            )
+            result_output = report_path
+        else:
+            for line in format_diff_lines(diff):
+                print(line)
+        summary_fields = {
+            "added": len(diff.added),
+            "removed": len(diff.removed),
+            "modified": len(diff.modified),
+            "unchanged": diff.unchanged,
+            "diff_ms": f"{diff_ms:.0f}",
+        }
+        success = True
+    except Exception as exc:  # noqa: BLE001
+        error_message = str(exc)
+    finally:
+        _finalize_run(
+            log_file=paths.log_file,
+            run_label="diff",
+            start=start,
+            success=success,
+            notes_count=notes_count,
+            output=result_output,
+            error_message=error_message,
+            summary_fields=summary_fields,
+        )
+
+    return 0 if success else 1
+
+
+def run_render_with_paths(
+    *,
+    paths: RunPaths,
+    start: datetime,
+    generation: Path | None = None,
+    output: Path | None = None,
+    page_size: int = RENDER_DEFAULT_PAGE_SIZE,
+) -> int:
+    append_log(paths.log_file, f"render started start_time={start.isoformat()}")
+
+    success = False
+    notes_count = 0
+    error_message = None
+    site_dir = output or paths.backup_dir.parent / RENDER_SITE_DIR_NAME
+    result_output: Path | str = "(none)"
+    summary_fields: dict[str, object] = {}
+
+    try:
+        generation = generation or find_latest_generation(paths.backup_dir.parent)
+        if generation is None or not generation.exists():
+            raise FileNotFoundError(f"generation not found: {generation or paths.backup_dir.parent}")
+        append_log(paths.log_file, f"render input={generation} output={site_dir} page_size={page_size}")
+        render_started = time.perf_counter()
+        # Notes are streamed page by page; only the search index grows with the account.
+        result = render_site(
+            iter_generation_notes(generation),
+            site_dir,
+            generation=generation.parent.name,
+            page_size=page_size,
+        )
+        render_ms = _elapsed_ms(render_started)
+        notes_count = result.notes_count
+        append_log(
+            paths.log_file,
+            f"render pages={result.pages} written={result.pages_written} reused={result.pages_reused} "
+            f"removed={result.pages_removed} search_tokens={result.search_tokens}",
+        )
+        result_output = result.index_file or site_dir
+        summary_fields = {**result.summary_fields(), "render_ms": f"{render_ms:.0f}"}
+        success = True
+    except Exception as exc:  # noqa: BLE001
+        error_message = str(exc)
+    finally:
+        _finalize_run(
+            log_file=paths.log_file,
+            run_label="render",
+            start=start,
+            success=success,
+            notes_count=notes_count,
+            output=result_output,
+            error_message=error_message,
+            summary_fields=summary_fields,
         )
 
     return 0 if success else 1
@@ -155,6 +956,7 @@ def run_parse_dom_with_paths(
     start: datetime,
     dom_input: Path | None,
     dom_output: Path | None,
+    use_cache: bool = True,
 ) -> int:
     append_log(paths.log_file, f"parse-dom started start_time={start.isoformat()}")
 
@@ -162,11 +964,42 @@ def run_parse_dom_with_paths(
     notes: list[dict[str, str]] = []
     error_message = None
     output_path = dom_output or (paths.backup_dir / DOM_PARSED_OUTPUT_FILE_NAME)
+    cache_status = "miss" if use_cache else "off"
+    summary_fields: dict[str, str] = {}
 
     try:
-        snapshot_path = _resolve_dom_snapshot_input(dom_input)
-        append_log(paths.log_file, f"parse-dom input={snapshot_path}")
-        notes = _extract_notes_from_dom_snapshot(snapshot_path, log_file=paths.log_file)
+        # A concurrent backup must not prune the snapshot while it is being read.
+        with _dom_snapshot_history(dom_input).locked(shared=True):
+            snapshot_path = _resolve_dom_snapshot_input(dom_input)
+            append_log(paths.log_file, f"parse-dom input={snapshot_path}")
+            reconstruct_seconds = current_run_metrics().values.get("snapshot_reconstruct_seconds")
+            if reconstruct_seconds is not None:
+                summary_fields["reconstruct_ms"] = str(int(reconstruct_seconds * 1000))
+                append_log(
+                    paths.log_file,
+                    f"parse-dom reconstructed_from={HISTORY_DIR_NAME} reconstruct_ms={summary_fields['reconstruct_ms']}",
+                )
+            cache_dir = _build_parse_cache_dir(paths.log_file)
+            cache_key = _parse_dom_cache_key(snapshot_path) if use_cache else ""
+            cached_notes = load_parse_cache(cache_dir, cache_key) if use_cache else None
+            if cached_notes:
+                cache_status = "hit"
+                notes = cached_notes
+                append_log(paths.log_file, f"parse-dom cache=hit key={cache_key} notes={len(notes)}")
+            else:
+                with run_phase("parse"):
+                    notes = _extract_notes_from_dom_snapshot(snapshot_path, log_file=paths.log_file)
+                if notes and use_cache:
+                    evicted = store_parse_cache(
+                        cache_dir,
+                        cache_key,
+                        notes,
+                        max_bytes=PARSE_DOM_CACHE_MAX_BYTES,
+                    )
+                    append_log(
+                        paths.log_file,
+                        f"parse-dom cache=miss key={cache_key} stored=true evicted={len(evicted)}",
+                    )
         if not notes:
             raise RuntimeError("failed to extract notes from DOM snapshot")
         write_backup(output_path, start, notes)
@@ -182,6 +1015,7 @@ def run_parse_dom_with_paths(
             notes_count=len(notes),
             output=output_path,
             error_message=error_message,
+            summary_fields={"cache": cache_status, **summary_fields},
         )
 
     return 0 if success else 1
@@ -197,6 +1031,8 @@ def run_playwright_smoke(
     min_notes_error_label: str = "notes",
     required_url_prefixes: list[str] | None = None,
     forbidden_url_prefixes: list[str] | None = None,
+    login_cache: LoginCheckCache | None = None,
+    mode: str | None = None,
 ) -> int:
     start = datetime.now()
     append_log(log_file, f"playwright smoke started start_time={start.isoformat()}")
@@ -217,6 +1053,7 @@ def run_playwright_smoke(
                 min_notes_error_label=min_notes_error_label,
                 required_url_prefixes=required_url_prefixes,
                 forbidden_url_prefixes=forbidden_url_prefixes,
+                login_cache=login_cache,
             )
         success = True
     except Exception as exc:  # noqa: BLE001
@@ -230,17 +1067,18 @@ def run_playwright_smoke(
             notes_count=notes_count,
             output=output,
             error_message=error_message,
+            mode=mode,
         )
 
     return 0 if success else 1
 
 
-def run_playwright_keep_smoke(log_file: Path) -> int:
+def run_playwright_keep_smoke(log_file: Path, *, mode: str | None = None) -> int:
     profile_dir = load_keep_profile_dir()
-    return run_playwright_smoke(log_file, url="https://keep.google.com/", profile_dir=profile_dir)
+    return run_playwright_smoke(log_file, url="https://keep.google.com/", profile_dir=profile_dir, mode=mode)
 
 
-def run_playwright_keep_login_smoke(log_file: Path) -> int:
+def run_playwright_keep_login_smoke(log_file: Path, *, mode: str | None = None) -> int:
     profile_dir = load_keep_profile_dir()
     if not profile_dir:
         raise RuntimeError(
@@ -252,10 +1090,13 @@ def run_playwright_keep_login_smoke(log_file: Path) -> int:
         profile_dir=profile_dir,
         required_url_prefixes=["https://keep.google.com/"],
         forbidden_url_prefixes=["https://accounts.google.com/"],
+        # This mode is the explicit login check, so it always re-checks and refreshes the cached result.
+        login_cache=_build_login_check_cache(log_file, profile_dir, reuse=False),
+        mode=mode,
     )
 
 
-def run_playwright_keep_probe(log_file: Path) -> int:
+def run_playwright_keep_probe(log_file: Path, *, mode: str | None = None) -> int:
     profile_dir = load_keep_profile_dir()
     if not profile_dir:
         raise RuntimeError(
@@ -270,6 +1111,8 @@ def run_playwright_keep_probe(log_file: Path) -> int:
         min_notes_error_label="probe elements",
         required_url_prefixes=["https://keep.google.com/"],
         forbidden_url_prefixes=["https://accounts.google.com/"],
+        login_cache=_build_login_check_cache(log_file, profile_dir),
+        mode=mode,
     )
 
 
@@ -288,14 +1131,44 @@ def _write_dom_snapshot(page: object, *, snapshot_path: Path, log_file: Path) ->
     if original_len > DOM_SNAPSHOT_MAX_CHARS:
         html = html[:DOM_SNAPSHOT_MAX_CHARS]
         truncated = True
-    snapshot_path.write_text(html, encoding="utf-8")
+    data = html.encode("utf-8")
+    # Only page.content() needs the browser; the disk write overlaps with extraction.
+    submit_write(f"dom_snapshot {snapshot_path}", lambda: _store_dom_snapshot(snapshot_path, data, log_file=log_file))
+    set_run_metric("snapshot_bytes", len(data))
     append_log(
         log_file,
         f"playwright smoke dom_snapshot={snapshot_path} chars={len(html)} truncated={truncated} original_chars={original_len}",
     )
 
 
-def run_playwright_keep_dom_smoke(log_file: Path) -> int:
+def _store_dom_snapshot(snapshot_path: Path, data: bytes, *, log_file: Path) -> None:
+    # Only the latest snapshot stays whole on disk; older ones are rebuilt from the history on demand.
+    snapshot_path.write_bytes(data)
+    history = SnapshotHistory(snapshot_path.parent / HISTORY_DIR_NAME)
+    # Another run on this profile may be appending too, or parse-dom may be reading a file pruned here.
+    with history.locked():
+        try:
+            entry = history.append(snapshot_path.name, data)
+        except Exception as exc:  # noqa: BLE001
+            append_log(log_file, f"dom_history error={exc}")
+            return
+        names = {str(item["name"]) for item in history.entries()}
+        pruned = 0
+        for older in snapshot_path.parent.glob("dom_snapshot_*.html"):
+            if older != snapshot_path and older.name in names:
+                older.unlink(missing_ok=True)
+                pruned += 1
+        ratio = history.storage_ratio()
+    set_run_metric("snapshot_stored_bytes", int(entry["stored_bytes"]))
+    set_run_metric("snapshot_history_ratio", ratio)
+    append_log(
+        log_file,
+        f"dom_history kind={entry['kind']} bytes={entry['bytes']} stored_bytes={entry['stored_bytes']} "
+        f"history_ratio={ratio:.4f} pruned={pruned}",
+    )
+
+
+def run_playwright_keep_dom_smoke(log_file: Path, *, mode: str | None = None) -> int:
     profile_dir = load_keep_profile_dir()
     if not profile_dir:
         raise RuntimeError(
@@ -323,6 +1196,7 @@ def run_playwright_keep_dom_smoke(log_file: Path) -> int:
                     min_notes_error_label="probe elements",
                     required_url_prefixes=["https://keep.google.com/"],
                     forbidden_url_prefixes=["https://accounts.google.com/"],
+                    login_cache=_build_login_check_cache(log_file, profile_dir),
                 )
                 success = True
             except Exception as exc:  # noqa: BLE001
@@ -345,11 +1219,12 @@ def run_playwright_keep_dom_smoke(log_file: Path) -> int:
             notes_count=notes_count,
             output=output,
             error_message=error_message,
+            mode=mode,
         )
 
     return 0 if success else 1
 
-def run_playwright_fixture_smoke(log_file: Path, fixture_path: Path) -> int:
+def run_playwright_fixture_smoke(log_file: Path, fixture_path: Path, *, mode: str | None = None) -> int:
     if not fixture_path.exists():
         raise FileNotFoundError(f"fixture not found: {fixture_path}")
     fixture_url = fixture_path.resolve().as_uri()
@@ -359,40 +1234,788 @@ def run_playwright_fixture_smoke(log_file: Path, fixture_path: Path) -> int:
         notes_selector='[data-testid="keep-note"]',
         min_notes=1,
         min_notes_error_label="fixture notes",
+        mode=mode,
     )
 
 
-def _collect_keep_notes_for_backup(log_file: Path) -> list[dict[str, str]]:
-    profile_dir = load_keep_profile_dir()
-    if not profile_dir:
-        raise RuntimeError(
-            "KEEP_BROWSER_PROFILE_DIR is not configured. Set KEEP_BROWSER_PROFILE_DIR_HOST in .env."
-        )
+def run_launch_benchmark(
+    *,
+    paths: RunPaths,
+    start: datetime,
+    fixture_path: Path,
+    repeats: int = LAUNCH_BENCH_DEFAULT_REPEATS,
+    presets: list[str] | None = None,
+) -> int:
+    append_log(paths.log_file, f"bench-launch started start_time={start.isoformat()} repeats={repeats}")
 
-    append_log(log_file, "backup source=keep")
-    with _open_playwright_page(log_file, profile_dir) as page:
-        _verify_playwright_page(
-            page,
-            log_file=log_file,
-            url="https://keep.google.com/",
-            notes_selector=KEEP_PROBE_NOTES_SELECTOR,
-            min_notes=1,
-            min_notes_error_label="backup notes",
-            required_url_prefixes=["https://keep.google.com/"],
-            forbidden_url_prefixes=["https://accounts.google.com/"],
-        )
-        snapshot_path = _build_dom_snapshot_path(log_file)
-        _write_dom_snapshot(page, snapshot_path=snapshot_path, log_file=log_file)
-        notes = _extract_note_payloads(page)
-    append_log(log_file, f"backup extracted_notes={len(notes)}")
-    if not notes:
+    success = False
+    notes_count = 0
+    error_message = None
+    report_stem = paths.log_file.stem.replace("run_", "")
+    report_path = paths.log_file.parent / "artifacts" / f"launch_bench_{report_stem}.json"
+    summary_fields: dict[str, object] = {}
+
+    try:
+        if not fixture_path.exists():
+            raise FileNotFoundError(f"fixture not found: {fixture_path}")
+        if repeats < 1:
+            raise ValueError(f"--bench-repeats must be at least 1: {repeats}")
+        fixture_url = fixture_path.resolve().as_uri()
+        preset_names = presets or list(LAUNCH_PRESETS)
+        for preset_name in preset_names:
+            load_launch_preset(preset_name)
+
+        results: list[dict[str, object]] = []
+        for preset_name in preset_names:
+            samples_ms: list[float] = []
+            for _ in range(repeats):
+                bench_start = time.perf_counter()
+                # Launch, open the fixture and wait for a note card: what a run pays before scraping starts.
+                with _open_playwright_page(paths.log_file, None, launch_preset=preset_name) as page:
+                    page.goto(fixture_url, wait_until="load")
+                    notes_count = page.locator(LAUNCH_BENCH_NOTES_SELECTOR).count()
+                samples_ms.append(_elapsed_ms(bench_start))
+            if notes_count < 1:
+                raise RuntimeError(f"fixture notes not found with preset {preset_name}")
+            ordered = sorted(samples_ms)
+            result = {
+                "preset": preset_name,
+                "runs": repeats,
+                "median_ms": round(ordered[len(ordered) // 2], 1),
+                "min_ms": round(ordered[0], 1),
+                "max_ms": round(ordered[-1], 1),
+                "samples_ms": [round(sample, 1) for sample in samples_ms],
+            }
+            results.append(result)
+            line = (
+                f"bench-launch preset={preset_name} runs={repeats} median_ms={result['median_ms']:.0f} "
+                f"min_ms={result['min_ms']:.0f} max_ms={result['max_ms']:.0f}"
+            )
+            print(line)
+            append_log(paths.log_file, line)
+
+        report_path.parent.mkdir(parents=True, exist_ok=True)
+        report_path.write_text(
+            json.dumps(
+                {"generated_at": start.isoformat(), "fixture": str(fixture_path), "results": results},
+                ensure_ascii=False,
+                indent=2,
+            )
+            + "\n",
+            encoding="utf-8",
+        )
+        fastest = min(results, key=lambda result: result["median_ms"])
+        summary_fields = {
+            "fastest_preset": fastest["preset"],
+            "fastest_median_ms": f"{fastest['median_ms']:.0f}",
+            "report": report_path,
+        }
+        success = True
+    except Exception as exc:  # noqa: BLE001
+        error_message = str(exc)
+    finally:
+        # Every preset launched in turn; the summary reports them via the report, not one preset label.
+        current_run_metrics().labels.pop("launch_preset", None)
+        _finalize_run(
+            log_file=paths.log_file,
+            run_label="bench-launch",
+            start=start,
+            success=success,
+            notes_count=notes_count,
+            output=report_path,
+            error_message=error_message,
+            summary_fields=summary_fields,
+        )
+
+    return 0 if success else 1
+
+
+def _collect_keep_notes_for_backup(
+    log_file: Path,
+    *,
+    resume: bool = False,
+    page: object | None = None,
+    change_probe: ChangeProbe | None = None,
+    harvest: str = HARVEST_DOM,
+    deadline: RunDeadline | None = None,
+    hydrate_pool: int = HYDRATION_POOL_SIZE,
+    shard_pages: int = SHARD_POOL_SIZE,
+) -> list[dict[str, str]]:
+    # A HAR replay needs no login; the HAR itself then identifies the run for checkpoints.
+    profile_dir = load_keep_profile_dir() or load_har_path(HAR_REPLAY_ENV)
+    if not profile_dir:
+        raise RuntimeError(
+            "KEEP_BROWSER_PROFILE_DIR is not configured. Set KEEP_BROWSER_PROFILE_DIR_HOST in .env."
+        )
+
+    append_log(log_file, "backup source=keep")
+    checkpoint_path = _build_checkpoint_path(log_file)
+    collect_start = time.perf_counter()
+    harvested: list[dict[str, str]] = []
+    resume_iterations = 0
+    resume_cards = 0
+    prior_elapsed = 0.0
+
+    if resume:
+        checkpoint = _load_resume_checkpoint(checkpoint_path, log_file=log_file, profile_dir=profile_dir)
+        if checkpoint is not None:
+            harvested = checkpoint["notes"]
+            resume_iterations = checkpoint["scroll_iterations"]
+            resume_cards = checkpoint["cards_count"]
+            prior_elapsed = checkpoint["elapsed_seconds"]
+            append_log(
+                log_file,
+                "backup resume "
+                f"seeded_notes={len(harvested)} skipped_scroll_iterations={resume_iterations} "
+                f"complete={checkpoint['complete']}",
+            )
+            if checkpoint["complete"] and harvested:
+                append_log(
+                    log_file,
+                    f"backup resume browser_skipped=true saved_seconds_estimate={prior_elapsed:.2f}",
+                )
+                return harvested
+
+    def save_checkpoint(notes: list[dict[str, str]], scroll_iterations: int, *, complete: bool) -> None:
+        elapsed_seconds = prior_elapsed + (time.perf_counter() - collect_start)
+
+        def write() -> None:
+            try:
+                _write_backup_checkpoint(
+                    checkpoint_path,
+                    log_file=log_file,
+                    profile_dir=profile_dir,
+                    notes=notes,
+                    scroll_iterations=scroll_iterations,
+                    cards_count=cards_count,
+                    complete=complete,
+                    elapsed_seconds=elapsed_seconds,
+                )
+            except Exception as exc:  # noqa: BLE001
+                # Intermediate checkpoints are best effort; only the final one must reach disk.
+                if complete:
+                    raise
+                append_log(log_file, f"backup checkpoint_error={exc}")
+
+        submit_write("checkpoint", write)
+
+    scroll_iterations = resume_iterations
+    cards_count = resume_cards
+    selector_stats_path = _build_selector_stats_path(log_file)
+    selector_stats = load_selector_stats(selector_stats_path)
+    # The locale is unknown until Keep has loaded; "other" keeps every selector, ranked by past hits.
+    plan = build_plan(selector_stats, detect_locale(None))
+    if deadline is not None and harvest == HARVEST_NETWORK:
+        deadline.phases = ("navigate", "network_capture", "scroll", "hydrate")
+    with ExitStack() as stack:
+        page = stack.enter_context(timed_enter("launch", _reuse_or_open_playwright_page(log_file, profile_dir, page)))
+        capture = stack.enter_context(_capture_network_notes(page)) if harvest == HARVEST_NETWORK else None
+
+        def on_scroll(iteration: int, notes_count: int) -> None:
+            nonlocal harvested, scroll_iterations, cards_count
+            scroll_iterations = iteration
+            cards_count = max(cards_count, notes_count)
+            if iteration % BACKUP_CHECKPOINT_EVERY_ITERATIONS != 0:
+                return
+            try:
+                harvested = _merge_notes(_extract_note_payloads(page, plan), harvested)
+                save_checkpoint(harvested, iteration, complete=False)
+            except Exception as exc:  # noqa: BLE001
+                append_log(log_file, f"backup checkpoint_error={exc}")
+
+        def finish_partial(phase: str) -> NoReturn:
+            # The deadline reserve pays for this: keep what is on screen so --resume can pick up from here.
+            with run_phase("snapshot"):
+                try:
+                    _write_dom_snapshot(page, snapshot_path=_build_dom_snapshot_path(log_file), log_file=log_file)
+                except Exception as snapshot_exc:  # noqa: BLE001
+                    append_log(log_file, f"playwright smoke dom_snapshot_error={snapshot_exc}")
+            with run_phase("extract"):
+                try:
+                    partial = _merge_notes(_extract_note_payloads(page, plan), harvested)
+                except Exception as extract_exc:  # noqa: BLE001
+                    append_log(log_file, f"backup deadline extract_error={extract_exc}")
+                    partial = harvested
+            save_checkpoint(partial, scroll_iterations, complete=False)
+            append_log(log_file, f"backup deadline_hit phase={phase} partial_notes={len(partial)}")
+            raise RuntimeError(
+                f"deadline reached during {phase}: saved {len(partial)} partial notes "
+                "to the checkpoint; rerun with --resume to continue"
+            )
+
+        navigate_budget = deadline.phase("navigate") if deadline is not None else None
+        try:
+            with run_phase("navigate"):
+                _verify_playwright_page(
+                    page,
+                    log_file=log_file,
+                    url="https://keep.google.com/",
+                    notes_selector=None,
+                    min_notes=None,
+                    min_notes_error_label="backup notes",
+                    required_url_prefixes=["https://keep.google.com/"],
+                    forbidden_url_prefixes=["https://accounts.google.com/"],
+                    budget=navigate_budget,
+                    login_cache=_build_login_check_cache(log_file, profile_dir),
+                    ready_selector=", ".join(plan[SELECTOR_GROUP_PROBE]),
+                    # The network capture is polled straight after goto instead of after the fixed settle.
+                    settle=capture is None,
+                    # The session-state landing happened before the capture listener was attached.
+                    reuse_landing=capture is None,
+                )
+        except Exception as exc:  # noqa: BLE001
+            # A navigation timeout caused by the deadline still leaves a page worth snapshotting.
+            if navigate_budget is None or not navigate_budget.exhausted:
+                raise
+            append_log(log_file, f"backup deadline navigate_error={exc}")
+            navigate_budget.mark_hit()
+            finish_partial("navigate")
+
+        def probe_reports_unchanged() -> bool:
+            if change_probe is None:
+                return False
+            change_probe.fingerprint = _fingerprint_first_screen(page)
+            return _probe_reports_unchanged(change_probe, log_file=log_file)
+
+        if capture is None and probe_reports_unchanged():
+            return []
+        if capture is not None:
+            capture_budget = deadline.phase("network_capture") if deadline is not None else None
+            capture_started = time.perf_counter()
+            with run_phase("network_capture"):
+                captured = _wait_for_network_notes(page, capture, log_file=log_file, budget=capture_budget)
+                # The change probe, the DOM snapshot and a DOM fallback all need the rendered grid,
+                # which a cold run only has after the settle that navigation skipped here.
+                settle_left_ms = max(0, PLAYWRIGHT_PAGE_SETTLE_MS - int(_elapsed_ms(capture_started)))
+                _wait_for_stable_cards(
+                    page,
+                    log_file=log_file,
+                    notes_selector=", ".join(plan[SELECTOR_GROUP_PROBE]),
+                    timeout_ms=capture_budget.cap_ms(settle_left_ms) if capture_budget is not None else settle_left_ms,
+                    label="network_capture",
+                )
+            if probe_reports_unchanged():
+                return []
+            if captured:
+                with run_phase("snapshot"):
+                    _write_dom_snapshot(page, snapshot_path=_build_dom_snapshot_path(log_file), log_file=log_file)
+                notes = _merge_notes(captured, harvested)
+                append_log(log_file, f"backup extracted_notes={len(notes)} source=network")
+                save_checkpoint(notes, scroll_iterations, complete=True)
+                return notes
+        locale = detect_locale(page.evaluate("document.documentElement.lang || navigator.language"))
+        plan = build_plan(selector_stats, locale)
+        append_log(
+            log_file,
+            f"backup selectors locale={locale} "
+            + " ".join(f"{group}={len(selectors)}" for group, selectors in plan.items()),
+        )
+        shard_notes: list[dict[str, str]] | None = None
+        shard_targets: list[tuple[int, str]] = []
+        selector_hits: dict[str, dict[str, int]] = {}
+        with run_phase("scroll"):
+            if harvest == HARVEST_SHARDED:
+                shards = _discover_harvest_shards(page)
+                append_log(log_file, f"backup shards discovered={len(shards)} pages={min(shard_pages, len(shards))}")
+                shards_started = time.perf_counter()
+                _harvest_shards(
+                    page,
+                    shards,
+                    log_file=log_file,
+                    plan=plan,
+                    notes_selector=", ".join(plan[SELECTOR_GROUP_PROBE]),
+                    pool_size=shard_pages,
+                    budget=deadline.phase("scroll") if deadline is not None else None,
+                    selector_hits=selector_hits,
+                )
+                shard_notes, shard_targets = _merge_shard_notes(
+                    shards,
+                    log_file=log_file,
+                    seconds=time.perf_counter() - shards_started,
+                )
+                scroll_iterations = max((shard.iterations for shard in shards), default=0)
+            else:
+                _scroll_and_check_notes(
+                    page,
+                    log_file=log_file,
+                    notes_selector=", ".join(plan[SELECTOR_GROUP_PROBE]),
+                    min_notes=1,
+                    min_notes_error_label="backup notes",
+                    resume_iterations=resume_iterations,
+                    resume_cards=resume_cards,
+                    on_scroll=on_scroll,
+                    budget=deadline.phase("scroll") if deadline is not None else None,
+                )
+        set_run_metric("scroll_iterations", scroll_iterations)
+        if deadline is not None and deadline.hit_phase is not None:
+            if shard_notes is not None:
+                harvested = _merge_notes(shard_notes, harvested)
+            finish_partial(deadline.hit_phase)
+        snapshot_path = _build_dom_snapshot_path(log_file)
+        with run_phase("snapshot"):
+            _write_dom_snapshot(page, snapshot_path=snapshot_path, log_file=log_file)
+        hydration_targets: list[tuple[int, str]] | None = [] if hydrate_pool > 0 else None
+        with run_phase("extract"):
+            # Fresh cards come first in the merge, so hydration target indexes still line up.
+            if shard_notes is not None:
+                notes = _merge_notes(shard_notes, harvested)
+                if hydration_targets is not None:
+                    hydration_targets.extend(shard_targets)
+            else:
+                notes = _merge_notes(
+                    _extract_note_payloads(
+                        page,
+                        plan,
+                        hydration_targets=hydration_targets,
+                        selector_hits=selector_hits,
+                    ),
+                    harvested,
+                )
+        if hydration_targets:
+            with run_phase("hydrate"):
+                _hydrate_truncated_notes(
+                    page,
+                    notes,
+                    hydration_targets,
+                    log_file=log_file,
+                    plan=plan,
+                    pool_size=hydrate_pool,
+                    budget=deadline.phase("hydrate") if deadline is not None else None,
+                )
+        _record_selector_stats(
+            page,
+            log_file=log_file,
+            stats_file=selector_stats_path,
+            stats=selector_stats,
+            locale=locale,
+            plan=plan,
+            extracted_hits=selector_hits,
+        )
+    append_log(log_file, f"backup extracted_notes={len(notes)}")
+    if not notes:
         raise RuntimeError("failed to extract notes from Keep page")
+    save_checkpoint(notes, scroll_iterations, complete=True)
     return notes
 
 
-def _extract_note_payloads(page: object) -> list[dict[str, str]]:
-    raw_notes = page.evaluate(
+class _WarmKeepSession:
+    # Keeps one persistent Keep context open across daemon runs.
+
+    def __init__(self, log_file: Path, profile_dir: Path) -> None:
+        self._log_file = log_file
+        self._profile_dir = profile_dir
+        self._stack: ExitStack | None = None
+        self._page: object | None = None
+        self.launches = 0
+
+    def page(self) -> object:
+        if self._page is not None and _page_is_closed(self._page):
+            append_log(self._log_file, "daemon context=lost action=relaunch")
+            self.close()
+        if self._page is None:
+            stack = ExitStack()
+            self._page = stack.enter_context(_open_playwright_page(self._log_file, self._profile_dir))
+            self._stack = stack
+            self.launches += 1
+            append_log(self._log_file, f"daemon context=launched launches={self.launches}")
+        return self._page
+
+    def login_lost(self) -> bool:
+        if self._page is None or _page_is_closed(self._page):
+            return False
+        return str(self._page.url).startswith("https://accounts.google.com/")
+
+    def close(self) -> None:
+        stack, self._stack, self._page = self._stack, None, None
+        if stack is not None:
+            try:
+                stack.close()
+            except Exception as exc:  # noqa: BLE001
+                append_log(self._log_file, f"daemon context_close_error={exc}")
+
+
+def _page_is_closed(page: object) -> bool:
+    is_closed = getattr(page, "is_closed", None)
+    return bool(is_closed()) if callable(is_closed) else False
+
+
+def _sleep_until(wake_at: datetime) -> None:
+    remaining = (wake_at - datetime.now()).total_seconds()
+    if remaining > 0:
+        time.sleep(remaining)
+
+
+def run_daemon(schedule: str = DAEMON_DEFAULT_SCHEDULE, *, max_runs: int | None = None) -> int:
+    cron = parse_cron(schedule)
+    profile_dir = load_keep_profile_dir()
+    if not profile_dir:
+        raise RuntimeError(
+            "KEEP_BROWSER_PROFILE_DIR is not configured. Set KEEP_BROWSER_PROFILE_DIR_HOST in .env."
+        )
+
+    daemon_start = datetime.now()
+    daemon_log = Path("logs") / f"daemon_{daemon_start.strftime('%Y-%m-%d_%H%M%S')}.log"
+    append_log(daemon_log, f"daemon started schedule={schedule!r} max_runs={max_runs}")
+
+    session = _WarmKeepSession(daemon_log, profile_dir)
+    runs = 0
+    consecutive_failures = 0
+    exit_code = 0
+    try:
+        while max_runs is None or runs < max_runs:
+            now = datetime.now()
+            wake_at = next_run_after(cron, now)
+            if consecutive_failures:
+                retry_seconds = min(
+                    DAEMON_RETRY_BASE_SECONDS * 2 ** (consecutive_failures - 1),
+                    DAEMON_RETRY_MAX_SECONDS,
+                )
+                wake_at = min(wake_at, now + timedelta(seconds=retry_seconds))
+            append_log(
+                daemon_log,
+                f"daemon next_run={wake_at.isoformat()} consecutive_failures={consecutive_failures}",
+            )
+            _sleep_until(wake_at)
+
+            start = datetime.now()
+            paths = build_paths(start)
+            try:
+                page = session.page()
+            except Exception as exc:  # noqa: BLE001
+                append_log(daemon_log, f"daemon launch_error={exc}")
+                exit_code = 1
+            else:
+                exit_code = run_backup_with_paths([], None, paths, start, page=page)
+            runs += 1
+            append_log(daemon_log, f"daemon run={runs} exit_code={exit_code} log_file={paths.log_file}")
+
+            if exit_code == 0:
+                consecutive_failures = 0
+                continue
+            consecutive_failures += 1
+            if session.login_lost():
+                # Release the profile so it can be logged back in while the daemon backs off.
+                append_log(daemon_log, "daemon login_lost=true action=release_profile")
+                session.close()
+    except KeyboardInterrupt:
+        append_log(daemon_log, "daemon interrupted")
+    finally:
+        session.close()
+        append_log(daemon_log, f"daemon stopped runs={runs} launches={session.launches}")
+    return exit_code
+
+
+def run_job_server(socket_path: Path, run_job: Callable[[list[str]], int], *, max_jobs: int | None = None) -> int:
+    # Runs job client requests one at a time in this warm interpreter.
+    server_start = datetime.now()
+    server_log = Path("logs") / f"serve_{server_start.strftime('%Y-%m-%d_%H%M%S')}.log"
+    append_log(server_log, f"job-server started socket={socket_path} max_jobs={max_jobs}")
+    jobs = 0
+    try:
+        jobs = serve_jobs(socket_path, run_job, log=lambda message: append_log(server_log, message), max_jobs=max_jobs)
+    except KeyboardInterrupt:
+        append_log(server_log, "job-server interrupted")
+    finally:
+        append_log(server_log, f"job-server stopped jobs={jobs}")
+    return 0
+
+
+def _build_change_probe(
+    paths: RunPaths,
+    *,
+    start: datetime,
+    force_full: bool,
+    max_skip_age_days: int,
+) -> ChangeProbe:
+    previous_file = find_latest_generation(paths.backup_dir.parent)
+    previous_fingerprint = None
+    previous_scraped_at = None
+    if previous_file is not None:
+        try:
+            previous_file, payload = load_generation(previous_file, follow_unchanged=True)
+            fingerprint = payload.get("fingerprint")
+            previous_fingerprint = fingerprint if isinstance(fingerprint, dict) else None
+            previous_scraped_at = datetime.fromisoformat(str(payload.get("scraped_at")))
+        except (OSError, ValueError) as exc:
+            append_log(paths.log_file, f"backup change_probe previous_error={exc}")
+            previous_file = None
+    return ChangeProbe(
+        previous_file=previous_file,
+        previous_fingerprint=previous_fingerprint,
+        previous_scraped_at=previous_scraped_at,
+        force_full=force_full,
+        max_skip_age=timedelta(days=max_skip_age_days),
+    )
+
+
+def _fingerprint_first_screen(page: object) -> dict[str, object]:
+    card_texts = page.evaluate(
         """
+        (selector) => Array.from(document.querySelectorAll(selector))
+          .filter((element) => {
+            const rect = element.getBoundingClientRect();
+            return rect.bottom > 0 && rect.top < window.innerHeight;
+          })
+          .map((element) => (element.innerText || element.textContent || '').trim())
+        """,
+        KEEP_PROBE_NOTES_SELECTOR,
+    )
+    card_hashes = [
+        hashlib.sha256(str(text).encode("utf-8")).hexdigest()[:16]
+        for text in card_texts[:CHANGE_PROBE_CARD_LIMIT]
+    ]
+    visible_count = len(card_texts)
+    digest = hashlib.sha256(
+        json.dumps([visible_count, card_hashes]).encode("utf-8")
+    ).hexdigest()
+    return {"visible_count": visible_count, "card_hashes": card_hashes, "digest": digest}
+
+
+def _probe_reports_unchanged(change_probe: ChangeProbe, *, log_file: Path) -> bool:
+    fingerprint = change_probe.fingerprint or {}
+    previous = change_probe.previous_fingerprint or {}
+    matched = bool(previous) and previous.get("digest") == fingerprint.get("digest")
+    reason = "changed"
+    if change_probe.previous_file is None or not previous:
+        reason = "no_previous_fingerprint"
+    elif not matched:
+        reason = "changed"
+    elif change_probe.force_full:
+        reason = "force_full"
+    elif (
+        change_probe.previous_scraped_at is None
+        or datetime.now() - change_probe.previous_scraped_at > change_probe.max_skip_age
+    ):
+        reason = "max_skip_age"
+    else:
+        reason = "unchanged"
+        change_probe.unchanged = True
+    append_log(
+        log_file,
+        "backup change_probe "
+        f"visible_count={fingerprint.get('visible_count')} matched={matched} "
+        f"result={'skip' if change_probe.unchanged else 'full'} reason={reason} "
+        f"previous={change_probe.previous_file}",
+    )
+    return change_probe.unchanged
+
+
+def _record_unchanged_generation(
+    paths: RunPaths,
+    *,
+    start: datetime,
+    change_probe: ChangeProbe,
+) -> list[dict[str, str]]:
+    previous_file = change_probe.previous_file
+    if previous_file is None:
+        raise RuntimeError("no previous generation to point at")
+    _, payload = load_generation(previous_file)
+    notes = payload.get("notes", [])
+    if previous_file.resolve() == paths.backup_file.resolve():
+        append_log(paths.log_file, f"backup no_change generation_kept={previous_file}")
+        return notes
+    write_unchanged_generation(
+        paths.backup_file,
+        start,
+        based_on=previous_file,
+        notes_count=len(notes),
+        fingerprint=change_probe.fingerprint,
+    )
+    append_log(paths.log_file, f"backup no_change generation={paths.backup_file} based_on={previous_file}")
+    return notes
+
+
+def _build_selector_stats_path(log_file: Path) -> Path:
+    return log_file.parent / SELECTOR_STATS_FILE_NAME
+
+
+def _record_selector_stats(
+    page: object,
+    *,
+    log_file: Path,
+    stats_file: Path,
+    stats: dict[str, object],
+    locale: str,
+    plan: dict[str, list[str]],
+    extracted_hits: dict[str, dict[str, int]],
+) -> None:
+    try:
+        entries = list(SELECTOR_REGISTRY)
+        # Probe selectors only count cards while scrolling, so a page-wide match count is their measure.
+        probe_selectors = [entry.selector for entry in entries if entry.group == SELECTOR_GROUP_PROBE]
+        counts = page.evaluate(SELECTOR_HITS_SCRIPT, probe_selectors)
+        hits: dict[str, dict[str, int]] = {
+            SELECTOR_GROUP_PROBE: {selector: int(count) for selector, count in zip(probe_selectors, counts)},
+        }
+        for group, group_hits in extracted_hits.items():
+            hits.setdefault(group, {}).update(group_hits)
+        # Every planned card selector is run over the whole page; one that located no kept card missed.
+        for selector in plan[SELECTOR_GROUP_CARD]:
+            hits.setdefault(SELECTOR_GROUP_CARD, {}).setdefault(selector, 0)
+        record_selector_hits(stats, locale, hits, now=datetime.now())
+        write_selector_stats(stats_file, stats)
+    except Exception as exc:  # noqa: BLE001
+        append_log(log_file, f"backup selector_stats_error={exc}")
+        return
+    matched = sum(1 for group_hits in hits.values() for count in group_hits.values() if count > 0)
+    seen = sum(len(group_hits) for group_hits in hits.values())
+    stopped = [
+        f"{row['group']}:{row['selector']}"
+        for row in selector_report(stats)
+        if row["locale"] == locale and row["status"] == SELECTOR_STATUS_STOPPED
+    ]
+    append_log(
+        log_file,
+        f"backup selector_stats matched={matched} seen={seen} total={len(entries)} file={stats_file}",
+    )
+    if stopped:
+        append_log(log_file, f"backup selectors stopped_matching={' | '.join(stopped)}")
+
+
+def run_selector_report(paths: RunPaths, *, start: datetime) -> int:
+    append_log(paths.log_file, f"selector-report started start_time={start.isoformat()}")
+
+    success = False
+    error_message = None
+    stats_file = _build_selector_stats_path(paths.log_file)
+    report_stem = paths.log_file.stem.replace("run_", "")
+    report_path = paths.log_file.parent / "artifacts" / f"selector_report_{report_stem}.json"
+    output: Path | str = report_path
+    stopped_count = 0
+
+    try:
+        stats = load_selector_stats(stats_file)
+        if not stats:
+            raise FileNotFoundError(f"selector stats not found: {stats_file}")
+        rows = selector_report(stats)
+        for row in rows:
+            print(
+                "selector "
+                f"locale={row['locale']} group={row['group']} status={row['status']} "
+                f"runs_matched={row['runs_matched']} consecutive_misses={row['consecutive_misses']} "
+                f"last_hit={row['last_hit']} selector={row['selector']}"
+            )
+        stopped_count = sum(1 for row in rows if row["status"] == SELECTOR_STATUS_STOPPED)
+        report_path.parent.mkdir(parents=True, exist_ok=True)
+        report_path.write_text(
+            json.dumps({"generated_at": start.isoformat(), "selectors": rows}, ensure_ascii=False, indent=2) + "\n",
+            encoding="utf-8",
+        )
+        success = True
+    except Exception as exc:  # noqa: BLE001
+        error_message = str(exc)
+    finally:
+        _finalize_run(
+            log_file=paths.log_file,
+            run_label="selector-report",
+            start=start,
+            success=success,
+            notes_count=0,
+            output=output,
+            error_message=error_message,
+            summary_fields={"stopped_selectors": stopped_count},
+        )
+
+    return 0 if success else 1
+
+
+def _build_checkpoint_path(log_file: Path) -> Path:
+    return log_file.parent / "checkpoints" / BACKUP_CHECKPOINT_FILE_NAME
+
+
+def _note_key(note: dict[str, str]) -> tuple[str, str]:
+    return (note.get("title", ""), note.get("body", ""))
+
+
+def _merge_notes(
+    primary: list[dict[str, str]],
+    extra: list[dict[str, str]],
+) -> list[dict[str, str]]:
+    merged = list(primary)
+    seen = {_note_key(note) for note in primary}
+    for note in extra:
+        key = _note_key(note)
+        if key in seen:
+            continue
+        seen.add(key)
+        merged.append(note)
+    return merged
+
+
+def _write_backup_checkpoint(
+    checkpoint_path: Path,
+    *,
+    log_file: Path,
+    profile_dir: Path,
+    notes: list[dict[str, str]],
+    scroll_iterations: int,
+    cards_count: int,
+    complete: bool,
+    elapsed_seconds: float,
+) -> None:
+    write_start = time.perf_counter()
+    size = write_checkpoint(
+        checkpoint_path,
+        {
+            "saved_at": datetime.now().isoformat(),
+            "profile_dir": str(profile_dir),
+            "scroll_iterations": scroll_iterations,
+            "cards_count": cards_count,
+            "complete": complete,
+            "elapsed_seconds": round(elapsed_seconds, 3),
+            "notes": notes,
+        },
+    )
+    write_ms = (time.perf_counter() - write_start) * 1000
+    append_log(
+        log_file,
+        "backup checkpoint "
+        f"notes={len(notes)} scroll_iterations={scroll_iterations} complete={complete} "
+        f"bytes={size} write_ms={write_ms:.1f}",
+    )
+
+
+def _load_resume_checkpoint(
+    checkpoint_path: Path,
+    *,
+    log_file: Path,
+    profile_dir: Path,
+) -> dict[str, object] | None:
+    payload = load_checkpoint(checkpoint_path)
+    if payload is None:
+        append_log(log_file, f"backup resume checkpoint=missing path={checkpoint_path}")
+        return None
+    if payload.get("profile_dir") != str(profile_dir):
+        append_log(log_file, "backup resume checkpoint=ignored reason=profile_mismatch")
+        return None
+    try:
+        saved_at = datetime.fromisoformat(str(payload.get("saved_at")))
+        scroll_iterations = int(payload.get("scroll_iterations", 0))
+        elapsed_seconds = float(payload.get("elapsed_seconds", 0.0))
+        cards_count = int(payload["cards_count"])
+    except (KeyError, TypeError, ValueError):
+        append_log(log_file, "backup resume checkpoint=ignored reason=invalid")
+        return None
+    age_seconds = (datetime.now() - saved_at).total_seconds()
+    if age_seconds > BACKUP_CHECKPOINT_MAX_AGE_SECONDS:
+        append_log(log_file, f"backup resume checkpoint=ignored reason=stale age_seconds={age_seconds:.0f}")
+        return None
+    raw_notes = payload.get("notes")
+    notes = [
+        {str(key): str(value) for key, value in note.items()}
+        for note in (raw_notes if isinstance(raw_notes, list) else [])
+        if isinstance(note, dict)
+    ]
+    return {
+        "notes": notes,
+        "scroll_iterations": scroll_iterations,
+        "cards_count": cards_count,
+        "elapsed_seconds": elapsed_seconds,
+        "complete": bool(payload.get("complete")),
+    }
+
+
+NOTE_PAYLOADS_SCRIPT_TEMPLATE = """
         () => {
           const genericLabels = new Set([
             'Select note',
@@ -405,68 +2028,83 @@ def _extract_note_payloads(page: object) -> list[dict[str, str]]:
           ]);
 
           const cardSelectors = [
-            '.notes-container .IZ65Hb-n0tgWb',
-            '[aria-label="Notes"] [role="listitem"]',
-            '[aria-label="メモ"] [role="listitem"]',
-            '[aria-label="Select note"]',
-            '[aria-label="メモを選択"]',
-            '[role="listitem"]',
+__CARD_SELECTORS__
           ];
 
           const cards = [];
+          // Every card selector that located a card, so selector stats credit real extractions only.
+          const cardSelectorsOf = new Map();
           for (const selector of cardSelectors) {
             for (const element of document.querySelectorAll(selector)) {
               const card = element.closest('.IZ65Hb-n0tgWb, [role="listitem"], article, li') || element;
-              if (!cards.includes(card)) {
+              if (!cardSelectorsOf.has(card)) {
                 cards.push(card);
+                cardSelectorsOf.set(card, []);
+              }
+              if (!cardSelectorsOf.get(card).includes(selector)) {
+                cardSelectorsOf.get(card).push(selector);
               }
             }
           }
 
           const readText = (element) => (element?.innerText || element?.textContent || '').trim();
 
+          const bodySelectors = [
+__BODY_SELECTORS__
+          ];
+
+          // Grid cards clip long bodies; a clipped box or a trailing ellipsis marks a hydration candidate.
+          const looksTruncated = (card, body) => {
+            if (body.endsWith('…')) return true;
+            for (const selector of bodySelectors) {
+              for (const element of card.querySelectorAll(selector)) {
+                if (element.clientHeight > 0 && element.scrollHeight > element.clientHeight + 1) return true;
+              }
+            }
+            return false;
+          };
+
+          const noteLink = (card) => {
+            const link = card.querySelector('a[href*="#NOTE/"], a[href*="#LIST/"]');
+            return link ? link.href : '';
+          };
+
+          // Both return the selector that produced the text and the ones tried before it without result.
           const extractText = (root, selectors) => {
+            const missed = [];
             for (const selector of selectors) {
-              const found = root.querySelector(selector);
-              if (!found) continue;
-              const text = readText(found);
-              if (text) return text;
+              const text = readText(root.querySelector(selector));
+              if (text) return {text, selector, missed};
+              missed.push(selector);
             }
-            return '';
+            return {text: '', selector: '', missed};
           };
 
           const extractDistinctText = (root, selectors, excludeText) => {
+            const missed = [];
             for (const selector of selectors) {
               for (const found of root.querySelectorAll(selector)) {
                 const text = readText(found);
                 if (!text) continue;
                 if (excludeText && text === excludeText) continue;
-                return text;
+                return {text, selector, missed};
               }
+              missed.push(selector);
             }
-            return '';
+            return {text: '', selector: '', missed};
           };
 
           const notes = [];
           for (const card of cards) {
             const ariaLabel = (card.getAttribute('aria-label') || '').trim();
-            const title = extractText(card, [
-              '[aria-label="Title"]',
-              '[aria-label="タイトル"]',
-              '[placeholder="Title"]',
-              '[placeholder="タイトル"]',
-              '.IZ65Hb-YPqjbf[role="textbox"]',
-              '[data-testid="note-title"]',
-              '.note .title',
+            const titleMatch = extractText(card, [
+__TITLE_SELECTORS__
             ]);
-            let body = extractDistinctText(card, [
-              '[aria-label="Note"]',
-              '[aria-label="メモ"]',
-              '.IZ65Hb-vIzZGf-L9AdLc-haAclf',
-              '[contenteditable="true"][role="textbox"]',
-              '[data-testid="note-content"]',
-              '.note .body',
+            const title = titleMatch.text;
+            const bodyMatch = extractDistinctText(card, [
+__BODY_SELECTORS__
             ], title);
+            const body = bodyMatch.text;
 
             let normalizedTitle = title;
             let normalizedBody = body;
@@ -500,13 +2138,65 @@ def _extract_note_payloads(page: object) -> list[dict[str, str]]:
             notes.push({
               title: normalizedTitle,
               body: normalizedBody,
+              truncated: looksTruncated(card, normalizedBody),
+              href: noteLink(card),
+              selectors: {
+                card: cardSelectorsOf.get(card),
+                title: normalizedTitle && normalizedTitle === title ? titleMatch.selector : '',
+                body: normalizedBody && normalizedBody === body ? bodyMatch.selector : '',
+              },
+              missed: {title: titleMatch.missed, body: bodyMatch.missed},
             });
           }
           return notes;
         }
-        """
+"""
+
+
+SELECTOR_HITS_SCRIPT = """
+        (selectors) => selectors.map((selector) => {
+          try {
+            return document.querySelectorAll(selector).length;
+          } catch (error) {
+            return 0;
+          }
+        })
+"""
+
+
+def _js_selector_list(selectors: list[str], indent: str) -> str:
+    lines = []
+    for selector in selectors:
+        escaped = selector.replace("\\", "\\\\").replace("'", "\\'")
+        lines.append(f"{indent}'{escaped}',")
+    return "\n".join(lines)
+
+
+def render_note_payloads_script(plan: dict[str, list[str]] | None = None) -> str:
+    plan = plan or default_plan()
+    return (
+        NOTE_PAYLOADS_SCRIPT_TEMPLATE
+        .replace("__CARD_SELECTORS__", _js_selector_list(plan[SELECTOR_GROUP_CARD], " " * 12))
+        .replace("__TITLE_SELECTORS__", _js_selector_list(plan[SELECTOR_GROUP_TITLE], " " * 14))
+        .replace("__BODY_SELECTORS__", _js_selector_list(plan[SELECTOR_GROUP_BODY], " " * 14))
     )
 
+
+NOTE_PAYLOADS_SCRIPT = render_note_payloads_script()
+
+
+def _extract_note_payloads(
+    page: object,
+    plan: dict[str, list[str]] | None = None,
+    *,
+    hydration_targets: list[tuple[int, str]] | None = None,
+    with_ids: bool = False,
+    selector_hits: dict[str, dict[str, int]] | None = None,
+) -> list[dict[str, str]]:
+    # hydration_targets collects (index, url) of likely-truncated cards; with_ids adds each card's note id.
+    script = NOTE_PAYLOADS_SCRIPT if plan is None else render_note_payloads_script(plan)
+    raw_notes = page.evaluate(script)
+
     notes: list[dict[str, str]] = []
     for item in raw_notes:
         title = str(item.get("title", "")).strip()
@@ -516,23 +2206,346 @@ def _extract_note_payloads(page: object) -> list[dict[str, str]]:
         note: dict[str, str] = {"body": body}
         if title:
             note["title"] = title
+        if with_ids:
+            match = KEEP_NOTE_ID_PATTERN.search(str(item.get("href") or ""))
+            if match:
+                note["id"] = match.group(1)
+        if hydration_targets is not None and item.get("truncated"):
+            hydration_targets.append((len(notes), str(item.get("href") or "")))
+        if selector_hits is not None:
+            _count_selector_hits(selector_hits, item)
         notes.append(note)
     return notes
 
 
+def _count_selector_hits(selector_hits: dict[str, dict[str, int]], item: dict[str, object]) -> None:
+    # Selectors tried on a card without producing its text count as seen with no hit;
+    # fallbacks never reached because an earlier selector won stay out of the stats.
+    missed = item.get("missed")
+    for group, selectors in (missed.items() if isinstance(missed, dict) else []):
+        for selector in selectors or []:
+            selector_hits.setdefault(group, {}).setdefault(str(selector), 0)
+    chosen = item.get("selectors")
+    for group, winners in (chosen.items() if isinstance(chosen, dict) else []):
+        for selector in [winners] if isinstance(winners, str) else winners or []:
+            if selector:
+                group_hits = selector_hits.setdefault(group, {})
+                group_hits[str(selector)] = group_hits.get(str(selector), 0) + 1
+
+
+HYDRATE_NOTE_SCRIPT = """
+        ({editorSelector, titleSelectors, bodySelectors}) => {
+          const root = document.querySelector(editorSelector) || document;
+          const readText = (element) => (element?.innerText || element?.textContent || '').trim();
+          let title = '';
+          for (const selector of titleSelectors) {
+            const text = readText(root.querySelector(selector));
+            if (text) {
+              title = text;
+              break;
+            }
+          }
+          for (const selector of bodySelectors) {
+            for (const element of root.querySelectorAll(selector)) {
+              const text = readText(element);
+              if (text && text !== title) return {title, body: text};
+            }
+          }
+          return {title, body: ''};
+        }
+"""
+
+
+def _hydrate_truncated_notes(
+    page: object,
+    notes: list[dict[str, str]],
+    targets: list[tuple[int, str]],
+    *,
+    log_file: Path,
+    plan: dict[str, list[str]],
+    pool_size: int = HYDRATION_POOL_SIZE,
+    budget: PhaseBudget | None = None,
+) -> int:
+    # Each free pool page starts its next navigation before the oldest in-flight one is read.
+    linked = [(index, url) for index, url in targets if url]
+    unlinked = len(targets) - len(linked)
+    hydrated = failed = 0
+    started = time.perf_counter()
+    pool: list[object] = []
+    in_flight: deque[tuple[object, int, str]] = deque()
+    pending = deque(linked)
+    stopped_by_deadline = False
+    selectors = {
+        "editorSelector": HYDRATION_EDITOR_SELECTOR,
+        "titleSelectors": plan[SELECTOR_GROUP_TITLE],
+        "bodySelectors": plan[SELECTOR_GROUP_BODY],
+    }
+
+    def start_next(pool_page: object) -> None:
+        index, url = pending.popleft()
+        pool_page.goto(url, wait_until="commit")
+        in_flight.append((pool_page, index, url))
+
+    try:
+        if pool_size > 0:
+            for _ in range(min(pool_size, len(pending))):
+                pool_page = page.context.new_page()
+                pool.append(pool_page)
+                start_next(pool_page)
+        while in_flight:
+            pool_page, index, url = in_flight.popleft()
+            if budget is not None and budget.exhausted:
+                # The rest keep their truncated card text, so the summary must report the deadline.
+                budget.mark_hit()
+                in_flight.appendleft((pool_page, index, url))
+                stopped_by_deadline = True
+                break
+            timeout_ms = HYDRATION_TIMEOUT_MS if budget is None else min(HYDRATION_TIMEOUT_MS, budget.timeout_ms())
+            try:
+                pool_page.wait_for_selector(HYDRATION_EDITOR_SELECTOR, timeout=timeout_ms)
+                full = pool_page.evaluate(HYDRATE_NOTE_SCRIPT, selectors)
+                body = str(full.get("body", "")).strip()
+            except Exception as exc:  # noqa: BLE001
+                failed += 1
+                append_log(log_file, f"backup hydration failed url={url} error={exc}")
+            else:
+                if len(body) > len(notes[index]["body"]):
+                    notes[index] = {**notes[index], "body": body}
+                    hydrated += 1
+            if pending:
+                start_next(pool_page)
+    finally:
+        for pool_page in pool:
+            try:
+                pool_page.close()
+            except Exception as exc:  # noqa: BLE001
+                append_log(log_file, f"backup hydration close_error={exc}")
+
+    seconds = time.perf_counter() - started
+    set_run_metric("hydration_candidates", len(targets))
+    set_run_metric("hydrated_notes", hydrated)
+    set_run_metric("hydrated_notes_per_second", hydrated / max(seconds, 1e-9))
+    append_log(
+        log_file,
+        "backup hydration "
+        f"candidates={len(targets)} hydrated={hydrated} failed={failed} unlinked={unlinked} "
+        f"skipped={len(pending) + len(in_flight)} pool={min(pool_size, len(linked))} "
+        f"seconds={seconds:.2f} notes_per_second={hydrated / max(seconds, 1e-9):.1f}"
+        + (" stopped_by=deadline" if stopped_by_deadline else ""),
+    )
+    return hydrated
+
+
+LABEL_LINKS_SCRIPT = """
+        (selector) => {
+          const labels = new Map();
+          for (const link of document.querySelectorAll(selector)) {
+            const name = (link.innerText || link.textContent || link.getAttribute('aria-label') || '').trim();
+            if (link.href && !labels.has(link.href)) labels.set(link.href, name);
+          }
+          return [...labels].map(([href, name]) => ({ href, name }));
+        }
+"""
+
+
+def _discover_harvest_shards(page: object) -> list[HarvestShard]:
+    # One shard per sidebar label link, then the unlabelled remainder.
+    shards: list[HarvestShard] = []
+    for item in page.evaluate(LABEL_LINKS_SCRIPT, SHARD_LABEL_LINK_SELECTOR):
+        url = str(item.get("href") or "")
+        if url:
+            shards.append(HarvestShard(name=str(item.get("name") or "").strip() or url.rsplit("/", 1)[-1], url=url))
+    shards.append(HarvestShard(name=SHARD_UNLABELLED_NAME, url=SHARD_UNLABELLED_URL))
+    return shards
+
+
+def _harvest_shards(
+    page: object,
+    shards: list[HarvestShard],
+    *,
+    log_file: Path,
+    plan: dict[str, list[str]],
+    notes_selector: str,
+    pool_size: int = SHARD_POOL_SIZE,
+    budget: PhaseBudget | None = None,
+    selector_hits: dict[str, dict[str, int]] | None = None,
+) -> None:
+    # Like hydration: each round scrolls every open shard and waits once, so up to pool_size views load together.
+    pending = deque(shards)
+    active: list[HarvestShard] = []
+
+    def open_next() -> None:
+        shard = pending.popleft()
+        shard.page = page.context.new_page()
+        shard.started = time.perf_counter()
+        active.append(shard)
+        shard.page.goto(shard.url, wait_until="domcontentloaded")
+
+    def finish(shard: HarvestShard, stopped_by: str) -> None:
+        active.remove(shard)
+        shard.stopped_by = stopped_by
+        try:
+            shard.notes = _extract_note_payloads(
+                shard.page,
+                plan,
+                hydration_targets=shard.hydration_targets,
+                with_ids=True,
+                selector_hits=selector_hits,
+            )
+        except Exception as exc:  # noqa: BLE001
+            append_log(log_file, f"backup shard name={shard.name} extract_error={exc}")
+        shard.seconds = time.perf_counter() - shard.started
+        try:
+            shard.page.close()
+        except Exception as exc:  # noqa: BLE001
+            append_log(log_file, f"backup shard name={shard.name} close_error={exc}")
+        append_log(
+            log_file,
+            "backup shard "
+            f"name={shard.name} notes={len(shard.notes)} iterations={shard.iterations} "
+            f"seconds={shard.seconds:.2f} stopped_by={stopped_by}",
+        )
+
+    try:
+        while pending and len(active) < max(1, pool_size):
+            open_next()
+        while active:
+            if budget is not None and budget.exhausted:
+                budget.mark_hit()
+                # Keep whatever the open views have loaded; shards not yet opened stay unharvested.
+                for shard in list(active):
+                    finish(shard, "deadline")
+                break
+            for shard in active:
+                shard.page.mouse.wheel(0, INFINITE_SCROLL_STEP_PX)
+            page.wait_for_timeout(budget.cap_ms(INFINITE_SCROLL_WAIT_MS) if budget is not None else INFINITE_SCROLL_WAIT_MS)
+            for shard in list(active):
+                count = shard.page.locator(notes_selector).count()
+                if count == 0 and (time.perf_counter() - shard.started) * 1000 < SHARD_SETTLE_MS:
+                    continue
+                shard.iterations += 1
+                if count > shard.highest_count:
+                    shard.highest_count = count
+                    shard.stable_passes = 0
+                else:
+                    shard.stable_passes += 1
+                if shard.stable_passes >= INFINITE_SCROLL_STABLE_PASSES:
+                    finish(shard, "stable")
+                elif shard.iterations >= SHARD_SCROLL_MAX_ITERATIONS:
+                    finish(shard, "max_iterations")
+                else:
+                    continue
+                if pending:
+                    open_next()
+    finally:
+        for shard in active:
+            try:
+                shard.page.close()
+            except Exception as exc:  # noqa: BLE001
+                append_log(log_file, f"backup shard name={shard.name} close_error={exc}")
+    for shard in pending:
+        shard.stopped_by = "skipped"
+        append_log(log_file, f"backup shard name={shard.name} notes=0 stopped_by=skipped")
+
+
+def _shard_note_identity(note: dict[str, str]) -> tuple[str, ...]:
+    if note.get("id"):
+        return ("id", note["id"])
+    return ("text", *_note_key(note))
+
+
+def _merge_shard_notes(
+    shards: list[HarvestShard],
+    *,
+    log_file: Path,
+    seconds: float,
+) -> tuple[list[dict[str, str]], list[tuple[int, str]]]:
+    # The first copy of each note wins; hydration targets follow their note.
+    merged: list[dict[str, str]] = []
+    targets: list[tuple[int, str]] = []
+    seen: set[tuple[str, ...]] = set()
+    harvested = 0
+    for shard in shards:
+        merged_index: dict[int, int] = {}
+        for index, note in enumerate(shard.notes):
+            harvested += 1
+            identity = _shard_note_identity(note)
+            if identity in seen:
+                continue
+            seen.add(identity)
+            merged_index[index] = len(merged)
+            merged.append(note)
+        targets.extend((merged_index[index], url) for index, url in shard.hydration_targets if index in merged_index)
+
+    duplicates = harvested - len(merged)
+    set_run_metric("harvest_shards", len(shards))
+    set_run_metric("harvest_shard_duplicates", duplicates)
+    append_log(
+        log_file,
+        "backup shards "
+        f"count={len(shards)} skipped={sum(1 for shard in shards if shard.stopped_by == 'skipped')} "
+        f"harvested={harvested} notes={len(merged)} duplicates={duplicates} seconds={seconds:.2f} "
+        f"slowest_seconds={max((shard.seconds for shard in shards), default=0.0):.2f}",
+    )
+    return merged, targets
+
+
+def _build_parse_cache_dir(log_file: Path) -> Path:
+    return log_file.parent / "cache" / "parse_dom"
+
+
+def _extractor_fingerprint() -> str:
+    rules = f"{NOTE_PAYLOADS_EXTRACTOR_VERSION}\n{NOTE_PAYLOADS_SCRIPT}"
+    return hashlib.sha256(rules.encode("utf-8")).hexdigest()[:16]
+
+
+def _parse_dom_cache_key(snapshot_path: Path) -> str:
+    digest = hashlib.sha256()
+    with snapshot_path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return f"{digest.hexdigest()}-{_extractor_fingerprint()}"
+
+
+def _dom_snapshot_history(dom_input: Path | None) -> SnapshotHistory:
+    artifacts_dir = dom_input.parent if dom_input is not None else Path("logs") / "artifacts"
+    return SnapshotHistory(artifacts_dir / HISTORY_DIR_NAME)
+
+
 def _resolve_dom_snapshot_input(dom_input: Path | None) -> Path:
+    history = _dom_snapshot_history(dom_input)
     if dom_input is not None:
-        if not dom_input.exists():
+        if dom_input.exists():
+            return dom_input
+        if history.find(dom_input.name) is None:
             raise FileNotFoundError(f"dom snapshot not found: {dom_input}")
-        return dom_input
+        return _restore_dom_snapshot(history, dom_input.name)
 
     artifacts_dir = Path("logs") / "artifacts"
-    candidates = sorted(artifacts_dir.glob("dom_snapshot_*.html"), key=lambda path: path.stat().st_mtime)
+    candidates: list[tuple[float, str, Path | None]] = [
+        (path.stat().st_mtime, path.name, path) for path in artifacts_dir.glob("dom_snapshot_*.html")
+    ]
+    on_disk = {name for _, name, _ in candidates}
+    for entry in history.entries():
+        if entry["name"] not in on_disk:
+            candidates.append((float(entry.get("mtime", 0.0)), str(entry["name"]), None))
     if not candidates:
         raise FileNotFoundError(
             "dom snapshot not found: logs/artifacts/dom_snapshot_*.html"
         )
-    return candidates[-1]
+    _, name, path = max(candidates, key=lambda candidate: candidate[0])
+    return path if path is not None else _restore_dom_snapshot(history, name)
+
+
+def _restore_dom_snapshot(history: SnapshotHistory, name: str) -> Path:
+    # Rebuilt into the cache dir so the browser can open it by file:// URL.
+    started = time.perf_counter()
+    data = history.reconstruct(name)
+    set_run_metric("snapshot_reconstruct_seconds", time.perf_counter() - started)
+    restored_path = history.history_dir.parent.parent / "cache" / HISTORY_DIR_NAME / name
+    restored_path.parent.mkdir(parents=True, exist_ok=True)
+    restored_path.write_bytes(data)
+    return restored_path
 
 
 def _extract_notes_from_dom_snapshot(dom_snapshot_path: Path, *, log_file: Path) -> list[dict[str, str]]:
@@ -564,26 +2577,277 @@ def _load_sync_playwright():
 
 
 @contextmanager
-def _open_playwright_page(log_file: Path, profile_dir: Path | None) -> Iterator[object]:
+def _reuse_or_open_playwright_page(
+    log_file: Path,
+    profile_dir: Path | None,
+    page: object | None,
+) -> Iterator[object]:
+    if page is None:
+        with _open_playwright_page(log_file, profile_dir) as opened_page:
+            yield opened_page
+        return
+    append_log(log_file, f"playwright smoke profile_dir={profile_dir} context=reused")
+    yield page
+
+
+@contextmanager
+def _open_playwright_page(
+    log_file: Path,
+    profile_dir: Path | None,
+    *,
+    launch_preset: str | None = None,
+) -> Iterator[object]:
+    preset_name, preset = load_launch_preset(launch_preset)
+    launch_options = preset.launch_options()
     sync_playwright = _load_sync_playwright()
     with sync_playwright() as playwright:
-        if profile_dir:
+        launch_start = time.perf_counter()
+        replay_har = load_har_path(HAR_REPLAY_ENV)
+        if replay_har is not None:
+            with _open_har_replay_page(
+                playwright,
+                log_file=log_file,
+                har_file=replay_har,
+                launch_options=launch_options,
+                context_options=preset.context_options(),
+            ) as page:
+                _record_launch_to_first_page(log_file, preset_name=preset_name, launch_start=launch_start)
+                yield page
+            return
+        record_har = load_har_path(HAR_RECORD_ENV)
+        context_options = preset.context_options()
+        if record_har is not None:
+            record_har.parent.mkdir(parents=True, exist_ok=True)
+            context_options.update(record_har_path=str(record_har), record_har_content="embed")
+            append_log(log_file, f"playwright har record={record_har}")
+        state_file = load_session_state_file(profile_dir) if profile_dir else None
+        context = None
+        page = None
+        export_state = False
+        if state_file is not None:
+            fresh, reason = _session_state_is_fresh(state_file)
+            append_log(log_file, f"playwright session_state file={state_file} fresh={fresh} reason={reason}")
+            if fresh:
+                context, page = _open_session_state_context(
+                    playwright,
+                    log_file=log_file,
+                    state_file=state_file,
+                    launch_options=launch_options,
+                    context_options=context_options,
+                )
+            # A stale, missing or rejected state is refreshed from the persistent profile below.
+            export_state = context is None
+
+        if context is None and profile_dir:
             append_log(log_file, f"playwright smoke profile_dir={profile_dir}")
+            persistent_start = time.perf_counter()
             context = playwright.chromium.launch_persistent_context(
                 user_data_dir=str(profile_dir),
                 headless=True,
+                **launch_options,
+                **context_options,
             )
             page = context.pages[0] if context.pages else context.new_page()
-        else:
+            append_log(
+                log_file,
+                f"playwright launch path=persistent_profile launch_ms={_elapsed_ms(persistent_start):.0f}",
+            )
+        elif context is None:
             append_log(log_file, "playwright smoke profile_dir=(none)")
-            browser = playwright.chromium.launch(headless=True)
-            context = browser.new_context()
+            browser = playwright.chromium.launch(headless=True, **launch_options)
+            context = browser.new_context(**context_options)
             page = context.new_page()
+        _record_launch_to_first_page(log_file, preset_name=preset_name, launch_start=launch_start)
 
         try:
             yield page
         finally:
+            if export_state and state_file is not None:
+                _export_session_state(context, log_file=log_file, state_file=state_file)
             context.close()
+            # Playwright only writes the HAR when the context closes.
+            if record_har is not None and record_har.exists():
+                scrubbed = scrub_har_credentials(record_har)
+                append_log(
+                    log_file,
+                    f"playwright har saved={record_har} bytes={record_har.stat().st_size} scrubbed_fields={scrubbed}",
+                )
+
+
+def _record_launch_to_first_page(log_file: Path, *, preset_name: str, launch_start: float) -> None:
+    elapsed = time.perf_counter() - launch_start
+    set_run_metric("launch_to_first_page_seconds", elapsed)
+    set_run_label("launch_preset", preset_name)
+    append_log(log_file, f"playwright launch_preset={preset_name} launch_to_first_page_ms={elapsed * 1000:.0f}")
+
+
+def load_har_path(env_name: str) -> Path | None:
+    raw_value = os.environ.get(env_name, "").strip()
+    if not raw_value:
+        return None
+    return Path(raw_value).expanduser()
+
+
+@contextmanager
+def _open_har_replay_page(
+    playwright: object,
+    *,
+    log_file: Path,
+    har_file: Path,
+    launch_options: dict[str, object] | None = None,
+    context_options: dict[str, object] | None = None,
+) -> Iterator[object]:
+    if not har_file.exists():
+        raise FileNotFoundError(f"HAR not found: {har_file}")
+    launch_start = time.perf_counter()
+    browser = playwright.chromium.launch(headless=True, **(launch_options or {}))
+    context = browser.new_context(**(context_options or {}))
+    # Anything the HAR does not cover is aborted, so replays never touch the network.
+    context.route_from_har(str(har_file), not_found="abort")
+    page = context.new_page()
+    append_log(log_file, f"playwright launch path=har_replay har={har_file} launch_ms={_elapsed_ms(launch_start):.0f}")
+    try:
+        yield page
+    finally:
+        context.close()
+        browser.close()
+
+
+def scrub_har_credentials(har_file: Path) -> int:
+    # Replay matches on URL and method only, so cookies and auth headers can be dropped.
+    try:
+        payload = json.loads(har_file.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return 0
+    scrubbed = 0
+    for entry in payload.get("log", {}).get("entries", []):
+        for message in (entry.get("request", {}), entry.get("response", {})):
+            if message.get("cookies"):
+                scrubbed += len(message["cookies"])
+                message["cookies"] = []
+            headers = message.get("headers", [])
+            kept = [header for header in headers if str(header.get("name", "")).lower() not in HAR_SCRUBBED_HEADERS]
+            scrubbed += len(headers) - len(kept)
+            message["headers"] = kept
+    tmp_file = har_file.with_name(f"{har_file.name}.tmp")
+    tmp_file.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+    os.chmod(tmp_file, 0o600)
+    os.replace(tmp_file, har_file)
+    return scrubbed
+
+
+def load_session_state_file(profile_dir: Path) -> Path | None:
+    raw_value = os.environ.get("KEEP_BROWSER_SESSION_STATE_DIR", "").strip()
+    if not raw_value:
+        return None
+    # One state file per profile so multi-profile runs never share cookies.
+    profile_key = hashlib.sha256(str(profile_dir).encode("utf-8")).hexdigest()[:12]
+    return Path(raw_value).expanduser() / f"storage_state_{profile_key}.json"
+
+
+def _elapsed_ms(start: float) -> float:
+    return (time.perf_counter() - start) * 1000
+
+
+def _session_state_is_fresh(state_file: Path, *, now: float | None = None) -> tuple[bool, str]:
+    now = time.time() if now is None else now
+    if not state_file.exists():
+        return False, "missing"
+    if now - state_file.stat().st_mtime > SESSION_STATE_MAX_AGE_SECONDS:
+        return False, "stale_age"
+    try:
+        payload = json.loads(state_file.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return False, "invalid"
+    cookies = payload.get("cookies") if isinstance(payload, dict) else None
+    auth_cookies = [
+        cookie
+        for cookie in (cookies if isinstance(cookies, list) else [])
+        if isinstance(cookie, dict)
+        and cookie.get("name") in SESSION_STATE_AUTH_COOKIES
+        and str(cookie.get("domain", "")).endswith("google.com")
+    ]
+    if not auth_cookies:
+        return False, "no_auth_cookies"
+    for cookie in auth_cookies:
+        expires = cookie.get("expires", -1)
+        # Session cookies report -1; anything else is a unix timestamp.
+        if isinstance(expires, (int, float)) and 0 < expires < now:
+            return False, "cookie_expired"
+    return True, "fresh"
+
+
+def _open_session_state_context(
+    playwright: object,
+    *,
+    log_file: Path,
+    state_file: Path,
+    launch_options: dict[str, object] | None = None,
+    context_options: dict[str, object] | None = None,
+) -> tuple[object | None, object | None]:
+    launch_start = time.perf_counter()
+    browser = playwright.chromium.launch(headless=True, **(launch_options or {}))
+    context = browser.new_context(storage_state=str(state_file), **(context_options or {}))
+    page = context.new_page()
+    append_log(log_file, f"playwright launch path=storage_state launch_ms={_elapsed_ms(launch_start):.0f}")
+
+    response = page.goto("https://keep.google.com/", wait_until="domcontentloaded")
+    if page.url.startswith("https://accounts.google.com/"):
+        append_log(log_file, f"playwright session_state rejected page_url={page.url} fallback=persistent_profile")
+        context.close()
+        browser.close()
+        return None, None
+    _SESSION_STATE_LANDINGS[page] = response
+    return context, page
+
+
+def _export_session_state(context: object, *, log_file: Path, state_file: Path) -> None:
+    try:
+        state_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = state_file.with_name(f"{state_file.name}.tmp")
+        context.storage_state(path=str(tmp_file))
+        os.chmod(tmp_file, 0o600)
+        os.replace(tmp_file, state_file)
+        append_log(log_file, f"playwright session_state exported file={state_file}")
+    except Exception as exc:  # noqa: BLE001
+        append_log(log_file, f"playwright session_state export_error={exc}")
+
+
+@contextmanager
+def _capture_network_notes(page: object) -> Iterator[NetworkNoteCapture]:
+    capture = NetworkNoteCapture()
+    page.on("response", capture.handle_response)
+    try:
+        yield capture
+    finally:
+        # Warm daemon pages outlive this run; do not leave the listener behind.
+        page.remove_listener("response", capture.handle_response)
+
+
+def _wait_for_network_notes(
+    page: object,
+    capture: NetworkNoteCapture,
+    *,
+    log_file: Path,
+    budget: PhaseBudget | None = None,
+) -> list[dict[str, str]]:
+    waited_ms = 0
+    timeout_ms = budget.cap_ms(NETWORK_CAPTURE_TIMEOUT_MS) if budget is not None else NETWORK_CAPTURE_TIMEOUT_MS
+    capture.drain()
+    while not capture.complete and waited_ms < timeout_ms:
+        page.wait_for_timeout(NETWORK_CAPTURE_POLL_MS)
+        waited_ms += NETWORK_CAPTURE_POLL_MS
+        capture.drain()
+    notes = capture.notes() if capture.complete else []
+    append_log(
+        log_file,
+        "backup network_capture "
+        f"complete={format_bool(capture.complete)} responses={capture.responses_decoded} "
+        f"undecodable={capture.responses_failed} notes={len(notes)} waited_ms={waited_ms}",
+    )
+    if not notes:
+        append_log(log_file, "backup network_capture fallback=dom")
+    return notes
 
 
 def _verify_playwright_page(
@@ -596,9 +2860,44 @@ def _verify_playwright_page(
     min_notes_error_label: str,
     required_url_prefixes: list[str] | None,
     forbidden_url_prefixes: list[str] | None,
+    budget: PhaseBudget | None = None,
+    login_cache: LoginCheckCache | None = None,
+    ready_selector: str | None = None,
+    settle: bool = True,
+    reuse_landing: bool = True,
 ) -> int:
-    response = page.goto(url, wait_until="domcontentloaded")
-    page.wait_for_timeout(PLAYWRIGHT_PAGE_SETTLE_MS)
+    login_check = None
+    if login_cache is not None:
+        login_check, reason = login_cache.lookup()
+        append_log(
+            log_file,
+            f"playwright login_check cache={'hit' if login_check else 'miss'} reason={reason}"
+            + (f" age_seconds={login_cache.clock() - login_check.checked_at:.0f}" if login_check else ""),
+        )
+    landed = page in _SESSION_STATE_LANDINGS
+    landing_response = _SESSION_STATE_LANDINGS.pop(page, None)
+    if landed and reuse_landing and page.url.startswith(url):
+        response = landing_response
+        append_log(log_file, "playwright smoke goto=skipped reason=session_state_landed")
+    elif budget is None:
+        response = page.goto(url, wait_until="domcontentloaded")
+    else:
+        response = page.goto(url, wait_until="domcontentloaded", timeout=budget.timeout_ms())
+    settle_ms = PLAYWRIGHT_PAGE_SETTLE_MS if budget is None else budget.cap_ms(PLAYWRIGHT_PAGE_SETTLE_MS)
+    if settle_ms < PLAYWRIGHT_PAGE_SETTLE_MS:
+        append_log(log_file, f"playwright smoke settle_ms={settle_ms} shortened_by=deadline")
+    if not settle:
+        append_log(log_file, "playwright smoke settle=deferred")
+    elif login_check is None:
+        page.wait_for_timeout(settle_ms)
+    else:
+        # The login is already known good: wait for the grid to fill instead of the full settle.
+        _wait_for_stable_cards(
+            page,
+            log_file=log_file,
+            notes_selector=ready_selector or notes_selector or KEEP_PROBE_NOTES_SELECTOR,
+            timeout_ms=settle_ms,
+        )
     title = page.title()
     current_url = page.url
     status = response.status if response else "file"
@@ -608,41 +2907,200 @@ def _verify_playwright_page(
     ready_state = page.evaluate("document.readyState")
     append_log(log_file, f"playwright smoke ready_state={ready_state}")
 
-    if forbidden_url_prefixes:
-        for forbidden_prefix in forbidden_url_prefixes:
-            if current_url.startswith(forbidden_prefix):
-                raise RuntimeError(f"unexpected page_url for logged-in smoke: {current_url}")
-
-    if required_url_prefixes:
-        if not any(current_url.startswith(prefix) for prefix in required_url_prefixes):
-            raise RuntimeError(f"unexpected page_url: {current_url}")
+    try:
+        if forbidden_url_prefixes:
+            for forbidden_prefix in forbidden_url_prefixes:
+                if current_url.startswith(forbidden_prefix):
+                    raise RuntimeError(f"unexpected page_url for logged-in smoke: {current_url}")
+
+        if required_url_prefixes:
+            if not any(current_url.startswith(prefix) for prefix in required_url_prefixes):
+                raise RuntimeError(f"unexpected page_url: {current_url}")
+    except RuntimeError:
+        if login_cache is not None:
+            login_cache.invalidate()
+            append_log(log_file, "playwright login_check invalidated=true reason=login_failed")
+        raise
+    if login_cache is not None and login_check is None:
+        check = login_cache.record(final_url=current_url, cookie_expires=_auth_cookie_expiry(page))
+        append_log(
+            log_file,
+            f"playwright login_check recorded=true ttl_seconds={login_cache.ttl_seconds:g} "
+            f"cookie_expires={'session' if check.cookie_expires is None else f'{check.cookie_expires:.0f}'}",
+        )
 
     notes_count = 0
     if notes_selector:
-        append_log(log_file, f"playwright smoke notes_selector={notes_selector}")
-        notes_count = _collect_notes_with_infinite_scroll(
+        notes_count = _scroll_and_check_notes(
             page,
             log_file=log_file,
             notes_selector=notes_selector,
+            min_notes=min_notes,
+            min_notes_error_label=min_notes_error_label,
         )
-        append_log(log_file, f"playwright smoke notes_count={notes_count}")
-        if min_notes is not None and notes_count < min_notes:
-            raise RuntimeError(f"{min_notes_error_label} count too small: {notes_count}")
     return notes_count
 
 
+def _wait_for_stable_cards(
+    page: object,
+    *,
+    log_file: Path,
+    notes_selector: str,
+    timeout_ms: int,
+    label: str = "login_check",
+) -> None:
+    started = time.perf_counter()
+    try:
+        page.wait_for_selector(notes_selector, timeout=max(DEADLINE_MIN_TIMEOUT_MS, timeout_ms))
+    except Exception as exc:  # noqa: BLE001
+        # An empty account never shows a card; the caller's own checks decide what that means.
+        append_log(log_file, f"playwright {label} ready_wait_error={exc}")
+    # The first card shows up long before the grid is filled; the change probe fingerprints the
+    # whole first screen, so it must see the same grid a cold run sees after the full settle.
+    cards = page.locator(notes_selector).count()
+    stable_polls = 0
+    while stable_polls < CARDS_STABLE_POLLS and _elapsed_ms(started) + CARDS_STABLE_POLL_MS <= timeout_ms:
+        page.wait_for_timeout(CARDS_STABLE_POLL_MS)
+        count = page.locator(notes_selector).count()
+        stable_polls = stable_polls + 1 if count == cards else 0
+        cards = count
+    append_log(
+        log_file,
+        f"playwright {label} settle=skipped cards={cards} stable={format_bool(stable_polls >= CARDS_STABLE_POLLS)} "
+        f"ready_ms={_elapsed_ms(started):.0f} saved_ms_estimate={max(0, timeout_ms - _elapsed_ms(started)):.0f}",
+    )
+
+
+def _build_login_check_cache(
+    log_file: Path,
+    profile_dir: Path | None,
+    *,
+    reuse: bool = True,
+) -> LoginCheckCache | None:
+    # HAR replays never log in, so there is nothing to cache for them.
+    if profile_dir is None or load_har_path(HAR_REPLAY_ENV) is not None:
+        return None
+    ttl_seconds = load_login_check_ttl()
+    if ttl_seconds <= 0:
+        return None
+    return LoginCheckCache(
+        build_login_check_path(log_file.parent / "cache", profile_dir),
+        profile_dir=profile_dir,
+        ttl_seconds=ttl_seconds,
+        reuse=reuse,
+    )
+
+
+def _auth_cookie_expiry(page: object) -> float | None:
+    try:
+        cookies = page.context.cookies()
+    except Exception:  # noqa: BLE001
+        return None
+    expiries = [
+        float(cookie["expires"])
+        for cookie in cookies
+        if isinstance(cookie, dict)
+        and cookie.get("name") in SESSION_STATE_AUTH_COOKIES
+        and str(cookie.get("domain", "")).endswith("google.com")
+        and isinstance(cookie.get("expires"), (int, float))
+        and cookie["expires"] > 0
+    ]
+    return min(expiries) if expiries else None
+
+
+def _scroll_and_check_notes(
+    page: object,
+    *,
+    log_file: Path,
+    notes_selector: str,
+    min_notes: int | None,
+    min_notes_error_label: str,
+    resume_iterations: int = 0,
+    resume_cards: int = 0,
+    on_scroll: Callable[[int, int], None] | None = None,
+    budget: PhaseBudget | None = None,
+) -> int:
+    append_log(log_file, f"playwright smoke notes_selector={notes_selector}")
+    notes_count = _collect_notes_with_infinite_scroll(
+        page,
+        log_file=log_file,
+        notes_selector=notes_selector,
+        resume_iterations=resume_iterations,
+        resume_cards=resume_cards,
+        on_scroll=on_scroll,
+        budget=budget,
+    )
+    append_log(log_file, f"playwright smoke notes_count={notes_count}")
+    if min_notes is not None and notes_count < min_notes:
+        raise RuntimeError(f"{min_notes_error_label} count too small: {notes_count}")
+    return notes_count
+
+
+def _fast_forward_scroll(
+    page: object,
+    *,
+    log_file: Path,
+    notes_selector: str,
+    max_steps: int,
+    target_count: int,
+    budget: PhaseBudget | None = None,
+) -> int:
+    # One big wheel clamps at the current document height, so step with short waits until the
+    # grid is back to the checkpointed card count.
+    steps = 0
+    waited_ms = 0
+    count = page.locator(notes_selector).count()
+    while steps < max_steps and (target_count <= 0 or count < target_count):
+        if budget is not None and budget.exhausted:
+            break
+        wait_ms = budget.cap_ms(RESUME_FAST_FORWARD_WAIT_MS) if budget is not None else RESUME_FAST_FORWARD_WAIT_MS
+        page.mouse.wheel(0, INFINITE_SCROLL_STEP_PX)
+        page.wait_for_timeout(wait_ms)
+        waited_ms += wait_ms
+        steps += 1
+        count = page.locator(notes_selector).count()
+    saved_ms = max(0, max_steps * INFINITE_SCROLL_WAIT_MS - waited_ms)
+    append_log(
+        log_file,
+        "playwright smoke scroll "
+        f"fast_forward iterations={max_steps} steps={steps} cards={count} target={target_count} "
+        f"waited_ms={waited_ms} saved_scroll_wait_ms={saved_ms}",
+    )
+    set_run_metric("resume_saved_scroll_wait_ms", saved_ms)
+    return count
+
+
 def _collect_notes_with_infinite_scroll(
     page: object,
     *,
     log_file: Path,
     notes_selector: str,
+    resume_iterations: int = 0,
+    resume_cards: int = 0,
+    on_scroll: Callable[[int, int], None] | None = None,
+    budget: PhaseBudget | None = None,
 ) -> int:
+    if resume_iterations > 0:
+        _fast_forward_scroll(
+            page,
+            log_file=log_file,
+            notes_selector=notes_selector,
+            max_steps=resume_iterations,
+            target_count=resume_cards,
+            budget=budget,
+        )
+
     highest_count = page.locator(notes_selector).count()
     stable_passes = 0
 
-    for iteration in range(1, INFINITE_SCROLL_MAX_ITERATIONS + 1):
-        page.mouse.wheel(0, 2_000)
-        page.wait_for_timeout(INFINITE_SCROLL_WAIT_MS)
+    first_iteration = resume_iterations + 1
+    for iteration in range(first_iteration, first_iteration + INFINITE_SCROLL_MAX_ITERATIONS):
+        if budget is not None and budget.exhausted:
+            budget.mark_hit()
+            append_log(log_file, f"playwright smoke scroll stopped_by=deadline iteration={iteration}")
+            break
+        page.mouse.wheel(0, INFINITE_SCROLL_STEP_PX)
+        page.wait_for_timeout(budget.cap_ms(INFINITE_SCROLL_WAIT_MS) if budget is not None else INFINITE_SCROLL_WAIT_MS)
         latest_count = page.locator(notes_selector).count()
 
         if latest_count > highest_count:
@@ -657,6 +3115,9 @@ def _collect_notes_with_infinite_scroll(
             f"iteration={iteration} notes_count={latest_count} stable_passes={stable_passes}",
         )
 
+        if on_scroll is not None:
+            on_scroll(iteration, highest_count)
+
         if stable_passes >= INFINITE_SCROLL_STABLE_PASSES:
             break
 
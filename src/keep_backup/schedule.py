@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+
+# Field order and bounds follow classic 5-field cron: minute hour day-of-month month day-of-week.
+CRON_FIELD_BOUNDS = (
+    (0, 59),
+    (0, 23),
+    (1, 31),
+    (1, 12),
+    (0, 6),
+)
+
+
+@dataclass(frozen=True)
+class CronSchedule:
+    expression: str
+    minutes: frozenset[int]
+    hours: frozenset[int]
+    days: frozenset[int]
+    months: frozenset[int]
+    weekdays: frozenset[int]
+    days_restricted: bool
+    weekdays_restricted: bool
+
+    def matches_day(self, moment: datetime) -> bool:
+        day_match = moment.day in self.days
+        weekday_match = _cron_weekday(moment) in self.weekdays
+        # cron semantics: when both day fields are restricted, either one may match.
+        if self.days_restricted and self.weekdays_restricted:
+            return day_match or weekday_match
+        return day_match and weekday_match
+
+
+def parse_cron(expression: str) -> CronSchedule:
+    fields = expression.split()
+    if len(fields) != 5:
+        raise ValueError(f"invalid schedule (expected 5 cron fields): {expression!r}")
+    parsed = [
+        _parse_cron_field(field, low, high, expression)
+        for field, (low, high) in zip(fields, CRON_FIELD_BOUNDS)
+    ]
+    return CronSchedule(
+        expression=expression,
+        minutes=parsed[0],
+        hours=parsed[1],
+        days=parsed[2],
+        months=parsed[3],
+        weekdays=parsed[4],
+        days_restricted=fields[2] != "*",
+        weekdays_restricted=fields[4] != "*",
+    )
+
+
+def next_run_after(schedule: CronSchedule, after: datetime) -> datetime:
+    candidate = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+    limit = candidate + timedelta(days=366 * 5)
+    while candidate < limit:
+        if candidate.month not in schedule.months:
+            candidate = _start_of_next_month(candidate)
+            continue
+        if not schedule.matches_day(candidate):
+            candidate = (candidate + timedelta(days=1)).replace(hour=0, minute=0)
+            continue
+        if candidate.hour not in schedule.hours:
+            candidate = (candidate + timedelta(hours=1)).replace(minute=0)
+            continue
+        if candidate.minute not in schedule.minutes:
+            candidate += timedelta(minutes=1)
+            continue
+        return candidate
+    raise ValueError(f"schedule never fires: {schedule.expression!r}")
+
+
+def _parse_cron_field(field: str, low: int, high: int, expression: str) -> frozenset[int]:
+    values: set[int] = set()
+    for part in field.split(","):
+        step = 1
+        if "/" in part:
+            part, raw_step = part.split("/", 1)
+            step = _parse_cron_int(raw_step, expression)
+            if step < 1:
+                raise ValueError(f"invalid schedule step: {expression!r}")
+        if part == "*":
+            start, end = low, high
+        elif "-" in part:
+            raw_start, raw_end = part.split("-", 1)
+            start, end = _parse_cron_int(raw_start, expression), _parse_cron_int(raw_end, expression)
+        else:
+            start = _parse_cron_int(part, expression)
+            end = high if step > 1 else start
+        # Allow 7 as an alias for Sunday in the day-of-week field.
+        if (low, high) == (0, 6) and end == 7:
+            values.add(0)
+            end = 6
+            if start == 7:
+                continue
+        if start < low or end > high or start > end:
+            raise ValueError(f"schedule value out of range: {expression!r}")
+        values.update(range(start, end + 1, step))
+    return frozenset(values)
+
+
+def _parse_cron_int(raw_value: str, expression: str) -> int:
+    try:
+        return int(raw_value)
+    except ValueError as exc:
+        raise ValueError(f"invalid schedule value {raw_value!r}: {expression!r}") from exc
+
+
+def _cron_weekday(moment: datetime) -> int:
+    return (moment.weekday() + 1) % 7
+
+
+def _start_of_next_month(moment: datetime) -> datetime:
+    if moment.month == 12:
+        return moment.replace(year=moment.year + 1, month=1, day=1, hour=0, minute=0)
+    return moment.replace(month=moment.month + 1, day=1, hour=0, minute=0)
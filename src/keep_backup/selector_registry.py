@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+
+SELECTOR_GROUP_PROBE = "probe"
+SELECTOR_GROUP_CARD = "card"
+SELECTOR_GROUP_TITLE = "title"
+SELECTOR_GROUP_BODY = "body"
+SELECTOR_GROUPS = (
+    SELECTOR_GROUP_PROBE,
+    SELECTOR_GROUP_CARD,
+    SELECTOR_GROUP_TITLE,
+    SELECTOR_GROUP_BODY,
+)
+SELECTOR_DEAD_AFTER_MISSES = 5
+SELECTOR_STATS_VERSION = 1
+
+SELECTOR_STATUS_ACTIVE = "active"
+SELECTOR_STATUS_NEW = "new"
+SELECTOR_STATUS_STOPPED = "stopped"
+SELECTOR_STATUS_UNUSED = "unused"
+
+
+@dataclass(frozen=True)
+class SelectorEntry:
+    group: str
+    selector: str
+    locale: str | None = None
+
+
+# Registry order is the default plan order. locale=None entries apply to every locale.
+SELECTOR_REGISTRY: tuple[SelectorEntry, ...] = (
+    SelectorEntry(SELECTOR_GROUP_PROBE, '[aria-label="Notes"] [role="listitem"]', "en"),
+    SelectorEntry(SELECTOR_GROUP_PROBE, '[aria-label="Notes"] [role="list"]', "en"),
+    SelectorEntry(SELECTOR_GROUP_PROBE, '[aria-label="メモ"] [role="listitem"]', "ja"),
+    SelectorEntry(SELECTOR_GROUP_PROBE, '[aria-label="メモ"] [role="list"]', "ja"),
+    SelectorEntry(SELECTOR_GROUP_PROBE, '[aria-label="Select note"]', "en"),
+    SelectorEntry(SELECTOR_GROUP_PROBE, '[aria-label="メモを選択"]', "ja"),
+    SelectorEntry(SELECTOR_GROUP_CARD, ".notes-container .IZ65Hb-n0tgWb"),
+    SelectorEntry(SELECTOR_GROUP_CARD, '[aria-label="Notes"] [role="listitem"]', "en"),
+    SelectorEntry(SELECTOR_GROUP_CARD, '[aria-label="メモ"] [role="listitem"]', "ja"),
+    SelectorEntry(SELECTOR_GROUP_CARD, '[aria-label="Select note"]', "en"),
+    SelectorEntry(SELECTOR_GROUP_CARD, '[aria-label="メモを選択"]', "ja"),
+    SelectorEntry(SELECTOR_GROUP_CARD, '[role="listitem"]'),
+    SelectorEntry(SELECTOR_GROUP_TITLE, '[aria-label="Title"]', "en"),
+    SelectorEntry(SELECTOR_GROUP_TITLE, '[aria-label="タイトル"]', "ja"),
+    SelectorEntry(SELECTOR_GROUP_TITLE, '[placeholder="Title"]', "en"),
+    SelectorEntry(SELECTOR_GROUP_TITLE, '[placeholder="タイトル"]', "ja"),
+    SelectorEntry(SELECTOR_GROUP_TITLE, '.IZ65Hb-YPqjbf[role="textbox"]'),
+    SelectorEntry(SELECTOR_GROUP_TITLE, '[data-testid="note-title"]'),
+    SelectorEntry(SELECTOR_GROUP_TITLE, ".note .title"),
+    SelectorEntry(SELECTOR_GROUP_BODY, '[aria-label="Note"]', "en"),
+    SelectorEntry(SELECTOR_GROUP_BODY, '[aria-label="メモ"]', "ja"),
+    SelectorEntry(SELECTOR_GROUP_BODY, ".IZ65Hb-vIzZGf-L9AdLc-haAclf"),
+    SelectorEntry(SELECTOR_GROUP_BODY, '[contenteditable="true"][role="textbox"]'),
+    SelectorEntry(SELECTOR_GROUP_BODY, '[data-testid="note-content"]'),
+    SelectorEntry(SELECTOR_GROUP_BODY, ".note .body"),
+)
+
+
+def default_plan() -> dict[str, list[str]]:
+    plan: dict[str, list[str]] = {group: [] for group in SELECTOR_GROUPS}
+    for entry in SELECTOR_REGISTRY:
+        plan[entry.group].append(entry.selector)
+    return plan
+
+
+def detect_locale(raw_lang: str | None) -> str:
+    lang = (raw_lang or "").strip().lower()
+    if lang.startswith("ja"):
+        return "ja"
+    if lang.startswith("en"):
+        return "en"
+    return "other"
+
+
+def build_plan(stats: dict[str, object], locale: str) -> dict[str, list[str]]:
+    # Unknown locales keep every selector, and a group never ends up empty.
+    locale_stats = _locale_stats(stats, locale)
+    plan: dict[str, list[str]] = {}
+    for group in SELECTOR_GROUPS:
+        entries = [
+            entry
+            for entry in SELECTOR_REGISTRY
+            if entry.group == group and (locale == "other" or entry.locale in (None, locale))
+        ]
+        live = [
+            entry
+            for entry in entries
+            if selector_status(locale_stats.get(_stats_key(entry))) not in (
+                SELECTOR_STATUS_STOPPED,
+                SELECTOR_STATUS_UNUSED,
+            )
+        ]
+        candidates = live or entries
+        ranked = sorted(
+            enumerate(candidates),
+            key=lambda item: (
+                -int(locale_stats.get(_stats_key(item[1]), {}).get("runs_matched", 0)),
+                item[0],
+            ),
+        )
+        plan[group] = [entry.selector for _, entry in ranked]
+    return plan
+
+
+def record_selector_hits(
+    stats: dict[str, object],
+    locale: str,
+    hits: dict[str, dict[str, int]],
+    *,
+    now: datetime,
+) -> dict[str, object]:
+    locales = stats.setdefault("locales", {})
+    locale_entry = locales.setdefault(locale, {"runs": 0, "selectors": {}})
+    locale_entry["runs"] = int(locale_entry.get("runs", 0)) + 1
+    selectors = locale_entry.setdefault("selectors", {})
+    for group, group_hits in hits.items():
+        for selector, count in group_hits.items():
+            entry_stats = selectors.setdefault(
+                f"{group}|{selector}",
+                {"runs_seen": 0, "runs_matched": 0, "consecutive_misses": 0, "last_hit": None},
+            )
+            entry_stats["runs_seen"] += 1
+            entry_stats["last_count"] = count
+            if count > 0:
+                entry_stats["runs_matched"] += 1
+                entry_stats["consecutive_misses"] = 0
+                entry_stats["last_hit"] = now.isoformat(timespec="seconds")
+            else:
+                entry_stats["consecutive_misses"] += 1
+    stats["version"] = SELECTOR_STATS_VERSION
+    stats["updated_at"] = now.isoformat(timespec="seconds")
+    return stats
+
+
+def selector_status(entry_stats: dict[str, object] | None) -> str:
+    if not entry_stats:
+        return SELECTOR_STATUS_NEW
+    if int(entry_stats.get("consecutive_misses", 0)) < SELECTOR_DEAD_AFTER_MISSES:
+        return SELECTOR_STATUS_ACTIVE if int(entry_stats.get("runs_matched", 0)) else SELECTOR_STATUS_NEW
+    if int(entry_stats.get("runs_matched", 0)) > 0:
+        return SELECTOR_STATUS_STOPPED
+    return SELECTOR_STATUS_UNUSED
+
+
+def selector_report(stats: dict[str, object]) -> list[dict[str, object]]:
+    rows: list[dict[str, object]] = []
+    locales = stats.get("locales", {})
+    for locale, locale_entry in sorted(locales.items() if isinstance(locales, dict) else []):
+        for entry in SELECTOR_REGISTRY:
+            if entry.locale not in (None, locale) and locale != "other":
+                continue
+            entry_stats = locale_entry.get("selectors", {}).get(_stats_key(entry))
+            rows.append(
+                {
+                    "locale": locale,
+                    "group": entry.group,
+                    "selector": entry.selector,
+                    "status": selector_status(entry_stats),
+                    "runs_matched": (entry_stats or {}).get("runs_matched", 0),
+                    "consecutive_misses": (entry_stats or {}).get("consecutive_misses", 0),
+                    "last_hit": (entry_stats or {}).get("last_hit"),
+                }
+            )
+    return rows
+
+
+def load_selector_stats(stats_file: Path) -> dict[str, object]:
+    try:
+        with stats_file.open("r", encoding="utf-8") as handle:
+            payload = json.load(handle)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(payload, dict) or payload.get("version") != SELECTOR_STATS_VERSION:
+        return {}
+    return payload
+
+
+def write_selector_stats(stats_file: Path, stats: dict[str, object]) -> None:
+    stats_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = stats_file.with_name(f"{stats_file.name}.tmp")
+    with tmp_file.open("w", encoding="utf-8") as handle:
+        json.dump(stats, handle, ensure_ascii=False, indent=2)
+        handle.write("\n")
+    os.replace(tmp_file, stats_file)
+
+
+def _stats_key(entry: SelectorEntry) -> str:
+    return f"{entry.group}|{entry.selector}"
+
+
+def _locale_stats(stats: dict[str, object], locale: str) -> dict[str, dict[str, object]]:
+    locales = stats.get("locales", {})
+    if not isinstance(locales, dict):
+        return {}
+    selectors = locales.get(locale, {}).get("selectors", {})
+    return selectors if isinstance(selectors, dict) else {}
@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import fcntl
+import hashlib
+import struct
+import time
+import zlib
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+from keep_backup.io import load_checkpoint, write_checkpoint
+
+
+HISTORY_DIR_NAME = "dom_history"
+HISTORY_INDEX_FILE_NAME = "index.json"
+HISTORY_LOCK_FILE_NAME = ".lock"
+HISTORY_VERSION = 1
+# Every Nth snapshot is stored whole so reconstruction never walks more than N-1 deltas.
+HISTORY_KEYFRAME_INTERVAL = 10
+HISTORY_KIND_KEY = "key"
+HISTORY_KIND_DELTA = "delta"
+DELTA_MAGIC = b"KBD1"
+# Base blocks indexed for matching; smaller finds more matches, larger keeps the index small.
+DELTA_BLOCK_SIZE = 32
+_OP_COPY = 0x01
+_OP_INSERT = 0x02
+_COPY_OP = struct.Struct(">BII")
+_INSERT_OP = struct.Struct(">BI")
+_DELTA_HEADER = struct.Struct(">4sI")
+_COMPARE_STEP = 1024
+
+
+def encode_delta(base: bytes, target: bytes) -> bytes:
+    # Copy/insert operations against base, uncompressed.
+    block_index: dict[bytes, int] = {}
+    for offset in range(0, len(base) - DELTA_BLOCK_SIZE + 1, DELTA_BLOCK_SIZE):
+        block_index.setdefault(base[offset:offset + DELTA_BLOCK_SIZE], offset)
+
+    out = bytearray(_DELTA_HEADER.pack(DELTA_MAGIC, len(target)))
+    literal_start = 0
+    position = 0
+    last_start = len(target) - DELTA_BLOCK_SIZE
+    while position <= last_start:
+        base_offset = block_index.get(target[position:position + DELTA_BLOCK_SIZE])
+        if base_offset is None:
+            position += 1
+            continue
+        # Grow the match backwards into pending literal bytes, then forwards as far as it goes.
+        while position > literal_start and base_offset > 0 and base[base_offset - 1] == target[position - 1]:
+            position -= 1
+            base_offset -= 1
+        length = _match_length(base, base_offset, target, position)
+        if position > literal_start:
+            _append_insert(out, target[literal_start:position])
+        out += _COPY_OP.pack(_OP_COPY, base_offset, length)
+        position += length
+        literal_start = position
+    if literal_start < len(target):
+        _append_insert(out, target[literal_start:])
+    return bytes(out)
+
+
+def _match_length(base: bytes, base_offset: int, target: bytes, position: int) -> int:
+    limit = min(len(base) - base_offset, len(target) - position)
+    length = 0
+    while (
+        length + _COMPARE_STEP <= limit
+        and base[base_offset + length:base_offset + length + _COMPARE_STEP]
+        == target[position + length:position + length + _COMPARE_STEP]
+    ):
+        length += _COMPARE_STEP
+    while length < limit and base[base_offset + length] == target[position + length]:
+        length += 1
+    return length
+
+
+def _append_insert(out: bytearray, literal: bytes) -> None:
+    out += _INSERT_OP.pack(_OP_INSERT, len(literal))
+    out += literal
+
+
+def apply_delta(base: bytes, delta: bytes) -> bytes:
+    magic, target_length = _DELTA_HEADER.unpack_from(delta, 0)
+    if magic != DELTA_MAGIC:
+        raise ValueError("not a snapshot delta")
+    out = bytearray()
+    position = _DELTA_HEADER.size
+    while position < len(delta):
+        op = delta[position]
+        if op == _OP_COPY:
+            _, base_offset, length = _COPY_OP.unpack_from(delta, position)
+            out += base[base_offset:base_offset + length]
+            position += _COPY_OP.size
+        elif op == _OP_INSERT:
+            _, length = _INSERT_OP.unpack_from(delta, position)
+            position += _INSERT_OP.size
+            out += delta[position:position + length]
+            position += length
+        else:
+            raise ValueError(f"corrupt snapshot delta: unknown op {op} at byte {position}")
+    if len(out) != target_length:
+        raise ValueError(f"corrupt snapshot delta: rebuilt {len(out)} of {target_length} bytes")
+    return bytes(out)
+
+
+class SnapshotHistory:
+    # Zlib-compressed keyframes plus chained deltas, indexed by snapshot file name.
+
+    def __init__(self, history_dir: Path) -> None:
+        self.history_dir = history_dir
+        self.index_file = history_dir / HISTORY_INDEX_FILE_NAME
+
+    @contextmanager
+    def locked(self, *, shared: bool = False) -> Iterator[None]:
+        # Writers take it exclusively around append and pruning; readers share it while they use a snapshot.
+        if shared and not self.history_dir.exists():
+            yield
+            return
+        self.history_dir.mkdir(parents=True, exist_ok=True)
+        with (self.history_dir / HISTORY_LOCK_FILE_NAME).open("a") as handle:
+            fcntl.flock(handle, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def entries(self) -> list[dict[str, object]]:
+        if not self.index_file.exists():
+            return []
+        # Starting over here would let the next append overwrite the index and orphan every delta.
+        payload = load_checkpoint(self.index_file)
+        entries = payload.get("entries") if payload is not None else None
+        if payload is None or payload.get("version") != HISTORY_VERSION or not isinstance(entries, list):
+            raise ValueError(
+                f"dom snapshot history index is unreadable or not version {HISTORY_VERSION}: "
+                f"{self.index_file} (move it aside to start a new history)"
+            )
+        return entries
+
+    def find(self, name: str) -> dict[str, object] | None:
+        for entry in reversed(self.entries()):
+            if entry.get("name") == name:
+                return entry
+        return None
+
+    def append(self, name: str, data: bytes, *, mtime: float | None = None) -> dict[str, object]:
+        entries = self.entries()
+        sha256 = hashlib.sha256(data).hexdigest()
+        for entry in entries:
+            if entry.get("name") == name and entry.get("sha256") == sha256:
+                return entry
+
+        stored = zlib.compress(data, 6)
+        kind = HISTORY_KIND_KEY
+        base_name = None
+        since_key = _deltas_since_keyframe(entries)
+        if entries and since_key < HISTORY_KEYFRAME_INTERVAL - 1:
+            previous_name = str(entries[-1]["name"])
+            delta = zlib.compress(encode_delta(self.reconstruct(previous_name, entries=entries), data), 6)
+            # A rewritten page can make the delta larger than a fresh keyframe; keep whichever is smaller.
+            if len(delta) < len(stored):
+                stored, kind, base_name = delta, HISTORY_KIND_DELTA, previous_name
+
+        self.history_dir.mkdir(parents=True, exist_ok=True)
+        file_name = f"{len(entries):06d}_{Path(name).stem}.{kind}"
+        (self.history_dir / file_name).write_bytes(stored)
+        entry: dict[str, object] = {
+            "name": name,
+            "kind": kind,
+            "file": file_name,
+            "base": base_name,
+            "bytes": len(data),
+            "stored_bytes": len(stored),
+            "sha256": sha256,
+            "mtime": time.time() if mtime is None else mtime,
+        }
+        write_checkpoint(self.index_file, {"version": HISTORY_VERSION, "entries": [*entries, entry]})
+        return entry
+
+    def reconstruct(self, name: str, *, entries: list[dict[str, object]] | None = None) -> bytes:
+        entries = self.entries() if entries is None else entries
+        by_name = {str(entry["name"]): entry for entry in entries}
+        chain: list[dict[str, object]] = []
+        current = by_name.get(name)
+        if current is None:
+            raise FileNotFoundError(f"dom snapshot not in history: {name}")
+        while current is not None:
+            chain.append(current)
+            if current["kind"] == HISTORY_KIND_KEY:
+                break
+            current = by_name.get(str(current.get("base")))
+        if chain[-1]["kind"] != HISTORY_KIND_KEY:
+            raise ValueError(f"dom snapshot history has no keyframe for {name}")
+
+        data = b""
+        for entry in reversed(chain):
+            stored = zlib.decompress((self.history_dir / str(entry["file"])).read_bytes())
+            data = stored if entry["kind"] == HISTORY_KIND_KEY else apply_delta(data, stored)
+        if hashlib.sha256(data).hexdigest() != chain[0]["sha256"]:
+            raise ValueError(f"dom snapshot history checksum mismatch for {name}")
+        return data
+
+    def storage_ratio(self) -> float:
+        entries = self.entries()
+        original = sum(int(entry["bytes"]) for entry in entries)
+        stored = sum(int(entry["stored_bytes"]) for entry in entries)
+        return stored / original if original else 0.0
+
+
+def _deltas_since_keyframe(entries: list[dict[str, object]]) -> int:
+    count = 0
+    for entry in reversed(entries):
+        if entry.get("kind") == HISTORY_KIND_KEY:
+            return count
+        count += 1
+    return count
@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import zlib
+from datetime import datetime
+from pathlib import Path
+
+from keep_backup.io import (
+    BINARY_BACKUP_SUFFIX,
+    GENERATION_FILE_NAMES,
+    generation_checksums_path,
+    load_generation_checksums,
+    note_checksum,
+    open_binary_backup,
+)
+
+
+VERIFY_STATUS_OK = "ok"
+VERIFY_STATUS_FAILED = "failed"
+VERIFY_CHECKSUMS_RECORDED = "recorded"
+VERIFY_CHECKSUMS_MISSING = "missing"
+NOTE_STRING_FIELDS = ("id", "title", "body")
+# Per-note mismatches are summarized so one rotten 50k-note file does not flood the report.
+VERIFY_MAX_NOTE_ERRORS = 5
+
+
+def find_generations(backups_root: Path) -> list[Path]:
+    generations: list[Path] = []
+    for file_name in GENERATION_FILE_NAMES:
+        generations.extend(backups_root.rglob(file_name))
+    return sorted(generations)
+
+
+def generation_signature(backup_file: Path) -> dict[str, int]:
+    # Cheap change detector for incremental verification.
+    stat = backup_file.stat()
+    checksums_file = generation_checksums_path(backup_file)
+    checksums_mtime_ns = checksums_file.stat().st_mtime_ns if checksums_file.exists() else 0
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "checksums_mtime_ns": checksums_mtime_ns}
+
+
+def verify_generation(backup_file: Path) -> dict[str, object]:
+    # Never raises for a damaged file; problems go into the result's errors.
+    errors: list[str] = []
+    checksums = load_generation_checksums(backup_file)
+    result: dict[str, object] = {
+        "path": str(backup_file),
+        "status": VERIFY_STATUS_OK,
+        "errors": errors,
+        "notes_count": 0,
+        "bytes": 0,
+        "checksums": VERIFY_CHECKSUMS_RECORDED if checksums else VERIFY_CHECKSUMS_MISSING,
+    }
+    try:
+        data = backup_file.read_bytes()
+    except OSError as exc:
+        errors.append(f"unreadable: {exc}")
+        result["status"] = VERIFY_STATUS_FAILED
+        return result
+    result["bytes"] = len(data)
+
+    if checksums:
+        errors.extend(_check_file_checksums(data, checksums))
+
+    payload: dict[str, object] | None = None
+    if backup_file.suffix == BINARY_BACKUP_SUFFIX:
+        payload = _load_binary_payload(backup_file, errors)
+    else:
+        payload = _load_json_payload(data, errors)
+
+    if payload is not None:
+        errors.extend(validate_generation_schema(payload, backup_file))
+        notes = payload.get("notes")
+        if isinstance(notes, list):
+            result["notes_count"] = len(notes)
+            if checksums:
+                errors.extend(_check_note_checksums(notes, checksums))
+        elif isinstance(payload.get("notes_count"), int):
+            result["notes_count"] = payload["notes_count"]
+
+    if errors:
+        result["status"] = VERIFY_STATUS_FAILED
+    return result
+
+
+def validate_generation_schema(payload: dict[str, object], backup_file: Path) -> list[str]:
+    errors: list[str] = []
+    scraped_at = payload.get("scraped_at")
+    if not isinstance(scraped_at, str):
+        errors.append("schema: scraped_at is missing")
+    else:
+        try:
+            datetime.fromisoformat(scraped_at)
+        except ValueError:
+            errors.append(f"schema: scraped_at is not an ISO timestamp: {scraped_at!r}")
+
+    unchanged_since = payload.get("unchanged_since")
+    if "notes" in payload:
+        notes = payload["notes"]
+        if not isinstance(notes, list):
+            errors.append("schema: notes is not a list")
+        else:
+            bad_notes = [index for index, note in enumerate(notes) if not _is_valid_note(note)]
+            if bad_notes:
+                errors.append(f"schema: {len(bad_notes)} malformed notes (first at index {bad_notes[0]})")
+    elif isinstance(unchanged_since, str):
+        if not isinstance(payload.get("notes_count"), int):
+            errors.append("schema: unchanged generation has no notes_count")
+        based_on = Path(os.path.normpath(backup_file.parent / unchanged_since))
+        if not based_on.exists():
+            errors.append(f"schema: unchanged_since points at a missing generation: {unchanged_since}")
+    else:
+        errors.append("schema: neither notes nor unchanged_since is present")
+    return errors
+
+
+def _is_valid_note(note: object) -> bool:
+    if not isinstance(note, dict):
+        return False
+    return all(isinstance(note[key], str) for key in NOTE_STRING_FIELDS if key in note)
+
+
+def _check_file_checksums(data: bytes, checksums: dict[str, object]) -> list[str]:
+    recorded_bytes = checksums.get("file_bytes")
+    if isinstance(recorded_bytes, int) and len(data) < recorded_bytes:
+        return [f"truncated: {len(data)} of {recorded_bytes} bytes present"]
+    if isinstance(recorded_bytes, int) and len(data) != recorded_bytes:
+        return [f"size mismatch: {len(data)} bytes, {recorded_bytes} recorded"]
+    if hashlib.sha256(data).hexdigest() != checksums.get("file_sha256"):
+        return ["file checksum mismatch"]
+    return []
+
+
+def _check_note_checksums(notes: list[object], checksums: dict[str, object]) -> list[str]:
+    recorded = checksums.get("note_crc32")
+    if not isinstance(recorded, list):
+        return []
+    if len(recorded) != len(notes):
+        return [f"note count mismatch: {len(notes)} notes, {len(recorded)} checksums recorded"]
+    mismatched = [
+        index
+        for index, (note, crc) in enumerate(zip(notes, recorded))
+        if not isinstance(note, dict) or note_checksum(note) != crc
+    ]
+    if not mismatched:
+        return []
+    shown = ",".join(str(index) for index in mismatched[:VERIFY_MAX_NOTE_ERRORS])
+    return [f"note checksum mismatch: {len(mismatched)} notes (indexes {shown})"]
+
+
+def _load_json_payload(data: bytes, errors: list[str]) -> dict[str, object] | None:
+    try:
+        text = data.decode("utf-8")
+    except UnicodeDecodeError as exc:
+        errors.append(f"invalid UTF-8 at byte {exc.start}")
+        return None
+    try:
+        payload = json.loads(text)
+    except json.JSONDecodeError as exc:
+        # A parser that runs out of input at the very end means the file was cut short.
+        if exc.pos >= len(text.rstrip()) or exc.msg.startswith("Unterminated string"):
+            errors.append(f"truncated JSON after {len(data)} bytes")
+        else:
+            errors.append(f"invalid JSON: {exc.msg} at line {exc.lineno} column {exc.colno}")
+        return None
+    if not isinstance(payload, dict):
+        errors.append("schema: top level is not an object")
+        return None
+    return payload
+
+
+def _load_binary_payload(backup_file: Path, errors: list[str]) -> dict[str, object] | None:
+    try:
+        reader = open_binary_backup(backup_file)
+    except (OSError, ValueError) as exc:
+        errors.append(str(exc))
+        return None
+    with reader:
+        if reader.compute_records_sha256() != reader.records_sha256:
+            errors.append("record region checksum mismatch")
+        notes: list[object] = []
+        bad_records: list[int] = []
+        for note_index in range(len(reader)):
+            record, crc = reader.record_bytes(note_index)
+            if zlib.crc32(record) != crc:
+                bad_records.append(note_index)
+                continue
+            try:
+                notes.append(json.loads(record.decode("utf-8")))
+            except ValueError:
+                bad_records.append(note_index)
+        if bad_records:
+            shown = ",".join(str(index) for index in bad_records[:VERIFY_MAX_NOTE_ERRORS])
+            errors.append(f"corrupt records: {len(bad_records)} (indexes {shown})")
+            return None
+        payload = dict(reader.fields)
+        if reader.notes_present:
+            payload["notes"] = notes
+        return payload
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+from keep_backup.metrics import record_phase
+
+
+# Bounded so a slow disk applies backpressure instead of buffering whole snapshots in memory.
+WRITER_QUEUE_MAX_JOBS = 64
+WRITER_MAX_REPORTED_ERRORS = 3
+
+_local = threading.local()
+
+
+class BackgroundWriter:
+    # Runs file writes in submission order on one thread while the run thread drives the browser.
+
+    def __init__(self, max_jobs: int = WRITER_QUEUE_MAX_JOBS) -> None:
+        self._queue: queue.Queue[tuple[str, Callable[[], object]] | None] = queue.Queue(maxsize=max_jobs)
+        self._thread = threading.Thread(target=self._run, name="keep-background-writer", daemon=True)
+        self.errors: list[str] = []
+        self.jobs = 0
+        self.blocked_seconds = 0.0
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def submit(self, label: str, job: Callable[[], object]) -> None:
+        started = time.perf_counter()
+        self._queue.put((label, job))
+        self.blocked_seconds += time.perf_counter() - started
+        self.jobs += 1
+
+    def drain(self) -> None:
+        self._queue.join()
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._thread.join()
+
+    def error_summary(self) -> str:
+        shown = "; ".join(self.errors[:WRITER_MAX_REPORTED_ERRORS])
+        more = len(self.errors) - WRITER_MAX_REPORTED_ERRORS
+        return f"{shown}; and {more} more" if more > 0 else shown
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                label, job = item
+                try:
+                    job()
+                except Exception as exc:  # noqa: BLE001
+                    self.errors.append(f"{label}: {exc}")
+            finally:
+                self._queue.task_done()
+
+
+def active_writer() -> BackgroundWriter | None:
+    return getattr(_local, "writer", None)
+
+
+def submit_write(label: str, job: Callable[[], object]) -> None:
+    # Without an active writer the job runs right away.
+    writer = active_writer()
+    if writer is None:
+        job()
+        return
+    writer.submit(label, job)
+
+
+@contextmanager
+def background_writes(writer: BackgroundWriter | None = None) -> Iterator[BackgroundWriter]:
+    writer = writer or BackgroundWriter()
+    previous = active_writer()
+    writer.start()
+    _local.writer = writer
+    try:
+        yield writer
+    finally:
+        _local.writer = previous
+        drain_started = time.perf_counter()
+        writer.drain()
+        writer.close()
+        record_phase("write_drain", time.perf_counter() - drain_started)
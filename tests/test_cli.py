@@ -1,13 +1,18 @@
 from __future__ import annotations
 
 import unittest
+from contextlib import redirect_stderr
+from io import StringIO
 
 from keep_backup.cli import (
     MODE_BACKUP,
+    MODE_DAEMON,
     MODE_SMOKE_PLAYWRIGHT_FIXTURE,
     MODE_SMOKE_PLAYWRIGHT_LOGIN,
     MODE_SMOKE_PLAYWRIGHT_DOM,
     MODE_PARSE_DOM_SNAPSHOT,
+    MODE_RENDER,
+    MODE_SERVE,
     parse_args,
 )
 
@@ -37,6 +42,41 @@ class CliTests(unittest.TestCase):
         self.assertEqual(str(args.dom_input), "logs/artifacts/a.html")
         self.assertEqual(str(args.dom_output), "backups/out.json")
 
+    def test_parse_args_render_mode_defaults(self) -> None:
+        args = parse_args(["--mode", MODE_RENDER])
+        self.assertEqual(args.mode, MODE_RENDER)
+        self.assertIsNone(args.render_input)
+        self.assertEqual(args.render_page_size, 200)
+
+    def test_parse_args_serve_mode_with_socket(self) -> None:
+        args = parse_args(["--mode", MODE_SERVE, "--job-socket", "/tmp/jobs.sock"])
+        self.assertEqual(args.mode, MODE_SERVE)
+        self.assertEqual(str(args.job_socket), "/tmp/jobs.sock")
+
+    def test_parse_args_daemon_mode_with_schedule(self) -> None:
+        args = parse_args(["--mode", MODE_DAEMON, "--schedule", "0 4 * * 1", "--max-runs", "2"])
+        self.assertEqual(args.mode, MODE_DAEMON)
+        self.assertEqual(args.schedule, "0 4 * * 1")
+        self.assertEqual(args.max_runs, 2)
+
+    def test_parse_args_sharded_harvest(self) -> None:
+        args = parse_args(["--harvest", "sharded", "--shard-pages", "6"])
+        self.assertEqual(args.harvest, "sharded")
+        self.assertEqual(args.shard_pages, 6)
+
+    def test_parse_args_login_check_ttl(self) -> None:
+        self.assertIsNone(parse_args([]).login_check_ttl)
+        self.assertEqual(parse_args(["--login-check-ttl", "0"]).login_check_ttl, 0)
+
+    def test_parse_args_profile_kind(self) -> None:
+        self.assertIsNone(parse_args([]).profile)
+        self.assertEqual(parse_args(["--profile", "mem"]).profile, "mem")
+
+    def test_parse_args_launch_preset_rejects_unknown_names(self) -> None:
+        self.assertEqual(parse_args(["--launch-preset", "minimal"]).launch_preset, "minimal")
+        with redirect_stderr(StringIO()), self.assertRaises(SystemExit):
+            parse_args(["--launch-preset", "tall"])
+
 
 if __name__ == "__main__":
     unittest.main()
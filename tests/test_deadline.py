@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import unittest
+
+from keep_backup.deadline import RunDeadline
+
+
+class DeadlineTests(unittest.TestCase):
+    def test_phases_share_time_left_before_reserve(self) -> None:
+        clock = [0.0]
+        deadline = RunDeadline.after(100, started_at=0.0, clock=lambda: clock[0])
+
+        self.assertEqual(deadline.reserve_seconds, 15.0)
+        navigate = deadline.phase("navigate")
+        self.assertEqual(navigate.remaining_ms(), 25500)
+        clock[0] = 10.0
+        scroll = deadline.phase("scroll")
+        # Scroll shares the remaining 75 s with hydrate at 5:2.
+        self.assertEqual(scroll.remaining_ms(), 53571)
+        self.assertEqual(scroll.cap_ms(1000), 1000)
+        self.assertFalse(deadline.hit)
+
+    def test_exhausted_budget_caps_waits_and_marks_hit(self) -> None:
+        clock = [0.0]
+        deadline = RunDeadline.after(10, started_at=0.0, clock=lambda: clock[0])
+        hydrate = deadline.phase("hydrate")
+        clock[0] = 7.5
+
+        self.assertEqual(hydrate.cap_ms(1000), 500)
+        clock[0] = 9.0
+        self.assertTrue(hydrate.exhausted)
+        self.assertEqual(hydrate.timeout_ms(), 1)
+        hydrate.mark_hit()
+        deadline.mark_hit("scroll")
+        self.assertEqual(deadline.hit_phase, "hydrate")
+
+    def test_rejects_non_positive_deadline(self) -> None:
+        with self.assertRaises(ValueError):
+            RunDeadline.after(0, started_at=0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import json
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from datetime import datetime
+from io import StringIO
+from pathlib import Path
+
+from keep_backup.diff import DIFF_MATCH_ID, DIFF_MATCH_SIMILAR, diff_generations
+from keep_backup.io import RunPaths, write_backup
+from keep_backup.runner import run_diff_with_paths
+
+
+class DiffGenerationsTests(unittest.TestCase):
+    def test_matches_by_id_then_content_then_similarity(self) -> None:
+        old_notes = [
+            {"id": "a", "title": "A", "body": "same"},
+            {"id": "b", "title": "B", "body": "before"},
+            {"title": "Shopping", "body": "milk\neggs\nbread"},
+            {"body": "reordered note  "},
+            {"body": "gone"},
+        ]
+        new_notes = [
+            {"body": "reordered note"},
+            {"id": "b", "title": "B", "body": "after"},
+            {"title": "Shopping", "body": "milk\neggs\nbread\nbutter"},
+            {"id": "a", "title": "A", "body": "same"},
+            {"body": "brand new"},
+        ]
+
+        diff = diff_generations(old_notes, new_notes)
+
+        self.assertEqual(diff.unchanged, 2)
+        self.assertEqual(diff.added, [{"body": "brand new"}])
+        self.assertEqual(diff.removed, [{"body": "gone"}])
+        self.assertEqual(
+            [(old["body"], new["body"], match) for old, new, match in diff.modified],
+            [("before", "after", DIFF_MATCH_ID), ("milk\neggs\nbread", "milk\neggs\nbread\nbutter", DIFF_MATCH_SIMILAR)],
+        )
+
+    def test_run_diff_defaults_to_two_latest_generations_and_writes_json(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp_path = Path(tmp)
+            write_backup(tmp_path / "backups" / "2026-01-01" / "keep.json", datetime(2026, 1, 1), [{"body": "x"}])
+            write_backup(tmp_path / "backups" / "2026-01-02" / "keep.kbk", datetime(2026, 1, 2), [{"body": "x"}, {"body": "y"}])
+            paths = RunPaths(
+                backup_dir=tmp_path / "backups" / "2026-01-03",
+                backup_file=tmp_path / "backups" / "2026-01-03" / "keep.json",
+                log_file=tmp_path / "logs" / "run_2026-01-03_120000.log",
+            )
+
+            stdout = StringIO()
+            with redirect_stdout(stdout):
+                exit_code = run_diff_with_paths(paths=paths, start=datetime(2026, 1, 3, 12), output_format="json")
+
+            self.assertEqual(exit_code, 0)
+            self.assertIn("added=1 removed=0 modified=0 unchanged=1", stdout.getvalue())
+            report = json.loads((tmp_path / "logs" / "artifacts" / "diff_2026-01-03_120000.json").read_text(encoding="utf-8"))
+            self.assertEqual(report["added"], [{"body": "y"}])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import json
+import tempfile
+import unittest
+from datetime import datetime
+from pathlib import Path
+from unittest import mock
+
+from keep_backup import io as io_module
+from keep_backup.io import (
+    convert_generation,
+    find_latest_generation,
+    iter_generation_notes,
+    load_generation,
+    note_identity,
+    open_binary_backup,
+    write_backup,
+    write_binary_backup,
+    write_unchanged_generation,
+)
+
+
+class IoBinaryBackupTests(unittest.TestCase):
+    def test_reader_gives_random_access_by_index_and_id(self) -> None:
+        notes = [{"id": f"note-{index}", "title": f"t{index}", "body": f"body {index}"} for index in range(50)]
+        notes.append({"body": "no id"})
+        with tempfile.TemporaryDirectory() as tmp:
+            backup_file = Path(tmp) / "keep.kbk"
+            write_binary_backup(backup_file, {"scraped_at": "2026-01-01T12:00:00"}, notes)
+
+            with open_binary_backup(backup_file) as reader:
+                self.assertEqual(len(reader), 51)
+                self.assertEqual(reader[7], notes[7])
+                self.assertEqual(reader[-1], {"body": "no id"})
+                self.assertEqual(reader.get_by_id("note-42"), notes[42])
+                self.assertEqual(reader.get_by_id(note_identity({"body": "no id"})), {"body": "no id"})
+                self.assertIsNone(reader.get_by_id("missing"))
+                self.assertEqual(list(reader), notes)
+                self.assertEqual(reader.fields["scraped_at"], "2026-01-01T12:00:00")
+                with self.assertRaises(IndexError):
+                    reader[51]
+
+    def test_convert_round_trip_is_lossless(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp_path = Path(tmp)
+            json_file = tmp_path / "2026-01-01" / "keep.json"
+            write_backup(
+                json_file,
+                datetime(2026, 1, 1, 12, 0, 0),
+                [{"title": "買い物", "body": "牛乳\nパン"}, {"body": "second"}],
+                metadata={"fingerprint": {"digest": "abc"}},
+            )
+            binary_file = tmp_path / "2026-01-01" / "keep.kbk"
+            restored_file = tmp_path / "restored.json"
+
+            self.assertEqual(convert_generation(json_file, binary_file), 2)
+            convert_generation(binary_file, restored_file)
+
+            self.assertEqual(restored_file.read_bytes(), json_file.read_bytes())
+            self.assertEqual(load_generation(binary_file)[1], json.loads(json_file.read_text(encoding="utf-8")))
+
+    def test_reader_rejects_truncated_file(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            backup_file = Path(tmp) / "keep.kbk"
+            write_binary_backup(backup_file, {}, [{"body": "x" * 100}])
+            backup_file.write_bytes(backup_file.read_bytes()[:40])
+            with self.assertRaises(ValueError):
+                open_binary_backup(backup_file)
+
+    def test_find_latest_generation_considers_both_formats(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            write_backup(root / "2026-01-01" / "keep.json", datetime(2026, 1, 1), [{"body": "a"}])
+            write_backup(root / "2026-01-08" / "keep.kbk", datetime(2026, 1, 8), [{"body": "b"}])
+            self.assertEqual(find_latest_generation(root), root / "2026-01-08" / "keep.kbk")
+
+    def test_iter_generation_notes_streams_both_formats_and_follows_unchanged(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            notes = [{"id": f"n{index}", "title": f"t{index}", "body": "本文 " * index} for index in range(50)]
+            json_file = root / "2026-01-01" / "keep.json"
+            write_backup(json_file, datetime(2026, 1, 1), notes, metadata={"notes_count": 12345})
+            binary_file = root / "2026-01-02" / "keep.kbk"
+            convert_generation(json_file, binary_file)
+            unchanged_file = root / "2026-01-08" / "keep.json"
+            write_unchanged_generation(
+                unchanged_file, datetime(2026, 1, 8), based_on=json_file, notes_count=len(notes), fingerprint=None
+            )
+
+            # A tiny chunk size splits values, numbers included, across reads.
+            with mock.patch.object(io_module, "GENERATION_STREAM_CHUNK_CHARS", 7):
+                self.assertEqual(list(iter_generation_notes(json_file)), notes)
+                self.assertEqual(list(iter_generation_notes(unchanged_file)), notes)
+            self.assertEqual(list(iter_generation_notes(binary_file)), notes)
+
+    def test_iter_generation_notes_rejects_truncated_json(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            backup_file = Path(tmp) / "keep.json"
+            write_backup(backup_file, datetime(2026, 1, 1), [{"body": "a"}, {"body": "b"}])
+            backup_file.write_bytes(backup_file.read_bytes()[:-20])
+            with self.assertRaises(ValueError):
+                list(iter_generation_notes(backup_file))
+
+
+if __name__ == "__main__":
+    unittest.main()
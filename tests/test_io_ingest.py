@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import io
+import json
+import tempfile
+import tracemalloc
+import unittest
+from datetime import datetime
+from pathlib import Path
+from unittest import mock
+
+from keep_backup.io import iter_notes_from_file, load_generation_checksums, write_backup
+
+
+class IoIngestTests(unittest.TestCase):
+    def test_streamed_json_matches_json_dump(self) -> None:
+        now = datetime(2026, 1, 1, 12, 0, 0)
+        notes = [{"title": "買い物", "body": "牛乳\n卵"}, {"id": "n-2", "body": "b"}]
+        with tempfile.TemporaryDirectory() as tmp:
+            for case_notes, metadata in ((notes, {"fingerprint": "abc"}), ([], None)):
+                backup_file = Path(tmp) / "keep.json"
+                count = write_backup(backup_file, now, iter(case_notes), metadata=metadata)
+
+                payload: dict[str, object] = {"scraped_at": now.isoformat(), **(metadata or {})}
+                payload["notes"] = case_notes
+                expected = json.dumps(payload, ensure_ascii=False, indent=2) + "\n"
+                self.assertEqual(count, len(case_notes))
+                self.assertEqual(backup_file.read_text(encoding="utf-8"), expected)
+
+    def test_write_backup_peak_memory_stays_flat_as_note_count_grows(self) -> None:
+        now = datetime(2026, 1, 1, 12, 0, 0)
+
+        def peak_bytes(notes_count: int) -> int:
+            with tempfile.TemporaryDirectory() as tmp:
+                backup_file = Path(tmp) / "keep.json"
+                notes = ({"id": f"n-{index}", "body": f"note {index}"} for index in range(notes_count))
+                tracemalloc.start()
+                try:
+                    write_backup(backup_file, now, notes)
+                    peak = tracemalloc.get_traced_memory()[1]
+                finally:
+                    tracemalloc.stop()
+                checksums = load_generation_checksums(backup_file)
+                self.assertEqual(checksums["notes_count"], notes_count)
+                self.assertEqual(len(checksums["note_crc32"]), notes_count)
+            return peak
+
+        # The first run warms json's encoder caches; later peaks only move with gc timing.
+        peak_bytes(4_000)
+        small, large = peak_bytes(4_000), peak_bytes(40_000)
+        # Keeping one CRC per note in memory would add well over 1 MB for the extra 36k notes.
+        self.assertLess(large - small, 512 * 1024)
+
+    def test_iter_notes_reads_ndjson_by_suffix(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            notes_file = Path(tmp) / "notes.ndjson"
+            notes_file.write_text(
+                '{"id": "n1", "title": " t ", "body": "b"}\n\n{"body": "only body"}\n{"title": ""}\n',
+                encoding="utf-8",
+            )
+
+            notes = list(iter_notes_from_file(notes_file))
+
+        self.assertEqual(notes, [{"body": "b", "title": "t", "id": "n1"}, {"body": "only body"}])
+
+    def test_iter_notes_reports_bad_ndjson_line(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            notes_file = Path(tmp) / "notes.txt"
+            notes_file.write_text('{"body": "ok"}\n{broken\n', encoding="utf-8")
+
+            with self.assertRaisesRegex(ValueError, "line 2"):
+                list(iter_notes_from_file(notes_file, "ndjson"))
+
+    def test_iter_notes_reads_stdin_for_dash(self) -> None:
+        stdin = io.TextIOWrapper(io.BytesIO("メモ1\n\nメモ2\n".encode("utf-8")), encoding="utf-8")
+        with mock.patch("sys.stdin", stdin):
+            notes = list(iter_notes_from_file(Path("-")))
+
+        self.assertEqual(notes, [{"body": "メモ1"}, {"body": "メモ2"}])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import io
+import os
+import tempfile
+import threading
+import time
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+
+from keep_backup import client as client_module
+from keep_backup.jobserver import run_captured, serve_jobs, submit_job
+
+
+def _fake_job(argv: list[str]) -> int:
+    if argv[:1] == ["boom"]:
+        raise RuntimeError("job failed")
+    if argv[:1] == ["bad-args"]:
+        raise SystemExit(2)
+    os.environ["KEEP_JOB_TEST_LEAK"] = "1"
+    log_file = Path(argv[1]) if len(argv) > 1 else Path("logs/run_x.log")
+    print(f"summary success=true notes_count=0 duration_seconds=0.0 output=- log_file={log_file}")
+    return int(argv[0])
+
+
+class JobServerTests(unittest.TestCase):
+    def _start_server(self, socket_path: Path, *, max_jobs: int) -> tuple[threading.Thread, list[str], list[int]]:
+        messages: list[str] = []
+        jobs: list[int] = []
+        thread = threading.Thread(
+            target=lambda: jobs.append(serve_jobs(socket_path, _fake_job, log=messages.append, max_jobs=max_jobs)),
+            daemon=True,
+        )
+        thread.start()
+        deadline = time.monotonic() + 5
+        while not socket_path.exists() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return thread, messages, jobs
+
+    def test_serve_jobs_runs_requests_in_order_and_reports_exit_codes(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            socket_path = Path(tmp) / "jobs.sock"
+            thread, messages, jobs = self._start_server(socket_path, max_jobs=3)
+
+            ok = submit_job(socket_path, ["0", "logs/run_a.log"], timeout=5)
+            failed = submit_job(socket_path, ["3"], timeout=5)
+            crashed = submit_job(socket_path, ["boom"], timeout=5)
+            thread.join(timeout=5)
+
+            self.assertEqual(ok.exit_code, 0)
+            self.assertTrue(ok.summary.startswith("summary success=true"))
+            self.assertEqual(ok.log_file, Path("logs/run_a.log"))
+            self.assertEqual(failed.exit_code, 3)
+            self.assertEqual(crashed.exit_code, 1)
+            self.assertIn("error=job failed", crashed.output)
+            self.assertEqual(jobs, [3])
+            self.assertFalse(socket_path.exists())
+            self.assertIn("job-server job=2 exit_code=3", "\n".join(messages))
+
+    def test_run_captured_restores_environment_and_survives_system_exit(self) -> None:
+        os.environ.pop("KEEP_JOB_TEST_LEAK", None)
+        result = run_captured(_fake_job, ["0"])
+        self.assertEqual(result.exit_code, 0)
+        self.assertNotIn("KEEP_JOB_TEST_LEAK", os.environ)
+        self.assertEqual(run_captured(_fake_job, ["bad-args"]).exit_code, 2)
+
+    def test_client_prints_output_and_log_tail(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            socket_path = Path(tmp) / "jobs.sock"
+            log_file = Path(tmp) / "run_1.log"
+            log_file.write_text("line-1\nline-2\nline-3\n", encoding="utf-8")
+            thread, _messages, _jobs = self._start_server(socket_path, max_jobs=1)
+
+            buffer = io.StringIO()
+            with redirect_stdout(buffer):
+                exit_code = client_module.main(
+                    ["--socket", str(socket_path), "--tail-log", "2", "--", "4", str(log_file)]
+                )
+            thread.join(timeout=5)
+
+            output = buffer.getvalue()
+            self.assertEqual(exit_code, 4)
+            self.assertIn("summary success=true", output)
+            self.assertIn(f"# latest_log={log_file}", output)
+            self.assertIn("# log: line-3", output)
+            self.assertNotIn("# log: line-1", output)
+
+    def test_client_reports_unreachable_server(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp, redirect_stdout(io.StringIO()):
+            exit_code = client_module.main(["--socket", str(Path(tmp) / "missing.sock"), "--", "--mode", "verify"])
+        self.assertEqual(exit_code, client_module.CLIENT_EXIT_UNAVAILABLE)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import json
+import unittest
+
+from keep_backup.keep_sync import NetworkNoteCapture, decode_sync_payload, notes_from_sync_nodes
+
+EPOCH = "1970-01-01T00:00:00.000Z"
+
+
+def _node(node_id: str, node_type: str, parent_id: str, **fields: object) -> dict[str, object]:
+    timestamps = {"created": "2026-01-01T00:00:00.000Z", "updated": fields.pop("updated", EPOCH), "trashed": EPOCH}
+    timestamps.update(fields.pop("timestamps", {}))
+    return {"id": node_id, "type": node_type, "parentId": parent_id, "timestamps": timestamps, **fields}
+
+
+class KeepSyncTests(unittest.TestCase):
+    def test_notes_from_sync_nodes_builds_notes_lists_and_skips_trash(self) -> None:
+        nodes = [
+            _node("n1", "NOTE", "root", title="Memo", updated="2026-01-03T00:00:00.000Z"),
+            _node("n1-text", "LIST_ITEM", "n1", text="body text"),
+            _node("l1", "LIST", "root", title="Shopping", updated="2026-01-02T00:00:00.000Z"),
+            _node("l1-a", "LIST_ITEM", "l1", text="milk", sortValue="200", checked=True),
+            _node("l1-b", "LIST_ITEM", "l1", text="eggs", sortValue="100"),
+            _node("t1", "NOTE", "root", title="Old", timestamps={"trashed": "2026-01-01T00:00:00.000Z"}),
+        ]
+
+        notes = notes_from_sync_nodes(nodes)
+
+        self.assertEqual(
+            notes,
+            [
+                {
+                    "body": "body text",
+                    "title": "Memo",
+                    "id": "n1",
+                    "created": "2026-01-01T00:00:00.000Z",
+                    "updated": "2026-01-03T00:00:00.000Z",
+                },
+                {
+                    "body": "[x] milk\n[ ] eggs",
+                    "title": "Shopping",
+                    "id": "l1",
+                    "created": "2026-01-01T00:00:00.000Z",
+                    "updated": "2026-01-02T00:00:00.000Z",
+                },
+            ],
+        )
+
+    def test_capture_waits_for_untruncated_page_and_counts_undecodable(self) -> None:
+        class _Response:
+            def __init__(self, url: str, text: str) -> None:
+                self.url = url
+                self._text = text
+
+            def text(self) -> str:
+                return self._text
+
+        capture = NetworkNoteCapture()
+        first = {"nodes": [_node("n1", "NOTE", "root", text="a")], "truncated": True}
+        capture.handle_response(_Response("https://keep.google.com/static/app.js", "ignored"))
+        capture.handle_response(_Response("https://www.googleapis.com/notes/v1/changes", json.dumps(first)))
+        capture.handle_response(_Response("https://www.googleapis.com/notes/v1/changes", "<html>"))
+        capture.drain()
+        self.assertFalse(capture.complete)
+        self.assertEqual((capture.responses_decoded, capture.responses_failed), (1, 1))
+
+        second = ")]}'\n" + json.dumps({"nodes": [_node("n2", "NOTE", "root", text="b")]})
+        capture.handle_response(_Response("https://www.googleapis.com/notes/v1/changes?x=1", second))
+        capture.drain()
+
+        self.assertTrue(capture.complete)
+        self.assertEqual(sorted(note["id"] for note in capture.notes()), ["n1", "n2"])
+        self.assertIsNone(decode_sync_payload('{"nodes": 3}'))
+
+
+if __name__ == "__main__":
+    unittest.main()
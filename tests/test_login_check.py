@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from keep_backup.login_check import (
+    LOGIN_CHECK_DEFAULT_TTL_SECONDS,
+    LOGIN_CHECK_TTL_ENV,
+    LoginCheckCache,
+    build_login_check_path,
+    load_login_check_ttl,
+)
+
+
+class LoginCheckCacheTests(unittest.TestCase):
+    def _cache(self, tmp: str, now: list[float], **kwargs: object) -> LoginCheckCache:
+        profile_dir = Path("/profiles/main")
+        return LoginCheckCache(
+            build_login_check_path(Path(tmp), profile_dir),
+            profile_dir=profile_dir,
+            ttl_seconds=600,
+            clock=lambda: now[0],
+            **kwargs,
+        )
+
+    def test_recorded_check_is_reused_until_ttl(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            now = [1000.0]
+            cache = self._cache(tmp, now)
+            self.assertEqual(cache.lookup(), (None, "missing"))
+            cache.record(final_url="https://keep.google.com/u/0/", cookie_expires=None)
+
+            now[0] = 1500.0
+            check, reason = cache.lookup()
+            self.assertEqual(reason, "fresh")
+            self.assertEqual(check.final_url, "https://keep.google.com/u/0/")
+            now[0] = 1601.0
+            self.assertEqual(cache.lookup(), (None, "expired_ttl"))
+
+    def test_cookie_expiry_invalidates_before_ttl(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            now = [1000.0]
+            cache = self._cache(tmp, now)
+            cache.record(final_url="https://keep.google.com/", cookie_expires=1100.0)
+            now[0] = 1100.0
+            self.assertEqual(cache.lookup(), (None, "cookie_expired"))
+
+    def test_refresh_cache_never_reuses_and_invalidate_drops_entry(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            now = [1000.0]
+            self._cache(tmp, now).record(final_url="https://keep.google.com/", cookie_expires=None)
+            self.assertEqual(self._cache(tmp, now, reuse=False).lookup(), (None, "refresh"))
+            cache = self._cache(tmp, now)
+            cache.invalidate()
+            self.assertEqual(cache.lookup(), (None, "missing"))
+
+    def test_ttl_comes_from_environment(self) -> None:
+        with mock.patch.dict(os.environ, {LOGIN_CHECK_TTL_ENV: ""}):
+            self.assertEqual(load_login_check_ttl(), LOGIN_CHECK_DEFAULT_TTL_SECONDS)
+        with mock.patch.dict(os.environ, {LOGIN_CHECK_TTL_ENV: "0"}):
+            self.assertEqual(load_login_check_ttl(), 0)
+        with mock.patch.dict(os.environ, {LOGIN_CHECK_TTL_ENV: "soon"}):
+            with self.assertRaises(ValueError):
+                load_login_check_ttl()
+
+
+if __name__ == "__main__":
+    unittest.main()
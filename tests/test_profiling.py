@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import pstats
+import tempfile
+import tracemalloc
+import unittest
+from pathlib import Path
+
+from keep_backup.profiling import PROFILE_CPU, PROFILE_MEM, active_profile, dump_active_profile, profiling
+
+
+def _busy() -> list[str]:
+    return [str(index) * 10 for index in range(20_000)]
+
+
+class ProfilingTests(unittest.TestCase):
+    def test_cpu_profile_writes_pstats_referenced_by_summary_fields(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            with profiling(PROFILE_CPU, artifacts_dir=Path(tmp), stem="2026-01-01_120000") as profile:
+                _busy()
+                fields = dump_active_profile()
+            self.assertEqual(fields["profile"], PROFILE_CPU)
+            self.assertEqual(fields["profile_artifact"], profile.artifact)
+            self.assertEqual(profile.artifact.name, "profile_cpu_2026-01-01_120000.pstats")
+            functions = {name for _, _, name in pstats.Stats(str(profile.artifact)).stats}
+            self.assertIn("_busy", functions)
+            self.assertIsNone(active_profile())
+
+    def test_mem_profile_reports_top_allocation_sites(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            with profiling(PROFILE_MEM, artifacts_dir=Path(tmp), stem="run") as profile:
+                kept = _busy()
+                fields = dump_active_profile()
+            report = profile.artifact.read_text(encoding="utf-8")
+            self.assertTrue(kept)
+            self.assertIn("test_profiling.py", report.splitlines()[2])
+            self.assertIn("profile_peak_mb", fields)
+            self.assertFalse(tracemalloc.is_tracing())
+
+    def test_no_kind_starts_nothing(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            with profiling(None, artifacts_dir=Path(tmp), stem="run") as profile:
+                self.assertIsNone(profile)
+                self.assertEqual(dump_active_profile(), {})
+            self.assertEqual(list(Path(tmp).iterdir()), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
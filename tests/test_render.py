@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import json
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from datetime import datetime
+from io import StringIO
+from pathlib import Path
+
+from keep_backup.io import RunPaths, write_backup
+from keep_backup.render import RENDER_INDEX_FILE_NAME, render_site, search_tokens
+from keep_backup.runner import run_render_with_paths
+
+
+def _notes(count: int, *, prefix: str = "note") -> list[dict[str, str]]:
+    return [{"id": f"{prefix}{index}", "title": f"Title {index}", "body": f"body {index}"} for index in range(count)]
+
+
+def _manifest(site_dir: Path) -> dict[str, object]:
+    text = (site_dir / "manifest.js").read_text(encoding="utf-8")
+    return json.loads(text[len("keepSite.manifest("):-len(");\n")])
+
+
+class RenderSiteTests(unittest.TestCase):
+    def test_search_tokens_use_words_for_ascii_and_bigrams_otherwise(self) -> None:
+        self.assertEqual(search_tokens("Weekly BACKUP a"), {"weekly", "backup"})
+        self.assertEqual(search_tokens("買い物リスト"), {"買い", "い物", "物リ", "リス", "スト"})
+        self.assertEqual(search_tokens("猫"), {"猫"})
+
+    def test_render_splits_notes_into_pages_and_indexes_them(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            site_dir = Path(tmp) / "site"
+            result = render_site(_notes(500), site_dir, generation="2026-01-01", page_size=20)
+
+            manifest = _manifest(site_dir)
+            self.assertEqual(result.notes_count, 500)
+            self.assertEqual(sum(page["count"] for page in manifest["pages"]), 500)
+            self.assertTrue(all(page["count"] <= 40 for page in manifest["pages"]))
+            self.assertEqual(result.pages_written, result.pages)
+            self.assertGreater(result.pages, 5)
+            self.assertTrue((site_dir / RENDER_INDEX_FILE_NAME).exists())
+            search_text = (site_dir / str(manifest["search"])).read_text(encoding="utf-8")
+            self.assertIn('"body":', search_text)
+            self.assertIn('"title":', search_text)
+
+    def test_rerender_rewrites_only_pages_that_changed(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            site_dir = Path(tmp) / "site"
+            notes = _notes(500)
+            render_site(notes, site_dir, generation="2026-01-01", page_size=20)
+
+            unchanged = render_site(notes, site_dir, generation="2026-01-01", page_size=20)
+            self.assertEqual((unchanged.pages_written, unchanged.pages_removed), (0, 0))
+
+            edited = [dict(note) for note in notes]
+            edited[250]["body"] = "edited"
+            after_edit = render_site(edited, site_dir, generation="2026-01-08", page_size=20)
+            self.assertEqual((after_edit.pages_written, after_edit.pages_removed), (1, 1))
+
+            inserted = [{"id": "new", "title": "New", "body": "fresh"}, *edited]
+            after_insert = render_site(inserted, site_dir, generation="2026-01-15", page_size=20)
+            self.assertLessEqual(after_insert.pages_written, 2)
+            self.assertEqual(after_insert.pages_reused, after_insert.pages - after_insert.pages_written)
+            self.assertEqual(len(list((site_dir / "pages").glob("*.js"))), after_insert.pages)
+            self.assertEqual(len(list(site_dir.glob("search_*.js"))), 1)
+
+    def test_run_render_streams_latest_generation_into_site(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp_path = Path(tmp)
+            write_backup(tmp_path / "backups" / "2026-01-01" / "keep.json", datetime(2026, 1, 1), _notes(3))
+            paths = RunPaths(
+                backup_dir=tmp_path / "backups" / "2026-01-03",
+                backup_file=tmp_path / "backups" / "2026-01-03" / "keep.json",
+                log_file=tmp_path / "logs" / "run_2026-01-03_120000.log",
+            )
+            stdout = StringIO()
+            with redirect_stdout(stdout):
+                exit_code = run_render_with_paths(paths=paths, start=datetime(2026, 1, 3, 12, 0, 0))
+
+            self.assertEqual(exit_code, 0)
+            summary = stdout.getvalue()
+            self.assertIn("notes_count=3", summary)
+            self.assertIn(f"output={tmp_path / 'backups' / 'site' / 'index.html'}", summary)
+            self.assertIn("pages_written=1", summary)
+            self.assertEqual(_manifest(tmp_path / "backups" / "site")["generation"], "2026-01-01")
+
+
+if __name__ == "__main__":
+    unittest.main()
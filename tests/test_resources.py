@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from keep_backup.metrics import pop_run_metrics, run_phase
+from keep_backup.resources import ResourceSampler, resource_summary_fields, sample_process_tree
+
+
+def _write_stat(proc_root: Path, pid: int, comm: str, ppid: int, *, cpu_ticks: int, rss_pages: int) -> None:
+    # Fields after "(comm) ": state ppid ... utime(14) stime(15) ... rss(24).
+    fields = ["S", str(ppid)] + ["0"] * 9 + [str(cpu_ticks), "0"] + ["0"] * 8 + [str(rss_pages), "0"]
+    (proc_root / str(pid)).mkdir(parents=True, exist_ok=True)
+    (proc_root / str(pid) / "stat").write_text(f"{pid} ({comm}) {' '.join(fields)}\n", encoding="utf-8")
+
+
+class ResourceSamplingTests(unittest.TestCase):
+    def test_sample_splits_python_and_browser_descendants(self) -> None:
+        ticks = os.sysconf("SC_CLK_TCK")
+        page_size = os.sysconf("SC_PAGE_SIZE")
+        with tempfile.TemporaryDirectory() as tmp:
+            proc_root = Path(tmp)
+            _write_stat(proc_root, 100, "python", 1, cpu_ticks=ticks, rss_pages=10)
+            _write_stat(proc_root, 101, "node", 100, cpu_ticks=ticks, rss_pages=5)
+            _write_stat(proc_root, 102, "chrome (renderer)", 101, cpu_ticks=2 * ticks, rss_pages=20)
+            _write_stat(proc_root, 103, "python", 100, cpu_ticks=0, rss_pages=7)
+            _write_stat(proc_root, 104, "node", 100, cpu_ticks=0, rss_pages=3)
+            _write_stat(proc_root, 200, "chrome", 1, cpu_ticks=ticks, rss_pages=99)
+
+            sample = sample_process_tree(100, proc_root)
+
+        # The driver (node, parent of chrome) counts as browser; an unrelated node child does not.
+        self.assertEqual(sample.python_rss, 20 * page_size)
+        self.assertEqual(sample.browser_rss, 25 * page_size)
+        self.assertAlmostEqual(sample.python_cpu, 1.0)
+        self.assertAlmostEqual(sample.browser_cpu, 3.0)
+
+    def test_samples_are_attributed_to_the_active_phase(self) -> None:
+        ticks = os.sysconf("SC_CLK_TCK")
+        with tempfile.TemporaryDirectory() as tmp:
+            proc_root = Path(tmp)
+            _write_stat(proc_root, 100, "python", 1, cpu_ticks=0, rss_pages=10)
+            pop_run_metrics()
+            sampler = ResourceSampler(1.0, root_pid=100, proc_root=proc_root)
+            sampler.sample_once()
+            _write_stat(proc_root, 100, "python", 1, cpu_ticks=ticks, rss_pages=30)
+            with run_phase("scroll"):
+                sampler.sample_once()
+
+            resources = pop_run_metrics().resources
+
+        self.assertEqual(sorted(resources), ["other", "scroll"])
+        self.assertAlmostEqual(resources["scroll"].python_cpu_seconds, 1.0)
+        fields = resource_summary_fields(resources)
+        self.assertEqual(fields["python_cpu_seconds"], "1.00")
+        self.assertEqual(resources["scroll"].python_rss_peak, 30 * os.sysconf("SC_PAGE_SIZE"))
+        self.assertIn("browser_rss_avg_mb", fields)
+
+
+if __name__ == "__main__":
+    unittest.main()
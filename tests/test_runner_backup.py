@@ -4,16 +4,37 @@ import json
 import os
 import tempfile
 import unittest
-from contextlib import redirect_stdout
-from datetime import datetime
+from contextlib import contextmanager, redirect_stdout
+from unittest import mock
+from datetime import datetime, timedelta
 from io import StringIO
 from pathlib import Path
+from typing import Iterator
 
 import keep_backup.runner as runner_module
-from keep_backup.io import RunPaths
+from keep_backup.io import (
+    RunPaths,
+    evict_cache_files,
+    load_checkpoint,
+    load_generation,
+    write_backup,
+    write_checkpoint,
+)
+from keep_backup.deadline import RunDeadline
+from keep_backup.metrics import pop_run_metrics
+from keep_backup.selector_registry import load_selector_stats
 from keep_backup.runner import (
+    ChangeProbe,
+    _probe_reports_unchanged,
+    _build_checkpoint_path,
+    _collect_keep_notes_for_backup,
     _extract_note_payloads,
-    build_notes,
+    _discover_harvest_shards,
+    _harvest_shards,
+    _hydrate_truncated_notes,
+    _merge_notes,
+    _merge_shard_notes,
+    iter_manual_notes,
     load_keep_profile_dir,
     run_backup_with_paths,
     run_parse_dom_with_paths,
@@ -32,6 +53,53 @@ class _FakeExtractPage:
         return self._notes
 
 
+class _FakeKeepPage:
+    class _FakeMouse:
+        def wheel(self, _: int, __: int) -> None:
+            return None
+
+    class _FakeLocator:
+        def __init__(self, count_value: int) -> None:
+            self._count_value = count_value
+
+        def count(self) -> int:
+            return self._count_value
+
+    def __init__(self, notes: list[dict[str, str]], *, lang: str = "en-US") -> None:
+        self.url = "about:blank"
+        self.mouse = self._FakeMouse()
+        self.scripts: list[str] = []
+        self._notes = notes
+        self._lang = lang
+
+    def goto(self, url: str, wait_until: str) -> None:  # noqa: ARG002
+        self.url = "https://keep.google.com/u/0/"
+
+    def wait_for_timeout(self, _: int) -> None:
+        return None
+
+    def title(self) -> str:
+        return "Google Keep"
+
+    def content(self) -> str:
+        return "<html><body>keep</body></html>"
+
+    def locator(self, _: str) -> "_FakeKeepPage._FakeLocator":
+        return self._FakeLocator(len(self._notes))
+
+    def evaluate(self, script: str, arg: object = None) -> object:
+        self.scripts.append(script)
+        if script == "document.readyState":
+            return "complete"
+        if "navigator.language" in script:
+            return self._lang
+        if "getBoundingClientRect" in script:
+            return [note["body"] for note in self._notes]
+        if isinstance(arg, list):
+            return [1 if selector in ('[role="listitem"]', '[aria-label="Note"]') else 0 for selector in arg]
+        return self._notes
+
+
 class RunnerBackupTests(unittest.TestCase):
 
     def test_load_keep_profile_dir_reads_host_variable_as_fallback(self) -> None:
@@ -52,9 +120,9 @@ class RunnerBackupTests(unittest.TestCase):
             else:
                 os.environ.pop("KEEP_BROWSER_PROFILE_DIR_HOST", None)
 
-    def test_build_notes_raises_when_no_inputs(self) -> None:
+    def test_iter_manual_notes_raises_when_no_inputs(self) -> None:
         with self.assertRaises(ValueError):
-            build_notes([], None)
+            iter_manual_notes([], None)
 
     def test_run_playwright_keep_login_smoke_requires_profile_dir(self) -> None:
         original_main = os.environ.pop("KEEP_BROWSER_PROFILE_DIR", None)
@@ -89,6 +157,49 @@ class RunnerBackupTests(unittest.TestCase):
         self.assertEqual(notes[2], {"title": "ignored", "body": ""})
         self.assertEqual(len(notes), 3)
 
+    def test_extract_note_payloads_collects_truncated_cards_for_hydration(self) -> None:
+        page = _FakeExtractPage(
+            [
+                {"title": "short", "body": "done", "truncated": False, "href": ""},
+                {"title": "", "body": "   ", "truncated": True, "href": "https://keep.google.com/#NOTE/skip"},
+                {"title": "long", "body": "first lines…", "truncated": True, "href": "https://keep.google.com/#NOTE/a"},
+            ]
+        )
+        targets: list[tuple[int, str]] = []
+
+        notes = _extract_note_payloads(page, hydration_targets=targets)
+
+        self.assertEqual(notes, [{"title": "short", "body": "done"}, {"title": "long", "body": "first lines…"}])
+        self.assertEqual(targets, [(1, "https://keep.google.com/#NOTE/a")])
+        self.assertIn("looksTruncated", page.last_script)
+
+    def test_extract_note_payloads_credits_only_selectors_that_produced_kept_notes(self) -> None:
+        page = _FakeExtractPage(
+            [
+                {
+                    "title": "kept",
+                    "body": "b",
+                    "selectors": {"card": ["c1", "c2"], "title": "t2", "body": "b1"},
+                    "missed": {"title": ["t1"], "body": []},
+                },
+                {
+                    "title": "",
+                    "body": "only-fallback",
+                    "selectors": {"card": ["c2"], "title": "", "body": "b2"},
+                    "missed": {"title": ["t1", "t2"], "body": ["b1"]},
+                },
+                {"title": "", "body": "", "selectors": {"card": ["c1"], "title": "", "body": ""}},
+            ]
+        )
+        hits: dict[str, dict[str, int]] = {}
+
+        _extract_note_payloads(page, selector_hits=hits)
+
+        self.assertEqual(hits["card"], {"c1": 1, "c2": 2})
+        self.assertEqual(hits["title"], {"t1": 0, "t2": 1})
+        self.assertEqual(hits["body"], {"b1": 1, "b2": 1})
+        self.assertIn("cardSelectorsOf.get(card)", page.last_script)
+
     def test_extract_note_payloads_uses_escaped_newline_in_eval_script(self) -> None:
         page = _FakeExtractPage([])
         _extract_note_payloads(page)
@@ -170,7 +281,7 @@ class RunnerBackupTests(unittest.TestCase):
             )
 
             original_collector = runner_module._collect_keep_notes_for_backup
-            runner_module._collect_keep_notes_for_backup = lambda _log: [
+            runner_module._collect_keep_notes_for_backup = lambda _log, **_kwargs: [
                 {"title": "auto", "body": "from keep"}
             ]
             try:
@@ -234,6 +345,35 @@ class RunnerBackupTests(unittest.TestCase):
                 os.chdir(cwd)
             self.assertEqual(resolved.name, second.name)
 
+    def test_older_dom_snapshots_are_rebuilt_from_history(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp_path = Path(tmp)
+            cwd = Path.cwd()
+            try:
+                os.chdir(tmp_path)
+                artifacts_dir = Path("logs") / "artifacts"
+                artifacts_dir.mkdir(parents=True, exist_ok=True)
+                log_file = Path("logs") / "run_2026-01-02_020202.log"
+                first = artifacts_dir / "dom_snapshot_2026-01-01_010101.html"
+                second = artifacts_dir / "dom_snapshot_2026-01-02_020202.html"
+                first_html = "<html><body>" + "<div class='note'>same</div>" * 200 + "</body></html>"
+                runner_module._store_dom_snapshot(first, first_html.encode("utf-8"), log_file=log_file)
+                runner_module._store_dom_snapshot(
+                    second, first_html.replace("</body>", "<p>new</p></body>").encode("utf-8"), log_file=log_file
+                )
+                first_exists = first.exists()
+                latest = _resolve_dom_snapshot_input(None)
+                restored = _resolve_dom_snapshot_input(first)
+                restored_html = restored.read_text(encoding="utf-8")
+                log_text = log_file.read_text(encoding="utf-8")
+            finally:
+                os.chdir(cwd)
+            self.assertFalse(first_exists)
+            self.assertEqual(latest, second)
+            self.assertEqual(restored_html, first_html)
+            self.assertIn("dom_history kind=delta", log_text)
+            self.assertIn("pruned=1", log_text)
+
     def test_run_parse_dom_with_paths_writes_backup(self) -> None:
         with tempfile.TemporaryDirectory() as tmp:
             tmp_path = Path(tmp)
@@ -266,6 +406,627 @@ class RunnerBackupTests(unittest.TestCase):
             payload = json.loads(dom_output.read_text(encoding="utf-8"))
             self.assertEqual(payload["notes"], [{"title": "from-dom", "body": "parsed"}])
 
+    def test_merge_notes_appends_only_unseen_notes(self) -> None:
+        merged = _merge_notes(
+            [{"title": "a", "body": "1"}, {"body": "2"}],
+            [{"body": "2"}, {"title": "c", "body": "3"}],
+        )
+        self.assertEqual(
+            merged,
+            [{"title": "a", "body": "1"}, {"body": "2"}, {"title": "c", "body": "3"}],
+        )
+
+    def test_collect_keep_notes_resume_from_complete_checkpoint_skips_browser(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp_path = Path(tmp)
+            log_file = tmp_path / "logs" / "run_2026-01-01_120000.log"
+            profile_dir = tmp_path / "profile"
+            write_checkpoint(
+                _build_checkpoint_path(log_file),
+                {
+                    "saved_at": datetime.now().isoformat(),
+                    "profile_dir": str(profile_dir),
+                    "scroll_iterations": 6,
+                    "cards_count": 40,
+                    "complete": True,
+                    "elapsed_seconds": 21.5,
+                    "notes": [{"title": "kept", "body": "from checkpoint"}],
+                },
+            )
+
+            def fail_open(*_args: object, **_kwargs: object) -> None:
+                raise AssertionError("browser must not be opened for a complete checkpoint")
+
+            with mock.patch.dict(os.environ, {"KEEP_BROWSER_PROFILE_DIR": str(profile_dir)}):
+                with mock.patch.object(runner_module, "_open_playwright_page", fail_open):
+                    notes = _collect_keep_notes_for_backup(log_file, resume=True)
+
+            self.assertEqual(notes, [{"title": "kept", "body": "from checkpoint"}])
+            log_text = log_file.read_text(encoding="utf-8")
+            self.assertIn("backup resume seeded_notes=1 skipped_scroll_iterations=6", log_text)
+            self.assertIn("saved_seconds_estimate=21.50", log_text)
+
+    def test_collect_keep_notes_resume_ignores_checkpoint_for_other_profile(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp_path = Path(tmp)
+            log_file = tmp_path / "logs" / "run_2026-01-01_120000.log"
+            write_checkpoint(
+                _build_checkpoint_path(log_file),
+                {
+                    "saved_at": datetime.now().isoformat(),
+                    "profile_dir": str(tmp_path / "other-profile"),
+                    "scroll_iterations": 3,
+                    "complete": True,
+                    "notes": [{"body": "other account"}],
+                },
+            )
+
+            def stop_open(*_args: object, **_kwargs: object) -> None:
+                raise RuntimeError("browser opened")
+
+            with mock.patch.dict(os.environ, {"KEEP_BROWSER_PROFILE_DIR": str(tmp_path / "profile")}):
+                with mock.patch.object(runner_module, "_open_playwright_page", stop_open):
+                    with self.assertRaisesRegex(RuntimeError, "browser opened"):
+                        _collect_keep_notes_for_backup(log_file, resume=True)
+
+            log_text = log_file.read_text(encoding="utf-8")
+            self.assertIn("checkpoint=ignored reason=profile_mismatch", log_text)
+
+    def test_run_backup_with_paths_clears_checkpoint_after_keep_backup(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp_path = Path(tmp)
+            start = datetime(2026, 1, 1, 12, 0, 0)
+            paths = RunPaths(
+                backup_dir=tmp_path / "backups" / "2026-01-01",
+                backup_file=tmp_path / "backups" / "2026-01-01" / "keep.json",
+                log_file=tmp_path / "logs" / "run_2026-01-01_120000.log",
+            )
+            checkpoint_path = _build_checkpoint_path(paths.log_file)
+            write_checkpoint(checkpoint_path, {"notes": []})
+
+            with mock.patch.object(
+                runner_module,
+                "_collect_keep_notes_for_backup",
+                lambda _log, **_kwargs: [{"body": "from keep"}],
+            ):
+                with redirect_stdout(StringIO()):
+                    exit_code = run_backup_with_paths([], None, paths, start, resume=True)
+
+            self.assertEqual(exit_code, 0)
+            self.assertIsNone(load_checkpoint(checkpoint_path))
+
+    def _change_probe(self, **overrides: object) -> ChangeProbe:
+        values: dict[str, object] = {
+            "previous_file": Path("backups/2026-01-01/keep.json"),
+            "previous_fingerprint": {"digest": "abc"},
+            "previous_scraped_at": datetime.now() - timedelta(days=7),
+            "force_full": False,
+            "max_skip_age": timedelta(days=28),
+            "fingerprint": {"digest": "abc", "visible_count": 4},
+        }
+        values.update(overrides)
+        return ChangeProbe(**values)  # type: ignore[arg-type]
+
+    def test_probe_reports_unchanged_when_fingerprint_matches(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            log_file = Path(tmp) / "run.log"
+            probe = self._change_probe()
+            self.assertTrue(_probe_reports_unchanged(probe, log_file=log_file))
+            self.assertTrue(probe.unchanged)
+            self.assertIn("result=skip reason=unchanged", log_file.read_text(encoding="utf-8"))
+
+    def test_probe_runs_full_harvest_when_forced_changed_or_too_old(self) -> None:
+        cases = {
+            "force_full": {"force_full": True},
+            "changed": {"fingerprint": {"digest": "def"}},
+            "max_skip_age": {"previous_scraped_at": datetime.now() - timedelta(days=40)},
+            "no_previous_fingerprint": {"previous_fingerprint": None},
+        }
+        for reason, overrides in cases.items():
+            with self.subTest(reason=reason), tempfile.TemporaryDirectory() as tmp:
+                log_file = Path(tmp) / "run.log"
+                probe = self._change_probe(**overrides)
+                self.assertFalse(_probe_reports_unchanged(probe, log_file=log_file))
+                self.assertIn(f"result=full reason={reason}", log_file.read_text(encoding="utf-8"))
+
+    def test_run_backup_with_paths_records_no_change_generation(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp_path = Path(tmp)
+            previous_file = tmp_path / "backups" / "2026-01-01" / "keep.json"
+            write_backup(
+                previous_file,
+                datetime.now() - timedelta(days=7),
+                [{"body": "a"}, {"body": "b"}],
+                metadata={"fingerprint": {"digest": "abc"}},
+            )
+            start = datetime(2026, 1, 8, 12, 0, 0)
+            paths = RunPaths(
+                backup_dir=tmp_path / "backups" / "2026-01-08",
+                backup_file=tmp_path / "backups" / "2026-01-08" / "keep.json",
+                log_file=tmp_path / "logs" / "run_2026-01-08_120000.log",
+            )
+
+            def fake_collect(_log: Path, *, change_probe: ChangeProbe, **_kwargs: object) -> list[dict[str, str]]:
+                change_probe.fingerprint = {"digest": "abc"}
+                _probe_reports_unchanged(change_probe, log_file=paths.log_file)
+                return []
+
+            stdout = StringIO()
+            with mock.patch.object(runner_module, "_collect_keep_notes_for_backup", fake_collect):
+                with redirect_stdout(stdout):
+                    exit_code = run_backup_with_paths([], None, paths, start)
+
+            self.assertEqual(exit_code, 0)
+            self.assertIn("notes_count=2", stdout.getvalue())
+            pointer = json.loads(paths.backup_file.read_text(encoding="utf-8"))
+            self.assertEqual(pointer["unchanged_since"], os.path.join("..", "2026-01-01", "keep.json"))
+            self.assertEqual(pointer["notes_count"], 2)
+            resolved_file, payload = load_generation(paths.backup_file, follow_unchanged=True)
+            self.assertEqual(resolved_file, previous_file)
+            self.assertEqual(payload["notes"], [{"body": "a"}, {"body": "b"}])
+
+    def test_run_parse_dom_with_paths_reuses_cached_result(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp_path = Path(tmp)
+            start = datetime(2026, 1, 1, 12, 0, 0)
+            paths = RunPaths(
+                backup_dir=tmp_path / "backups" / "2026-01-01",
+                backup_file=tmp_path / "backups" / "2026-01-01" / "keep.json",
+                log_file=tmp_path / "logs" / "run_2026-01-01_120000.log",
+            )
+            dom_input = tmp_path / "logs" / "artifacts" / "dom_snapshot_x.html"
+            dom_input.parent.mkdir(parents=True, exist_ok=True)
+            dom_input.write_text("<html>cached</html>", encoding="utf-8")
+            calls: list[Path] = []
+
+            def fake_extract(dom: Path, *, log_file: Path) -> list[dict[str, str]]:  # noqa: ARG001
+                calls.append(dom)
+                return [{"title": "from-dom", "body": "parsed"}]
+
+            outputs = []
+            with mock.patch.object(runner_module, "_extract_notes_from_dom_snapshot", fake_extract):
+                for _ in range(2):
+                    stdout = StringIO()
+                    with redirect_stdout(stdout):
+                        exit_code = run_parse_dom_with_paths(
+                            paths=paths,
+                            start=start,
+                            dom_input=dom_input,
+                            dom_output=tmp_path / "parsed.json",
+                        )
+                    self.assertEqual(exit_code, 0)
+                    outputs.append(stdout.getvalue())
+                with mock.patch.object(runner_module, "NOTE_PAYLOADS_EXTRACTOR_VERSION", 999):
+                    with redirect_stdout(StringIO()) as stdout:
+                        run_parse_dom_with_paths(
+                            paths=paths,
+                            start=start,
+                            dom_input=dom_input,
+                            dom_output=tmp_path / "parsed.json",
+                        )
+                    outputs.append(stdout.getvalue())
+
+            self.assertEqual(len(calls), 2)
+            self.assertIn("cache=miss", outputs[0])
+            self.assertIn("cache=hit", outputs[1])
+            self.assertIn("cache=miss", outputs[2])
+            payload = json.loads((tmp_path / "parsed.json").read_text(encoding="utf-8"))
+            self.assertEqual(payload["notes"], [{"title": "from-dom", "body": "parsed"}])
+
+    def test_evict_cache_files_drops_oldest_entries_over_budget(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            cache_dir = Path(tmp)
+            for index, name in enumerate(["old", "mid", "new"]):
+                path = cache_dir / f"{name}.json"
+                path.write_text("x" * 100, encoding="utf-8")
+                os.utime(path, (1_000 + index, 1_000 + index))
+
+            evicted = evict_cache_files(cache_dir, max_bytes=150)
+
+            self.assertEqual([path.name for path in evicted], ["old.json", "mid.json"])
+            self.assertEqual(sorted(path.name for path in cache_dir.glob("*.json")), ["new.json"])
+
+    def test_collect_keep_notes_records_selector_stats_and_checkpoint(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp_path = Path(tmp)
+            log_file = tmp_path / "logs" / "run_2026-01-01_120000.log"
+            page = _FakeKeepPage(
+                [
+                    {
+                        "title": "t",
+                        "body": "b",
+                        "selectors": {"card": ['[role="listitem"]'], "title": ".note .title", "body": ".note .body"},
+                        "missed": {"title": ['[aria-label="Title"]'], "body": []},
+                    }
+                ]
+            )
+
+            @contextmanager
+            def fake_open(_log_file: Path, _profile_dir: Path | None) -> Iterator[object]:
+                yield page
+
+            with mock.patch.dict(os.environ, {"KEEP_BROWSER_PROFILE_DIR": str(tmp_path / "profile")}):
+                with mock.patch.object(runner_module, "_open_playwright_page", fake_open):
+                    notes = _collect_keep_notes_for_backup(log_file)
+
+            self.assertEqual(notes, [{"title": "t", "body": "b"}])
+            stats = load_selector_stats(log_file.parent / "selector_stats.json")
+            selectors = stats["locales"]["en"]["selectors"]
+            self.assertEqual(selectors['card|[role="listitem"]']["runs_matched"], 1)
+            self.assertEqual(selectors["title|.note .title"]["runs_matched"], 1)
+            # Tried on the card without result: a miss. Located no kept card: a miss. Never reached: unseen.
+            self.assertEqual(selectors['title|[aria-label="Title"]']["consecutive_misses"], 1)
+            self.assertEqual(selectors["card|.notes-container .IZ65Hb-n0tgWb"]["consecutive_misses"], 1)
+            self.assertNotIn('title|[data-testid="note-title"]', selectors)
+            notes_script = [script for script in page.scripts if "genericLabels" in script][-1]
+            card_selectors = notes_script.split("const cardSelectors")[1].split("];")[0]
+            self.assertIn('[aria-label="Select note"]', card_selectors)
+            self.assertNotIn('[aria-label="メモを選択"]', card_selectors)
+            checkpoint = load_checkpoint(_build_checkpoint_path(log_file))
+            self.assertTrue(checkpoint["complete"])
+            log_text = log_file.read_text(encoding="utf-8")
+            self.assertIn("backup selectors locale=en", log_text)
+            self.assertIn("backup selector_stats matched=", log_text)
+
+
+    def test_collect_keep_notes_network_harvest_skips_scroll(self) -> None:
+        sync_body = json.dumps(
+            {
+                "nodes": [
+                    {"id": "n1", "type": "NOTE", "parentId": "root", "title": "t", "text": "from sync"},
+                ]
+            }
+        )
+
+        class _SyncResponse:
+            url = "https://www.googleapis.com/notes/v1/changes"
+
+            def text(self) -> str:
+                return sync_body
+
+        class _NetworkPage(_FakeKeepPage):
+            def __init__(self) -> None:
+                super().__init__([{"title": "t", "body": "from dom"}])
+                self.listeners: list[object] = []
+                self.waits: list[int] = []
+
+            def wait_for_timeout(self, timeout_ms: int) -> None:
+                self.waits.append(timeout_ms)
+
+            def wait_for_selector(self, _selector: str, timeout: int) -> None:  # noqa: ARG002
+                return None
+
+            def on(self, _event: str, listener: object) -> None:
+                self.listeners.append(listener)
+
+            def remove_listener(self, _event: str, listener: object) -> None:
+                self.listeners.remove(listener)
+
+            def goto(self, url: str, wait_until: str) -> None:
+                super().goto(url, wait_until)
+                for listener in self.listeners:
+                    listener(_SyncResponse())
+
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp_path = Path(tmp)
+            log_file = tmp_path / "logs" / "run_2026-01-01_120000.log"
+            page = _NetworkPage()
+
+            with mock.patch.dict(os.environ, {"KEEP_BROWSER_PROFILE_DIR": str(tmp_path / "profile")}):
+                notes = _collect_keep_notes_for_backup(log_file, page=page, harvest="network")
+
+            self.assertEqual(notes, [{"body": "from sync", "title": "t", "id": "n1"}])
+            self.assertEqual(page.listeners, [])
+            self.assertFalse(any("genericLabels" in script for script in page.scripts))
+            log_text = log_file.read_text(encoding="utf-8")
+            self.assertIn("backup network_capture complete=true responses=1", log_text)
+            self.assertIn("source=network", log_text)
+            self.assertIn("playwright smoke settle=deferred", log_text)
+            self.assertNotIn(runner_module.PLAYWRIGHT_PAGE_SETTLE_MS, page.waits)
+            self.assertTrue(list((log_file.parent / "artifacts").glob("dom_snapshot_*.html")))
+
+    def test_collect_keep_notes_deadline_cuts_scroll_and_saves_partial_checkpoint(self) -> None:
+        clock = [0.0]
+
+        class _SlowPage(_FakeKeepPage):
+            def __init__(self) -> None:
+                super().__init__([{"title": "t", "body": "b"}])
+                self.waits: list[int] = []
+                self.goto_timeouts: list[int] = []
+                self._cards = 0
+
+            def goto(self, url: str, wait_until: str, timeout: int = 0) -> None:
+                self.goto_timeouts.append(timeout)
+                super().goto(url, wait_until)
+
+            def wait_for_timeout(self, timeout_ms: int) -> None:
+                self.waits.append(timeout_ms)
+                clock[0] += timeout_ms / 1000
+
+            def locator(self, _: str) -> "_FakeKeepPage._FakeLocator":
+                # Keep loading more cards forever so only the deadline ends the scroll.
+                self._cards += 1
+                return self._FakeLocator(self._cards)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp_path = Path(tmp)
+            log_file = tmp_path / "logs" / "run_2026-01-01_120000.log"
+            page = _SlowPage()
+            deadline = RunDeadline.after(20, started_at=0.0, clock=lambda: clock[0])
+
+            with mock.patch.dict(os.environ, {"KEEP_BROWSER_PROFILE_DIR": str(tmp_path / "profile")}):
+                with self.assertRaisesRegex(RuntimeError, "deadline reached during scroll"):
+                    _collect_keep_notes_for_backup(log_file, page=page, deadline=deadline)
+
+            self.assertEqual(deadline.hit_phase, "scroll")
+            # 20 s minus a 4 s reserve: navigate gets 3/10 of 16 s, so the 10 s settle shrinks to 4.8 s.
+            self.assertEqual(page.goto_timeouts, [4800])
+            self.assertEqual(page.waits[0], 4800)
+            self.assertLessEqual(clock[0], 16.0)
+            checkpoint = load_checkpoint(_build_checkpoint_path(log_file))
+            self.assertFalse(checkpoint["complete"])
+            self.assertEqual(checkpoint["notes"], [{"title": "t", "body": "b"}])
+            self.assertTrue(any((log_file.parent / "artifacts").glob("dom_snapshot_*.html")))
+            log_text = log_file.read_text(encoding="utf-8")
+            self.assertIn("settle_ms=4800 shortened_by=deadline", log_text)
+            self.assertIn("scroll stopped_by=deadline", log_text)
+
+    def test_run_backup_with_paths_reports_deadline_hit_in_summary(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp_path = Path(tmp)
+            paths = RunPaths(
+                backup_dir=tmp_path / "backups" / "2026-01-01",
+                backup_file=tmp_path / "backups" / "2026-01-01" / "keep.json",
+                log_file=tmp_path / "logs" / "run_2026-01-01_120000.log",
+            )
+
+            def out_of_time(_log: Path, **kwargs: object) -> list[dict[str, str]]:
+                kwargs["deadline"].mark_hit("scroll")
+                raise RuntimeError("deadline reached during scroll")
+
+            stdout = StringIO()
+            with mock.patch.object(runner_module, "_collect_keep_notes_for_backup", out_of_time), \
+                    redirect_stdout(stdout):
+                exit_code = run_backup_with_paths([], None, paths, datetime.now(), deadline_seconds=60)
+
+            self.assertEqual(exit_code, 1)
+            self.assertIn("deadline_hit=true deadline_phase=scroll", stdout.getvalue())
+            self.assertFalse(paths.backup_file.exists())
+
+    def test_run_backup_with_paths_surfaces_background_write_errors(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp_path = Path(tmp)
+            paths = RunPaths(
+                backup_dir=tmp_path / "backups" / "2026-01-01",
+                backup_file=tmp_path / "backups" / "2026-01-01" / "keep.json",
+                log_file=tmp_path / "logs" / "run_2026-01-01_120000.log",
+            )
+            checkpoint_path = _build_checkpoint_path(paths.log_file)
+            write_checkpoint(checkpoint_path, {"notes": [{"body": "from keep"}]})
+
+            def disk_full(*_args: object, **_kwargs: object) -> int:
+                raise OSError("No space left on device")
+
+            stdout = StringIO()
+            with mock.patch.object(
+                runner_module,
+                "_collect_keep_notes_for_backup",
+                lambda _log, **_kwargs: [{"body": "from keep"}],
+            ), mock.patch.object(runner_module, "write_backup", disk_full), redirect_stdout(stdout):
+                exit_code = run_backup_with_paths([], None, paths, datetime(2026, 1, 1, 12, 0, 0))
+
+            output = stdout.getvalue()
+            self.assertEqual(exit_code, 1)
+            self.assertIn("summary success=false", output)
+            self.assertIn("write_errors=1", output)
+            self.assertIn("error=background writes failed: backup", output)
+            self.assertIsNotNone(load_checkpoint(checkpoint_path))
+
+    def test_hydrate_truncated_notes_keeps_pool_pages_loading_ahead(self) -> None:
+        events: list[tuple[str, str]] = []
+        full_bodies = {
+            "https://keep.google.com/#NOTE/a": "a full body",
+            "https://keep.google.com/#NOTE/b": "b full body",
+            "https://keep.google.com/#NOTE/c": "",
+        }
+
+        class _PoolPage:
+            def __init__(self) -> None:
+                self.url = ""
+                self.closed = False
+
+            def goto(self, url: str, wait_until: str) -> None:
+                self.url = url
+                events.append((f"goto:{wait_until}", url))
+
+            def wait_for_selector(self, selector: str, timeout: int) -> None:  # noqa: ARG002
+                events.append(("wait", self.url))
+
+            def evaluate(self, _script: str, arg: dict[str, object]) -> dict[str, str]:
+                events.append(("read", str(arg["editorSelector"])))
+                return {"title": "", "body": full_bodies[self.url]}
+
+            def close(self) -> None:
+                self.closed = True
+
+        class _Context:
+            def __init__(self) -> None:
+                self.pages: list[_PoolPage] = []
+
+            def new_page(self) -> _PoolPage:
+                self.pages.append(_PoolPage())
+                return self.pages[-1]
+
+        class _GridPage:
+            context = _Context()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            log_file = Path(tmp) / "logs" / "run.log"
+            notes = [{"body": "a…"}, {"body": "short"}, {"body": "b…"}, {"body": "c…"}, {"body": "d…"}]
+            targets = [
+                (0, "https://keep.google.com/#NOTE/a"),
+                (2, "https://keep.google.com/#NOTE/b"),
+                (3, "https://keep.google.com/#NOTE/c"),
+                (4, ""),
+            ]
+
+            hydrated = _hydrate_truncated_notes(
+                _GridPage(),
+                notes,
+                targets,
+                log_file=log_file,
+                plan=runner_module.default_plan(),
+                pool_size=2,
+            )
+
+            self.assertEqual(hydrated, 2)
+            self.assertEqual(notes[0], {"body": "a full body"})
+            self.assertEqual(notes[2], {"body": "b full body"})
+            self.assertEqual(notes[3], {"body": "c…"})
+            self.assertEqual(
+                [kind for kind, _ in events],
+                ["goto:commit", "goto:commit", "wait", "read", "goto:commit", "wait", "read", "wait", "read"],
+            )
+            self.assertEqual(len(_GridPage.context.pages), 2)
+            self.assertTrue(all(page.closed for page in _GridPage.context.pages))
+            log_text = log_file.read_text(encoding="utf-8")
+            self.assertIn("backup hydration candidates=4 hydrated=2 failed=0 unlinked=1 skipped=0 pool=2", log_text)
+            self.assertIn("notes_per_second=", log_text)
+            self.assertEqual(pop_run_metrics().values["hydrated_notes"], 2)
+
+    def test_hydrate_truncated_notes_marks_the_deadline_hit_when_it_runs_out(self) -> None:
+        clock = [0.0]
+
+        class _PoolPage:
+            url = ""
+
+            def goto(self, url: str, wait_until: str) -> None:  # noqa: ARG002
+                self.url = url
+
+            def wait_for_selector(self, _selector: str, timeout: int) -> None:  # noqa: ARG002
+                # Each note takes longer than the whole hydrate budget.
+                clock[0] += 60.0
+
+            def evaluate(self, _script: str, _arg: dict[str, object]) -> dict[str, str]:
+                return {"title": "", "body": f"{self.url} full body"}
+
+            def close(self) -> None:
+                return None
+
+        class _GridPage:
+            class context:  # noqa: N801
+                @staticmethod
+                def new_page() -> _PoolPage:
+                    return _PoolPage()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            log_file = Path(tmp) / "logs" / "run.log"
+            deadline = RunDeadline.after(20, started_at=0.0, clock=lambda: clock[0])
+            notes = [{"body": "a…"}, {"body": "b…"}]
+            targets = [(0, "https://keep.google.com/#NOTE/a"), (1, "https://keep.google.com/#NOTE/b")]
+
+            hydrated = _hydrate_truncated_notes(
+                _GridPage(),
+                notes,
+                targets,
+                log_file=log_file,
+                plan=runner_module.default_plan(),
+                pool_size=1,
+                budget=deadline.phase("hydrate"),
+            )
+
+            self.assertEqual(hydrated, 1)
+            self.assertEqual(notes[1], {"body": "b…"})
+            self.assertEqual(deadline.hit_phase, "hydrate")
+            self.assertIn("skipped=1 pool=1", log_file.read_text(encoding="utf-8"))
+            self.assertIn("stopped_by=deadline", log_file.read_text(encoding="utf-8"))
+
+    def test_sharded_harvest_scrolls_label_views_in_parallel_and_dedupes_by_note_id(self) -> None:
+        def card(note_id: str, body: str, *, truncated: bool = False) -> dict[str, object]:
+            href = f"https://keep.google.com/#NOTE/{note_id}" if note_id else ""
+            return {"title": "", "body": body, "truncated": truncated, "href": href}
+
+        views = {
+            "https://keep.google.com/#label/Work": [card("a", "a…", truncated=True), card("b", "b")],
+            "https://keep.google.com/#label/Family": [card("b", "b"), card("c", "c")],
+            "https://keep.google.com/#home": [card("a", "a…", truncated=True), card("c", "c"), card("", "d")],
+        }
+        opened: list[str] = []
+
+        class _ShardPage:
+            class _Mouse:
+                def wheel(self, _: int, __: int) -> None:
+                    return None
+
+            def __init__(self) -> None:
+                self.url = ""
+                self.mouse = self._Mouse()
+                self.closed = False
+
+            def goto(self, url: str, wait_until: str) -> None:  # noqa: ARG002
+                self.url = url
+                opened.append(url)
+
+            def locator(self, _: str) -> _FakeKeepPage._FakeLocator:
+                return _FakeKeepPage._FakeLocator(len(views[self.url]))
+
+            def evaluate(self, _script: str) -> list[dict[str, object]]:
+                return views[self.url]
+
+            def close(self) -> None:
+                self.closed = True
+
+        class _Context:
+            def __init__(self) -> None:
+                self.pages: list[_ShardPage] = []
+
+            def new_page(self) -> _ShardPage:
+                self.pages.append(_ShardPage())
+                return self.pages[-1]
+
+        class _GridPage:
+            context = _Context()
+
+            def evaluate(self, _script: str, selector: str) -> list[dict[str, str]]:
+                self.selector = selector
+                return [
+                    {"href": "https://keep.google.com/#label/Work", "name": "Work"},
+                    {"href": "https://keep.google.com/#label/Family", "name": "Family"},
+                ]
+
+            def wait_for_timeout(self, _: int) -> None:
+                return None
+
+        with tempfile.TemporaryDirectory() as tmp:
+            log_file = Path(tmp) / "logs" / "run.log"
+            grid = _GridPage()
+            shards = _discover_harvest_shards(grid)
+            self.assertEqual([shard.name for shard in shards], ["Work", "Family", "unlabelled"])
+
+            _harvest_shards(
+                grid,
+                shards,
+                log_file=log_file,
+                plan=runner_module.default_plan(),
+                notes_selector="[role=listitem]",
+                pool_size=2,
+            )
+            notes, targets = _merge_shard_notes(shards, log_file=log_file, seconds=0.5)
+
+            self.assertEqual(opened, list(views))
+            self.assertEqual(len(_GridPage.context.pages), 3)
+            self.assertTrue(all(page.closed for page in _GridPage.context.pages))
+            self.assertEqual(
+                notes,
+                [{"body": "a…", "id": "a"}, {"body": "b", "id": "b"}, {"body": "c", "id": "c"}, {"body": "d"}],
+            )
+            self.assertEqual(targets, [(0, "https://keep.google.com/#NOTE/a")])
+            self.assertEqual([shard.stopped_by for shard in shards], ["stable", "stable", "stable"])
+            log_text = log_file.read_text(encoding="utf-8")
+            self.assertIn("backup shard name=Family notes=2 iterations=3", log_text)
+            self.assertIn("backup shards count=3 skipped=0 harvested=7 notes=4 duplicates=3", log_text)
+            self.assertEqual(pop_run_metrics().values["harvest_shard_duplicates"], 3)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+from unittest import mock
+
+import keep_backup.runner as runner_module
+from keep_backup.runner import run_daemon
+
+
+class _FakeDaemonPage:
+    def __init__(self) -> None:
+        self.url = "https://keep.google.com/u/0/"
+
+    def is_closed(self) -> bool:
+        return False
+
+
+class RunnerDaemonTests(unittest.TestCase):
+    def _run_daemon(self, exit_codes: list[int], *, login_lost: bool = False) -> tuple[int, list[object], list[object]]:
+        opened: list[object] = []
+        used_pages: list[object] = []
+
+        @contextmanager
+        def fake_open(_log_file: Path, _profile_dir: Path | None) -> Iterator[object]:
+            page = _FakeDaemonPage()
+            opened.append(page)
+            yield page
+
+        def fake_backup(_bodies, _file, _paths, _start, *, page=None, **_kwargs) -> int:  # noqa: ANN001
+            used_pages.append(page)
+            if login_lost:
+                page.url = "https://accounts.google.com/v3/signin/"
+            return exit_codes[len(used_pages) - 1]
+
+        with tempfile.TemporaryDirectory() as tmp:
+            cwd = Path.cwd()
+            try:
+                os.chdir(tmp)
+                with mock.patch.dict(os.environ, {"KEEP_BROWSER_PROFILE_DIR": str(Path(tmp) / "profile")}), \
+                        mock.patch.object(runner_module, "_open_playwright_page", fake_open), \
+                        mock.patch.object(runner_module, "run_backup_with_paths", fake_backup), \
+                        mock.patch.object(runner_module, "_sleep_until", lambda _wake: None):
+                    exit_code = run_daemon("* * * * *", max_runs=len(exit_codes))
+            finally:
+                os.chdir(cwd)
+        return exit_code, opened, used_pages
+
+    def test_daemon_reuses_warm_context_between_runs(self) -> None:
+        exit_code, opened, used_pages = self._run_daemon([0, 0, 0])
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(len(opened), 1)
+        self.assertEqual(used_pages, [opened[0]] * 3)
+
+    def test_daemon_releases_profile_after_login_failure(self) -> None:
+        exit_code, opened, _ = self._run_daemon([1, 0], login_lost=True)
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(len(opened), 2)
+
+    def test_daemon_requires_profile_dir(self) -> None:
+        with mock.patch.dict(os.environ, {"KEEP_BROWSER_PROFILE_DIR": "", "KEEP_BROWSER_PROFILE_DIR_HOST": ""}):
+            with self.assertRaises(RuntimeError):
+                run_daemon("* * * * *", max_runs=1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -6,8 +6,11 @@ from contextlib import redirect_stdout
 from datetime import datetime
 from io import StringIO
 from pathlib import Path
+from unittest import mock
 
-from keep_backup.runner import _finalize_run
+import keep_backup.runner as runner_module
+from keep_backup.metrics import record_phase, set_run_metric
+from keep_backup.runner import _finalize_run, run_playwright_smoke
 
 
 class RunnerFinalizeTests(unittest.TestCase):
@@ -40,6 +43,69 @@ class RunnerFinalizeTests(unittest.TestCase):
             self.assertIn("output=https://example.test", summary)
             self.assertIn(f"log_file={log_file}", summary)
 
+    def test_finalize_run_writes_openmetrics_textfile_and_keeps_last_success(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            log_file = Path(tmp) / "logs" / "work" / "run.log"
+            output = Path(tmp) / "keep.json"
+            output.write_text("{}\n", encoding="utf-8")
+            metrics_file = log_file.parent / "metrics" / "keep_backup_backup_work.prom"
+
+            record_phase("scroll", 1.5)
+            set_run_metric("scroll_iterations", 4)
+            with redirect_stdout(StringIO()):
+                _finalize_run(
+                    log_file=log_file,
+                    run_label="run",
+                    start=datetime(2026, 1, 1, 12, 0, 0),
+                    success=True,
+                    notes_count=3,
+                    output=output,
+                    error_message=None,
+                )
+            first = metrics_file.read_text(encoding="utf-8")
+            with redirect_stdout(StringIO()):
+                _finalize_run(
+                    log_file=log_file,
+                    run_label="run",
+                    start=datetime(2026, 1, 1, 12, 0, 0),
+                    success=False,
+                    notes_count=0,
+                    output=output,
+                    error_message="boom",
+                )
+            second = metrics_file.read_text(encoding="utf-8")
+
+            labels = 'mode="backup",profile="work"'
+            self.assertIn(f"keep_backup_run_success{{{labels}}} 1", first)
+            self.assertIn(f'keep_backup_phase_duration_seconds{{{labels},phase="scroll"}} 1.500000', first)
+            self.assertIn(f"keep_backup_scroll_iterations{{{labels}}} 4", first)
+            self.assertIn(f"keep_backup_output_bytes{{{labels}}} 3", first)
+            self.assertTrue(first.endswith("# EOF\n"))
+            self.assertIn(f"keep_backup_run_success{{{labels}}} 0", second)
+            self.assertNotIn("phase_duration_seconds", second)
+            last_success = [line for line in first.splitlines() if line.startswith("keep_backup_last_success")]
+            self.assertEqual(len(last_success), 1)
+            self.assertIn(last_success[0], second)
+
+    def test_smoke_modes_sharing_a_run_label_write_separate_metrics_files(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            log_file = Path(tmp) / "logs" / "run.log"
+            with mock.patch.object(runner_module, "_open_playwright_page") as open_page, mock.patch.object(
+                runner_module, "_verify_playwright_page", return_value=1
+            ), redirect_stdout(StringIO()):
+                open_page.return_value.__enter__.return_value = object()
+                run_playwright_smoke(log_file, url="https://keep.google.com/", mode="smoke-playwright-login")
+                run_playwright_smoke(log_file, url="file:///fixture.html", mode="smoke-playwright-fixture")
+
+            metrics_dir = log_file.parent / "metrics"
+            self.assertEqual(
+                sorted(path.name for path in metrics_dir.glob("*.prom")),
+                [
+                    "keep_backup_smoke-playwright-fixture_default.prom",
+                    "keep_backup_smoke-playwright-login_default.prom",
+                ],
+            )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+from datetime import datetime
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+import keep_backup.runner as runner_module
+from keep_backup.io import RESERVED_PROFILE_NAMES, RunPaths, build_paths, load_profiles_file
+from keep_backup.render import RENDER_SITE_DIR_NAME
+from keep_backup.runner import METRICS_DIR_NAME, run_multi_profile_backup
+
+
+class RunnerMultiProfileTests(unittest.TestCase):
+    def test_build_paths_nests_outputs_under_profile(self) -> None:
+        paths = build_paths(datetime(2026, 1, 1, 12, 0, 0), profile="family")
+        self.assertEqual(paths.backup_file, Path("backups/family/2026-01-01/keep.json"))
+        self.assertEqual(paths.log_file, Path("logs/family/run_2026-01-01_120000.log"))
+
+    def test_load_profiles_file_parses_named_profiles(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            profiles_file = Path(tmp) / "profiles.txt"
+            profiles_file.write_text(
+                "# accounts\nfamily=/profiles/family\nwork = '/profiles/work'\n\n",
+                encoding="utf-8",
+            )
+            profiles = load_profiles_file(profiles_file)
+        self.assertEqual(profiles, {"family": Path("/profiles/family"), "work": Path("/profiles/work")})
+
+    def test_load_profiles_file_rejects_unsafe_names(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            profiles_file = Path(tmp) / "profiles.txt"
+            profiles_file.write_text("../escape=/profiles/x\n", encoding="utf-8")
+            with self.assertRaises(ValueError):
+                load_profiles_file(profiles_file)
+
+    def test_load_profiles_file_rejects_names_of_shared_directories(self) -> None:
+        self.assertIn(RENDER_SITE_DIR_NAME, RESERVED_PROFILE_NAMES)
+        self.assertIn(METRICS_DIR_NAME, RESERVED_PROFILE_NAMES)
+        with tempfile.TemporaryDirectory() as tmp:
+            profiles_file = Path(tmp) / "profiles.txt"
+            for name in ("site", "Metrics", "har"):
+                with self.subTest(name=name):
+                    profiles_file.write_text(f"{name}=/profiles/x\n", encoding="utf-8")
+                    with self.assertRaisesRegex(ValueError, "reserved profile name on line 1"):
+                        load_profiles_file(profiles_file)
+
+    def test_run_multi_profile_backup_prints_per_profile_and_aggregate_summary(self) -> None:
+        seen: list[tuple[str, RunPaths]] = []
+
+        def fake_backup(_bodies, _file, paths: RunPaths, _start, **_kwargs) -> int:  # noqa: ANN001
+            profile_dir = os.environ["KEEP_BROWSER_PROFILE_DIR"]
+            seen.append((profile_dir, paths))
+            if profile_dir.endswith("work"):
+                print(f"summary success=false notes_count=0 output={paths.backup_file}")
+                print("error=unexpected page_url")
+                return 1
+            print(f"summary success=true notes_count=5 output={paths.backup_file}")
+            return 0
+
+        with tempfile.TemporaryDirectory() as tmp:
+            cwd = Path.cwd()
+            try:
+                os.chdir(tmp)
+                profiles_file = Path("profiles.txt")
+                profiles_file.write_text("family=/profiles/family\nwork=/profiles/work\n", encoding="utf-8")
+                stdout = StringIO()
+                with mock.patch.dict(os.environ, {}), \
+                        mock.patch.object(runner_module, "_profile_executor", lambda n: ThreadPoolExecutor(max_workers=1)), \
+                        mock.patch.object(runner_module, "run_backup_with_paths", fake_backup), \
+                        redirect_stdout(stdout):
+                    exit_code = run_multi_profile_backup(profiles_file, concurrency=4)
+            finally:
+                os.chdir(cwd)
+
+        self.assertEqual(exit_code, 1)
+        self.assertEqual(
+            sorted(str(paths.backup_dir.parent) for _, paths in seen),
+            [os.path.join("backups", "family"), os.path.join("backups", "work")],
+        )
+        lines = stdout.getvalue().splitlines()
+        self.assertIn("summary profile=family success=true notes_count=5", lines[0])
+        self.assertIn("error=[work] unexpected page_url", lines)
+        aggregate = [line for line in lines if line.startswith("summary ")][-1]
+        self.assertIn("summary success=false notes_count=5", aggregate)
+        self.assertIn("profiles=2 profiles_failed=1", aggregate)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,379 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import time
+import unittest
+from contextlib import redirect_stdout
+from datetime import datetime
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+import keep_backup.runner as runner_module
+from keep_backup.io import RunPaths
+from keep_backup.metrics import pop_run_metrics
+from keep_backup.runner import (
+    _open_playwright_page,
+    _session_state_is_fresh,
+    _verify_playwright_page,
+    load_session_state_file,
+    run_launch_benchmark,
+    scrub_har_credentials,
+)
+
+
+class _FakePage:
+    def __init__(self, redirect_url: str | None = None) -> None:
+        self.url = "about:blank"
+        self._redirect_url = redirect_url
+        self.gotos: list[str] = []
+
+    def goto(self, url: str, wait_until: str) -> None:  # noqa: ARG002
+        self.gotos.append(url)
+        self.url = self._redirect_url or url
+
+    def wait_for_timeout(self, _timeout_ms: int) -> None:
+        return None
+
+    def title(self) -> str:
+        return "Google Keep"
+
+    def evaluate(self, _script: str) -> str:
+        return "complete"
+
+    def locator(self, _selector: str) -> "_FakeLocator":
+        return _FakeLocator()
+
+
+class _FakeLocator:
+    def count(self) -> int:
+        return 2
+
+
+class _SyncPage(_FakePage):
+    # Replays one Keep sync response to whichever listeners are attached when it navigates.
+    sync_body = json.dumps({"nodes": [{"id": "n1", "type": "NOTE", "parentId": "root", "title": "t", "text": "b"}]})
+
+    class _SyncResponse:
+        url = "https://www.googleapis.com/notes/v1/changes"
+
+        def text(self) -> str:
+            return _SyncPage.sync_body
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.listeners: list[object] = []
+
+    def on(self, _event: str, listener: object) -> None:
+        self.listeners.append(listener)
+
+    def remove_listener(self, _event: str, listener: object) -> None:
+        self.listeners.remove(listener)
+
+    def goto(self, url: str, wait_until: str) -> None:
+        super().goto(url, wait_until)
+        for listener in self.listeners:
+            listener(self._SyncResponse())
+
+    def wait_for_selector(self, _selector: str, timeout: int) -> None:  # noqa: ARG002
+        return None
+
+    def content(self) -> str:
+        return "<html><body>keep</body></html>"
+
+    def evaluate(self, script: str, arg: object = None) -> object:  # noqa: ARG002
+        return "complete" if script == "document.readyState" else []
+
+
+class _FakeContext:
+    def __init__(self, page: _FakePage) -> None:
+        self.pages = [page]
+        self.closed = False
+        self.exported_to: str | None = None
+        self.routed_har: tuple[str, str] | None = None
+
+    def route_from_har(self, har: str, not_found: str) -> None:
+        self.routed_har = (har, not_found)
+
+    def new_page(self) -> _FakePage:
+        return self.pages[0]
+
+    def storage_state(self, path: str) -> None:
+        self.exported_to = path
+        Path(path).write_text(json.dumps({"cookies": [], "origins": []}), encoding="utf-8")
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class _FakeBrowser:
+    def __init__(self, chromium: "_FakeChromium") -> None:
+        self._chromium = chromium
+
+    def new_context(self, storage_state: str | None = None, **options: object) -> _FakeContext:
+        self._chromium.state_contexts.append(storage_state)
+        self._chromium.context_options.append(options)
+        context = _FakeContext(self._chromium.state_page or _FakePage(self._chromium.state_redirect))
+        self._chromium.contexts.append(context)
+        return context
+
+    def close(self) -> None:
+        return None
+
+
+class _FakeChromium:
+    def __init__(self, state_redirect: str | None) -> None:
+        self.state_redirect = state_redirect
+        self.state_page: _FakePage | None = None
+        self.state_contexts: list[str | None] = []
+        self.persistent_contexts: list[_FakeContext] = []
+        self.contexts: list[_FakeContext] = []
+        self.launch_options: list[dict[str, object]] = []
+        self.context_options: list[dict[str, object]] = []
+
+    def launch(self, headless: bool, **options: object) -> _FakeBrowser:  # noqa: ARG002
+        self.launch_options.append(options)
+        return _FakeBrowser(self)
+
+    def launch_persistent_context(self, user_data_dir: str, headless: bool) -> _FakeContext:  # noqa: ARG002
+        context = _FakeContext(_FakePage())
+        self.persistent_contexts.append(context)
+        return context
+
+
+class _FakePlaywright:
+    def __init__(self, chromium: _FakeChromium) -> None:
+        self.chromium = chromium
+
+    def __enter__(self) -> "_FakePlaywright":
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        return None
+
+
+def _auth_state(expires: float) -> dict[str, object]:
+    return {"cookies": [{"name": "SID", "domain": ".google.com", "expires": expires}], "origins": []}
+
+
+class RunnerSessionStateTests(unittest.TestCase):
+    def _open(self, tmp_path: Path, chromium: _FakeChromium) -> Path:
+        log_file = tmp_path / "logs" / "run.log"
+        profile_dir = tmp_path / "profile"
+        with mock.patch.dict(os.environ, {"KEEP_BROWSER_SESSION_STATE_DIR": str(tmp_path / "state")}), \
+                mock.patch.object(runner_module, "_load_sync_playwright", lambda: lambda: _FakePlaywright(chromium)):
+            with _open_playwright_page(log_file, profile_dir):
+                pass
+        return log_file
+
+    def _write_state(self, tmp_path: Path, payload: dict[str, object]) -> Path:
+        with mock.patch.dict(os.environ, {"KEEP_BROWSER_SESSION_STATE_DIR": str(tmp_path / "state")}):
+            state_file = load_session_state_file(tmp_path / "profile")
+        assert state_file is not None
+        state_file.parent.mkdir(parents=True, exist_ok=True)
+        state_file.write_text(json.dumps(payload), encoding="utf-8")
+        return state_file
+
+    def test_session_state_freshness_checks_age_and_cookie_expiry(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            state_file = Path(tmp) / "state.json"
+            self.assertEqual(_session_state_is_fresh(state_file), (False, "missing"))
+            state_file.write_text(json.dumps(_auth_state(time.time() + 3600)), encoding="utf-8")
+            self.assertEqual(_session_state_is_fresh(state_file), (True, "fresh"))
+            state_file.write_text(json.dumps(_auth_state(time.time() - 1)), encoding="utf-8")
+            self.assertEqual(_session_state_is_fresh(state_file), (False, "cookie_expired"))
+            state_file.write_text(json.dumps({"cookies": []}), encoding="utf-8")
+            self.assertEqual(_session_state_is_fresh(state_file), (False, "no_auth_cookies"))
+
+    def test_fresh_state_launches_clean_context(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp_path = Path(tmp)
+            state_file = self._write_state(tmp_path, _auth_state(time.time() + 3600))
+            chromium = _FakeChromium(state_redirect=None)
+
+            log_file = self._open(tmp_path, chromium)
+
+            self.assertEqual(chromium.state_contexts, [str(state_file)])
+            self.assertEqual(chromium.persistent_contexts, [])
+            self.assertIn("playwright launch path=storage_state launch_ms=", log_file.read_text(encoding="utf-8"))
+
+    def test_verify_reuses_the_session_state_navigation(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp_path = Path(tmp)
+            self._write_state(tmp_path, _auth_state(time.time() + 3600))
+            chromium = _FakeChromium(state_redirect=None)
+            log_file = tmp_path / "logs" / "run.log"
+
+            with mock.patch.dict(os.environ, {"KEEP_BROWSER_SESSION_STATE_DIR": str(tmp_path / "state")}), \
+                    mock.patch.object(runner_module, "_load_sync_playwright", lambda: lambda: _FakePlaywright(chromium)):
+                with _open_playwright_page(log_file, tmp_path / "profile") as page:
+                    for _ in range(2):
+                        _verify_playwright_page(
+                            page,
+                            log_file=log_file,
+                            url="https://keep.google.com/",
+                            notes_selector=None,
+                            min_notes=None,
+                            min_notes_error_label="notes",
+                            required_url_prefixes=["https://keep.google.com/"],
+                            forbidden_url_prefixes=None,
+                        )
+
+            # Only a later verify on the same page (a warm reuse) navigates again.
+            self.assertEqual(page.gotos, ["https://keep.google.com/"] * 2)
+            self.assertEqual(
+                log_file.read_text(encoding="utf-8").count("goto=skipped reason=session_state_landed"),
+                1,
+            )
+
+    def test_network_harvest_navigates_again_after_the_capture_is_attached(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp_path = Path(tmp)
+            self._write_state(tmp_path, _auth_state(time.time() + 3600))
+            log_file = tmp_path / "logs" / "run_2026-01-01_120000.log"
+            page = _SyncPage()
+            chromium = _FakeChromium(state_redirect=None)
+            chromium.state_page = page
+            env = {
+                "KEEP_BROWSER_SESSION_STATE_DIR": str(tmp_path / "state"),
+                "KEEP_BROWSER_PROFILE_DIR": str(tmp_path / "profile"),
+            }
+
+            with mock.patch.dict(os.environ, env), \
+                    mock.patch.object(runner_module, "_load_sync_playwright", lambda: lambda: _FakePlaywright(chromium)):
+                notes = runner_module._collect_keep_notes_for_backup(log_file, harvest="network")
+
+            self.assertEqual(page.gotos, ["https://keep.google.com/"] * 2)
+            self.assertEqual(notes, [{"body": "b", "title": "t", "id": "n1"}])
+            log_text = log_file.read_text(encoding="utf-8")
+            self.assertNotIn("goto=skipped", log_text)
+            self.assertIn("backup network_capture complete=true responses=1", log_text)
+
+    def test_rejected_state_falls_back_to_profile_and_reexports(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp_path = Path(tmp)
+            state_file = self._write_state(tmp_path, _auth_state(time.time() + 3600))
+            chromium = _FakeChromium(state_redirect="https://accounts.google.com/v3/signin/")
+
+            log_file = self._open(tmp_path, chromium)
+
+            self.assertEqual(len(chromium.persistent_contexts), 1)
+            self.assertTrue(chromium.persistent_contexts[0].exported_to)
+            log_text = log_file.read_text(encoding="utf-8")
+            self.assertIn("session_state rejected", log_text)
+            self.assertIn("playwright launch path=persistent_profile launch_ms=", log_text)
+            self.assertIn(f"session_state exported file={state_file}", log_text)
+
+
+class RunnerHarTests(unittest.TestCase):
+    def test_replay_serves_page_from_har_without_profile(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp_path = Path(tmp)
+            har_file = tmp_path / "keep.har"
+            har_file.write_text(json.dumps({"log": {"entries": []}}), encoding="utf-8")
+            log_file = tmp_path / "logs" / "run.log"
+            chromium = _FakeChromium(state_redirect=None)
+
+            with mock.patch.dict(os.environ, {"KEEP_HAR_REPLAY_PATH": str(har_file)}), \
+                    mock.patch.object(runner_module, "_load_sync_playwright", lambda: lambda: _FakePlaywright(chromium)):
+                with _open_playwright_page(log_file, tmp_path / "profile"):
+                    pass
+
+            self.assertEqual(chromium.persistent_contexts, [])
+            self.assertEqual(chromium.contexts[0].routed_har, (str(har_file), "abort"))
+            self.assertTrue(chromium.contexts[0].closed)
+            self.assertIn("playwright launch path=har_replay", log_file.read_text(encoding="utf-8"))
+
+    def test_scrub_har_credentials_drops_cookies_and_auth_headers(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            har_file = Path(tmp) / "keep.har"
+            entry = {
+                "request": {
+                    "url": "https://keep.google.com/",
+                    "cookies": [{"name": "SID", "value": "secret"}],
+                    "headers": [{"name": "Cookie", "value": "SID=secret"}, {"name": "Accept", "value": "*/*"}],
+                },
+                "response": {"cookies": [], "headers": [{"name": "Set-Cookie", "value": "SID=secret"}]},
+            }
+            har_file.write_text(json.dumps({"log": {"entries": [entry]}}), encoding="utf-8")
+
+            scrubbed = scrub_har_credentials(har_file)
+
+            text = har_file.read_text(encoding="utf-8")
+            self.assertEqual(scrubbed, 3)
+            self.assertNotIn("secret", text)
+            self.assertIn("Accept", text)
+
+
+class RunnerLaunchPresetTests(unittest.TestCase):
+    def _patch_playwright(self, chromium: _FakeChromium):  # noqa: ANN202
+        return mock.patch.object(runner_module, "_load_sync_playwright", lambda: lambda: _FakePlaywright(chromium))
+
+    def test_minimal_preset_applies_flags_and_records_launch_time(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            log_file = Path(tmp) / "logs" / "run.log"
+            chromium = _FakeChromium(state_redirect=None)
+            pop_run_metrics()
+
+            with mock.patch.dict(os.environ, {"KEEP_BROWSER_LAUNCH_PRESET": "minimal"}), self._patch_playwright(chromium):
+                with _open_playwright_page(log_file, None):
+                    pass
+
+            self.assertIn("--disable-gpu", chromium.launch_options[0]["args"])
+            self.assertEqual(chromium.context_options[0], {"viewport": {"width": 800, "height": 600}})
+            metrics = pop_run_metrics()
+            self.assertEqual(metrics.labels["launch_preset"], "minimal")
+            self.assertIn("launch_to_first_page_seconds", metrics.values)
+            self.assertIn("playwright launch_preset=minimal launch_to_first_page_ms=", log_file.read_text(encoding="utf-8"))
+
+    def test_default_preset_passes_no_extra_options_and_unknown_preset_fails(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            log_file = Path(tmp) / "logs" / "run.log"
+            chromium = _FakeChromium(state_redirect=None)
+
+            with self._patch_playwright(chromium):
+                with _open_playwright_page(log_file, None):
+                    pass
+                with self.assertRaisesRegex(ValueError, "unknown launch preset: huge"):
+                    with _open_playwright_page(log_file, None, launch_preset="huge"):
+                        pass
+
+            self.assertEqual(chromium.launch_options, [{}])
+            self.assertEqual(chromium.context_options, [{}])
+            pop_run_metrics()
+
+    def test_benchmark_launches_every_preset_against_fixture(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp_path = Path(tmp)
+            fixture = tmp_path / "keep_mock.html"
+            fixture.write_text("<div data-testid=\"keep-note\">a</div>", encoding="utf-8")
+            paths = RunPaths(
+                backup_dir=tmp_path / "backups" / "2026-01-02",
+                backup_file=tmp_path / "backups" / "2026-01-02" / "keep.json",
+                log_file=tmp_path / "logs" / "run_2026-01-02_030405.log",
+            )
+            chromium = _FakeChromium(state_redirect=None)
+            stdout = StringIO()
+
+            with self._patch_playwright(chromium), redirect_stdout(stdout):
+                exit_code = run_launch_benchmark(
+                    paths=paths,
+                    start=datetime(2026, 1, 2, 3, 4, 5),
+                    fixture_path=fixture,
+                    repeats=2,
+                )
+
+            output = stdout.getvalue()
+            self.assertEqual(exit_code, 0)
+            self.assertEqual(len(chromium.launch_options), 2 * len(runner_module.LAUNCH_PRESETS))
+            self.assertIn("bench-launch preset=minimal runs=2", output)
+            self.assertIn("fastest_preset=", output)
+            self.assertNotIn("launch_preset=", output.splitlines()[-1])
+            report = json.loads(next((paths.log_file.parent / "artifacts").glob("launch_bench_*.json")).read_text())
+            self.assertEqual([result["preset"] for result in report["results"]], list(runner_module.LAUNCH_PRESETS))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,9 +4,14 @@ import tempfile
 import unittest
 from pathlib import Path
 
+from keep_backup.login_check import LoginCheckCache
 from keep_backup.runner import (
     KEEP_PROBE_NOTES_SELECTOR,
+    CARDS_STABLE_POLL_MS,
+    CARDS_STABLE_POLLS,
+    PLAYWRIGHT_PAGE_SETTLE_MS,
     _collect_notes_with_infinite_scroll,
+    _fast_forward_scroll,
     _verify_playwright_page,
 )
 
@@ -46,12 +51,16 @@ class _FakePage:
         self._notes_growth = notes_growth or []
         self._scroll_steps = 0
         self.mouse = self._FakeMouse(self)
+        self.waits: list[tuple[str, int]] = []
 
     def goto(self, url: str, wait_until: str) -> _FakeResponse:  # noqa: ARG002
         return _FakeResponse(status=200)
 
-    def wait_for_timeout(self, _: int) -> None:
-        return None
+    def wait_for_timeout(self, timeout_ms: int) -> None:
+        self.waits.append(("timeout", timeout_ms))
+
+    def wait_for_selector(self, _: str, timeout: int) -> None:
+        self.waits.append(("selector", timeout))
 
     def title(self) -> str:
         return self._title
@@ -107,6 +116,77 @@ class RunnerSmokeVerifyTests(unittest.TestCase):
                     forbidden_url_prefixes=["https://accounts.google.com/"],
                 )
 
+    def test_cached_login_check_skips_settle_until_login_fails(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            log_file = Path(tmp) / "logs" / "run.log"
+            cache = LoginCheckCache(
+                Path(tmp) / "logs" / "cache" / "login_check.json",
+                profile_dir=Path("/profiles/main"),
+                ttl_seconds=600,
+            )
+            verify_options = {
+                "log_file": log_file,
+                "url": "https://keep.google.com/",
+                "notes_selector": None,
+                "min_notes": None,
+                "min_notes_error_label": "notes",
+                "required_url_prefixes": ["https://keep.google.com/"],
+                "forbidden_url_prefixes": ["https://accounts.google.com/"],
+                "login_cache": cache,
+            }
+
+            first = _FakePage(url="https://keep.google.com/u/0/")
+            _verify_playwright_page(first, **verify_options)
+            second = _FakePage(url="https://keep.google.com/u/0/")
+            _verify_playwright_page(second, **verify_options)
+            signed_out = _FakePage(url="https://accounts.google.com/v3/signin/")
+            with self.assertRaises(RuntimeError):
+                _verify_playwright_page(signed_out, **verify_options)
+
+            self.assertEqual(first.waits, [("timeout", PLAYWRIGHT_PAGE_SETTLE_MS)])
+            self.assertEqual(
+                second.waits,
+                [("selector", PLAYWRIGHT_PAGE_SETTLE_MS)] + [("timeout", CARDS_STABLE_POLL_MS)] * CARDS_STABLE_POLLS,
+            )
+            self.assertEqual(cache.lookup(), (None, "missing"))
+            log_text = log_file.read_text(encoding="utf-8")
+            self.assertIn("playwright login_check cache=miss reason=missing", log_text)
+            self.assertIn("playwright login_check recorded=true ttl_seconds=600 cookie_expires=session", log_text)
+            self.assertIn("playwright login_check cache=hit reason=fresh", log_text)
+            self.assertIn("playwright login_check invalidated=true reason=login_failed", log_text)
+
+    def test_cached_login_check_waits_until_card_count_is_stable(self) -> None:
+        class _FillingPage(_FakePage):
+            def wait_for_timeout(self, timeout_ms: int) -> None:
+                super().wait_for_timeout(timeout_ms)
+                self._scroll_steps += 1
+
+        with tempfile.TemporaryDirectory() as tmp:
+            log_file = Path(tmp) / "logs" / "run.log"
+            cache = LoginCheckCache(
+                Path(tmp) / "logs" / "cache" / "login_check.json",
+                profile_dir=Path("/profiles/main"),
+                ttl_seconds=600,
+            )
+            cache.record(final_url="https://keep.google.com/u/0/", cookie_expires=None)
+            page = _FillingPage(url="https://keep.google.com/u/0/", notes_growth=[1, 6, 14, 14, 14])
+
+            _verify_playwright_page(
+                page,
+                log_file=log_file,
+                url="https://keep.google.com/",
+                notes_selector=None,
+                min_notes=None,
+                min_notes_error_label="notes",
+                required_url_prefixes=["https://keep.google.com/"],
+                forbidden_url_prefixes=["https://accounts.google.com/"],
+                login_cache=cache,
+                ready_selector='[role="listitem"]',
+            )
+
+            self.assertEqual(page.waits.count(("timeout", CARDS_STABLE_POLL_MS)), 4)
+            self.assertIn("settle=skipped cards=14 stable=true", log_file.read_text(encoding="utf-8"))
+
     def test_collect_notes_scrolls_until_count_stabilizes(self) -> None:
         with tempfile.TemporaryDirectory() as tmp:
             log_file = Path(tmp) / "logs" / "run.log"
@@ -123,6 +203,53 @@ class RunnerSmokeVerifyTests(unittest.TestCase):
 
             self.assertEqual(notes_count, 8)
 
+    def test_collect_notes_fast_forwards_and_reports_progress(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            log_file = Path(tmp) / "logs" / "run.log"
+            page = _FakePage(
+                url="https://keep.google.com/u/0/",
+                notes_growth=[2, 5, 8, 8, 8],
+            )
+            progress: list[tuple[int, int]] = []
+
+            notes_count = _collect_notes_with_infinite_scroll(
+                page,
+                log_file=log_file,
+                notes_selector='[data-testid="keep-note"]',
+                resume_iterations=3,
+                resume_cards=5,
+                on_scroll=lambda iteration, count: progress.append((iteration, count)),
+            )
+
+            self.assertEqual(notes_count, 8)
+            self.assertEqual(progress[0], (4, 8))
+            # One short step already reaches the checkpointed card count.
+            self.assertEqual(page.waits[0], ("timeout", 250))
+            self.assertIn(
+                "fast_forward iterations=3 steps=1 cards=5 target=5 waited_ms=250 saved_scroll_wait_ms=2750",
+                log_file.read_text(encoding="utf-8"),
+            )
+
+    def test_fast_forward_steps_until_the_checkpointed_card_count(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            log_file = Path(tmp) / "logs" / "run.log"
+            page = _FakePage(
+                url="https://keep.google.com/u/0/",
+                notes_growth=[2, 4, 6, 8, 8],
+            )
+
+            count = _fast_forward_scroll(
+                page,
+                log_file=log_file,
+                notes_selector='[data-testid="keep-note"]',
+                max_steps=6,
+                target_count=8,
+            )
+
+            self.assertEqual(count, 8)
+            self.assertEqual(page.waits, [("timeout", 250)] * 3)
+            self.assertIn("steps=3 cards=8 target=8 waited_ms=750 saved_scroll_wait_ms=5250", log_file.read_text(encoding="utf-8"))
+
     def test_fixture_contains_note_title_and_body_testids(self) -> None:
         fixture = Path('fixtures/keep_mock.html').read_text(encoding='utf-8')
         self.assertIn('data-testid="note-title"', fixture)
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import json
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+from datetime import datetime
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+import keep_backup.runner as runner_module
+from keep_backup.io import RunPaths, open_binary_backup, write_backup
+from keep_backup.runner import run_verify_with_paths
+from keep_backup.verify import VERIFY_STATUS_FAILED, VERIFY_STATUS_OK, verify_generation
+
+
+class VerifyGenerationTests(unittest.TestCase):
+    def test_intact_generations_pass_with_recorded_checksums(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            for file_name in ("keep.json", "keep.kbk"):
+                backup_file = Path(tmp) / file_name
+                write_backup(backup_file, datetime(2026, 1, 1), [{"title": "t", "body": "b"}, {"body": "c"}])
+
+                result = verify_generation(backup_file)
+
+                self.assertEqual(result["status"], VERIFY_STATUS_OK, result["errors"])
+                self.assertEqual(result["checksums"], "recorded")
+                self.assertEqual(result["notes_count"], 2)
+
+    def test_detects_truncated_json_without_recorded_checksums(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            backup_file = Path(tmp) / "keep.json"
+            write_backup(backup_file, datetime(2026, 1, 1), [{"body": "long enough body"}])
+            backup_file.with_name("keep.json.checksums.json").unlink()
+            backup_file.write_bytes(backup_file.read_bytes()[:-12])
+
+            result = verify_generation(backup_file)
+
+            self.assertEqual(result["status"], VERIFY_STATUS_FAILED)
+            self.assertEqual(result["checksums"], "missing")
+            self.assertIn("truncated JSON", result["errors"][0])
+
+    def test_detects_flipped_note_in_binary_record(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            backup_file = Path(tmp) / "keep.kbk"
+            write_backup(backup_file, datetime(2026, 1, 1), [{"body": "aaaa"}, {"body": "bbbb"}])
+            with open_binary_backup(backup_file) as reader:
+                record, _crc = reader.record_bytes(1)
+            data = backup_file.read_bytes()
+            backup_file.write_bytes(data.replace(record, record.replace(b"bbbb", b"bbbc")))
+
+            result = verify_generation(backup_file)
+
+            self.assertEqual(result["status"], VERIFY_STATUS_FAILED)
+            self.assertIn("file checksum mismatch", result["errors"])
+            self.assertTrue(any("corrupt records: 1 (indexes 1)" in error for error in result["errors"]))
+
+
+class RunVerifyTests(unittest.TestCase):
+    def test_incremental_verify_skips_unchanged_generations(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp_path = Path(tmp)
+            for day in ("2026-01-01", "2026-01-02"):
+                write_backup(tmp_path / "backups" / day / "keep.json", datetime(2026, 1, 1), [{"body": day}])
+            paths = RunPaths(
+                backup_dir=tmp_path / "backups" / "2026-01-03",
+                backup_file=tmp_path / "backups" / "2026-01-03" / "keep.json",
+                log_file=tmp_path / "logs" / "run_2026-01-03_120000.log",
+            )
+            start = datetime(2026, 1, 3, 12, 0, 0)
+
+            with mock.patch.object(runner_module, "_verify_executor", lambda workers: ThreadPoolExecutor(2)):
+                stdout = StringIO()
+                with redirect_stdout(stdout):
+                    first_exit = run_verify_with_paths(paths=paths, start=start)
+                write_backup(tmp_path / "backups" / "2026-01-02" / "keep.json", datetime(2026, 1, 2), [{"body": "new"}])
+                with redirect_stdout(stdout):
+                    second_exit = run_verify_with_paths(paths=paths, start=start, incremental=True)
+
+            self.assertEqual((first_exit, second_exit), (0, 0))
+            output = stdout.getvalue().splitlines()
+            self.assertIn("files_checked=2 files_skipped=0 files_failed=0", output[0])
+            self.assertIn("files_checked=1 files_skipped=1 files_failed=0", output[1])
+            report = json.loads(
+                (tmp_path / "logs" / "artifacts" / "verify_report_2026-01-03_120000.json").read_text(encoding="utf-8")
+            )
+            self.assertEqual(report["files_checked"], 1)
+            self.assertEqual(len(report["results"]), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import unittest
+from datetime import datetime
+
+from keep_backup.schedule import next_run_after, parse_cron
+
+
+class ScheduleTests(unittest.TestCase):
+    def test_next_run_after_weekly_schedule(self) -> None:
+        schedule = parse_cron("0 3 * * 0")
+        # 2026-01-01 is a Thursday; the next Sunday is 2026-01-04.
+        self.assertEqual(
+            next_run_after(schedule, datetime(2026, 1, 1, 12, 0, 0)),
+            datetime(2026, 1, 4, 3, 0),
+        )
+
+    def test_next_run_after_is_strictly_later(self) -> None:
+        schedule = parse_cron("*/15 * * * *")
+        self.assertEqual(
+            next_run_after(schedule, datetime(2026, 1, 1, 12, 15, 0)),
+            datetime(2026, 1, 1, 12, 30),
+        )
+
+    def test_next_run_after_rolls_over_year(self) -> None:
+        schedule = parse_cron("30 1 1 1 *")
+        self.assertEqual(
+            next_run_after(schedule, datetime(2026, 3, 1, 0, 0, 0)),
+            datetime(2027, 1, 1, 1, 30),
+        )
+
+    def test_parse_cron_accepts_seven_as_sunday(self) -> None:
+        self.assertEqual(parse_cron("0 0 * * 7").weekdays, frozenset({0}))
+        self.assertEqual(parse_cron("0 0 * * 5-7").weekdays, frozenset({0, 5, 6}))
+
+    def test_parse_cron_rejects_invalid_expressions(self) -> None:
+        for expression in ["", "0 3 * *", "60 * * * *", "x * * * *", "*/0 * * * *"]:
+            with self.subTest(expression=expression):
+                with self.assertRaises(ValueError):
+                    parse_cron(expression)
+
+
+if __name__ == "__main__":
+    unittest.main()
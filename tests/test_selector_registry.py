@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from datetime import datetime
+from pathlib import Path
+
+from keep_backup.selector_registry import (
+    SELECTOR_DEAD_AFTER_MISSES,
+    SELECTOR_GROUP_CARD,
+    SELECTOR_GROUP_PROBE,
+    SELECTOR_GROUP_TITLE,
+    SELECTOR_REGISTRY,
+    SELECTOR_STATUS_STOPPED,
+    build_plan,
+    default_plan,
+    detect_locale,
+    load_selector_stats,
+    record_selector_hits,
+    selector_report,
+    write_selector_stats,
+)
+
+
+def _hits(matching: set[str]) -> dict[str, dict[str, int]]:
+    hits: dict[str, dict[str, int]] = {}
+    for entry in SELECTOR_REGISTRY:
+        hits.setdefault(entry.group, {})[entry.selector] = 3 if entry.selector in matching else 0
+    return hits
+
+
+class SelectorRegistryTests(unittest.TestCase):
+    def test_detect_locale_normalizes_lang(self) -> None:
+        self.assertEqual(detect_locale("ja-JP"), "ja")
+        self.assertEqual(detect_locale("en-US"), "en")
+        self.assertEqual(detect_locale(""), "other")
+
+    def test_build_plan_without_stats_filters_by_locale(self) -> None:
+        plan = build_plan({}, "ja")
+        self.assertIn('[aria-label="メモを選択"]', plan[SELECTOR_GROUP_PROBE])
+        self.assertNotIn('[aria-label="Select note"]', plan[SELECTOR_GROUP_PROBE])
+        self.assertEqual(build_plan({}, "other"), default_plan())
+
+    def test_build_plan_ranks_winners_first_and_skips_dead_selectors(self) -> None:
+        stats: dict[str, object] = {}
+        for _ in range(SELECTOR_DEAD_AFTER_MISSES):
+            record_selector_hits(stats, "en", _hits({".note .title", '[role="listitem"]'}), now=datetime(2026, 1, 1))
+
+        plan = build_plan(stats, "en")
+
+        self.assertEqual(plan[SELECTOR_GROUP_TITLE], [".note .title"])
+        self.assertEqual(plan[SELECTOR_GROUP_CARD], ['[role="listitem"]'])
+        # Groups with no live selector keep the full locale plan rather than going empty.
+        self.assertEqual(plan[SELECTOR_GROUP_PROBE], build_plan({}, "en")[SELECTOR_GROUP_PROBE])
+
+    def test_report_flags_selectors_that_stopped_matching(self) -> None:
+        stats: dict[str, object] = {}
+        record_selector_hits(stats, "en", _hits({'[aria-label="Title"]'}), now=datetime(2026, 1, 1))
+        for _ in range(SELECTOR_DEAD_AFTER_MISSES):
+            record_selector_hits(stats, "en", _hits(set()), now=datetime(2026, 1, 2))
+
+        stopped = [row["selector"] for row in selector_report(stats) if row["status"] == SELECTOR_STATUS_STOPPED]
+
+        self.assertEqual(stopped, ['[aria-label="Title"]'])
+
+    def test_selector_stats_round_trip(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            stats_file = Path(tmp) / "logs" / "selector_stats.json"
+            stats = record_selector_hits({}, "ja", _hits({".note .body"}), now=datetime(2026, 1, 1))
+            write_selector_stats(stats_file, stats)
+            self.assertEqual(load_selector_stats(stats_file), stats)
+            self.assertEqual(load_selector_stats(Path(tmp) / "missing.json"), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
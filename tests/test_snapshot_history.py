@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from keep_backup.snapshot_history import (
+    HISTORY_KEYFRAME_INTERVAL,
+    HISTORY_KIND_DELTA,
+    HISTORY_KIND_KEY,
+    SnapshotHistory,
+    apply_delta,
+    encode_delta,
+)
+
+
+def _snapshot(version: int) -> bytes:
+    cards = "".join(
+        f'<div class="note" data-id="{index}"><p>note {index} body text that stays the same</p></div>\n'
+        for index in range(200)
+    )
+    return f"<html><body><h1>run {version}</h1>\n{cards}<p>edited {version}</p></body></html>".encode("utf-8")
+
+
+class SnapshotDeltaTests(unittest.TestCase):
+    def test_delta_round_trips_inserts_and_removals(self) -> None:
+        base = _snapshot(1)
+        target = b"prefix " + base[:5000] + b"<inserted/>" + base[6000:] + b" suffix"
+        delta = encode_delta(base, target)
+        self.assertEqual(apply_delta(base, delta), target)
+        self.assertLess(len(delta), len(target) // 10)
+
+    def test_delta_against_unrelated_base_is_all_insert(self) -> None:
+        target = _snapshot(1)
+        self.assertEqual(apply_delta(b"", encode_delta(b"", target)), target)
+
+    def test_corrupt_delta_is_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            apply_delta(b"abc", b"XXXX\x00\x00\x00\x01")
+
+
+class SnapshotHistoryTests(unittest.TestCase):
+    def test_history_reconstructs_every_snapshot_with_periodic_keyframes(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            history = SnapshotHistory(Path(tmp) / "dom_history")
+            snapshots = {f"dom_snapshot_{index:02d}.html": _snapshot(index) for index in range(12)}
+            for name, data in snapshots.items():
+                history.append(name, data)
+
+            kinds = [entry["kind"] for entry in history.entries()]
+            self.assertEqual(kinds[0], HISTORY_KIND_KEY)
+            self.assertEqual(kinds[1:HISTORY_KEYFRAME_INTERVAL], [HISTORY_KIND_DELTA] * (HISTORY_KEYFRAME_INTERVAL - 1))
+            self.assertEqual(kinds[HISTORY_KEYFRAME_INTERVAL], HISTORY_KIND_KEY)
+            for name, data in snapshots.items():
+                self.assertEqual(history.reconstruct(name), data)
+            self.assertLess(history.storage_ratio(), 0.2)
+
+    def test_append_is_idempotent_for_same_content(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            history = SnapshotHistory(Path(tmp) / "dom_history")
+            history.append("dom_snapshot_a.html", _snapshot(1))
+            history.append("dom_snapshot_a.html", _snapshot(1))
+            self.assertEqual(len(history.entries()), 1)
+
+    def test_reconstruct_detects_damaged_history(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            history = SnapshotHistory(Path(tmp) / "dom_history")
+            history.append("dom_snapshot_a.html", _snapshot(1))
+            entry = history.append("dom_snapshot_b.html", _snapshot(2))
+            entry_file = history.history_dir / str(entry["file"])
+            entry_file.write_bytes(history.history_dir.joinpath(str(history.entries()[0]["file"])).read_bytes())
+            with self.assertRaises(ValueError):
+                history.reconstruct("dom_snapshot_b.html")
+            with self.assertRaises(FileNotFoundError):
+                history.reconstruct("dom_snapshot_missing.html")
+
+    def test_unreadable_index_is_not_overwritten(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            history = SnapshotHistory(Path(tmp) / "dom_history")
+            self.assertEqual(history.entries(), [])
+            history.append("dom_snapshot_a.html", _snapshot(1))
+            for damaged in ("{not json", '{"version": 99, "entries": []}'):
+                with self.subTest(index=damaged):
+                    history.index_file.write_text(damaged, encoding="utf-8")
+                    with self.assertRaisesRegex(ValueError, "move it aside"):
+                        history.append("dom_snapshot_b.html", _snapshot(2))
+                    self.assertEqual(history.index_file.read_text(encoding="utf-8"), damaged)
+
+    def test_writer_lock_waits_for_readers(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            history = SnapshotHistory(Path(tmp) / "dom_history")
+            history.append("dom_snapshot_a.html", _snapshot(1))
+            appended = threading.Event()
+
+            def append_locked() -> None:
+                with history.locked():
+                    history.append("dom_snapshot_b.html", _snapshot(2))
+                appended.set()
+
+            with history.locked(shared=True):
+                writer = threading.Thread(target=append_locked)
+                writer.start()
+                self.assertFalse(appended.wait(0.2))
+                self.assertEqual(len(history.entries()), 1)
+            writer.join(5)
+            self.assertTrue(appended.is_set())
+            self.assertEqual(len(history.entries()), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
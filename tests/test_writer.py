@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from keep_backup.io import append_log
+from keep_backup.metrics import pop_run_metrics
+from keep_backup.writer import BackgroundWriter, active_writer, background_writes, submit_write
+
+
+class BackgroundWriterTests(unittest.TestCase):
+    def test_jobs_run_in_order_off_the_caller_thread(self) -> None:
+        seen: list[tuple[int, str]] = []
+        with background_writes(BackgroundWriter(max_jobs=2)) as writer:
+            for index in range(5):
+                submit_write("job", lambda index=index: seen.append((index, threading.current_thread().name)))
+
+        self.assertIsNone(active_writer())
+        self.assertEqual([index for index, _ in seen], [0, 1, 2, 3, 4])
+        self.assertEqual({name for _, name in seen}, {"keep-background-writer"})
+        self.assertEqual(writer.jobs, 5)
+        self.assertIn("write_drain", pop_run_metrics().phase_seconds)
+
+    def test_errors_are_collected_and_later_jobs_still_run(self) -> None:
+        seen: list[str] = []
+
+        def fail() -> None:
+            raise OSError("disk full")
+
+        with background_writes() as writer:
+            submit_write("snapshot", fail)
+            submit_write("log", lambda: seen.append("after"))
+
+        self.assertEqual(writer.errors, ["snapshot: disk full"])
+        self.assertEqual(writer.error_summary(), "snapshot: disk full")
+        self.assertEqual(seen, ["after"])
+        pop_run_metrics()
+
+    def test_logs_are_written_in_order_and_flushed_on_exit(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            log_file = Path(tmp) / "logs" / "run.log"
+            append_log(log_file, "before")
+            with background_writes():
+                for index in range(20):
+                    append_log(log_file, f"line={index}")
+            lines = log_file.read_text(encoding="utf-8").splitlines()
+
+        self.assertEqual(len(lines), 21)
+        self.assertTrue(lines[0].endswith("before"))
+        self.assertEqual([line.rsplit("=", 1)[1] for line in lines[1:]], [str(index) for index in range(20)])
+        pop_run_metrics()
+
+
+if __name__ == "__main__":
+    unittest.main()